@@ -1,8 +1,13 @@
 import argparse
 from dataclasses import dataclass
+from pathlib import Path
 
 from server_runner.config.logging import get_logger
 from server_runner.steam.api.auth_info import AuthInfo, PasswordAuth, TokenAuth
+from server_runner.steam.server.validate_policy import (
+    DEFAULT_VALIDATE_EVERY,
+    ValidateMode,
+)
 
 log = get_logger()
 
@@ -16,6 +21,17 @@ class ServerConfig:
     api_base_url: str
     auth_type: str
     auth_info: AuthInfo | None
+    state_ttl: float
+    update_mode: str
+    steamcmd_session: bool
+    validate: str
+    validate_every: int
+    engine: str
+    metrics_host: str
+    metrics_port: int | None
+    metrics_interval: float
+    history_file: Path | None
+    history_interval: float
 
 
 class CommandLine:
@@ -60,6 +76,73 @@ class CommandLine:
             "--api-token", type=str, help="Token for token-based auth"
         )
 
+        # Runtime tuning
+        self.parseArgs.add_argument(
+            "--state-ttl",
+            type=float,
+            default=5.0,
+            help="Seconds a server state probe result is reused",
+        )
+        self.parseArgs.add_argument(
+            "--update-mode",
+            choices=["in-place", "staged"],
+            default="in-place",
+            help="Apply updates over the live install or stage them alongside",
+        )
+        self.parseArgs.add_argument(
+            "--steamcmd-session",
+            action="store_true",
+            help="Keep one logged-in steamcmd running for version checks and updates",
+        )
+        self.parseArgs.add_argument(
+            "--validate",
+            choices=[mode.value for mode in ValidateMode],
+            default=ValidateMode.PERIODIC.value,
+            help="When updates make steamcmd rehash the whole install",
+        )
+        self.parseArgs.add_argument(
+            "--validate-every",
+            type=int,
+            default=DEFAULT_VALIDATE_EVERY,
+            help="Validate every Nth update in periodic mode",
+        )
+        self.parseArgs.add_argument(
+            "--engine",
+            choices=["threaded", "asyncio"],
+            default="threaded",
+            help="Run jobs, timers and process watching on threads or one event loop",
+        )
+        self.parseArgs.add_argument(
+            "--metrics-port",
+            type=int,
+            default=None,
+            help="Serve Prometheus metrics on this port (disabled by default)",
+        )
+        self.parseArgs.add_argument(
+            "--metrics-host",
+            type=str,
+            default="127.0.0.1",
+            help="Address the metrics endpoint binds to",
+        )
+        self.parseArgs.add_argument(
+            "--metrics-interval",
+            type=float,
+            default=15.0,
+            help="Seconds between metrics snapshots",
+        )
+        self.parseArgs.add_argument(
+            "--history-file",
+            type=Path,
+            default=None,
+            help="Keep metric history in this file across restarts",
+        )
+        self.parseArgs.add_argument(
+            "--history-interval",
+            type=float,
+            default=60.0,
+            help="Seconds between samples recorded into the metric history",
+        )
+
     def parse_server_config(self) -> ServerConfig:
         args, other_args = self.parseArgs.parse_known_args()
 
@@ -83,4 +166,15 @@ class CommandLine:
             api_base_url=args.api_base_url,
             auth_type=args.auth_type,
             auth_info=auth_info,
+            state_ttl=args.state_ttl,
+            update_mode=args.update_mode,
+            steamcmd_session=args.steamcmd_session,
+            validate=args.validate,
+            validate_every=args.validate_every,
+            engine=args.engine,
+            metrics_host=args.metrics_host,
+            metrics_port=args.metrics_port,
+            metrics_interval=args.metrics_interval,
+            history_file=args.history_file,
+            history_interval=args.history_interval,
         )
@@ -1,18 +1,34 @@
+import asyncio
 import signal
 import threading
 import types
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 
-from server_runner.commandline.commandline import CommandLine
-from server_runner.config.logging import get_logger, setup_logging
+from server_runner.commandline.commandline import CommandLine, ServerConfig
+from server_runner.config.logging import DEFAULT_LOG_DIR, get_logger, setup_logging
+from server_runner.metrics.collector import RunnerMetricsCollector
+from server_runner.metrics.prometheus import MetricsExporter
 from server_runner.steam.factory import build_game_server
+from server_runner.steam.managed_game_server import ManagedGameServer
 from server_runner.workflow.job_definitions import JobID
-from server_runner.workflow.workflow_builder import create_workflow_engine
+from server_runner.workflow.telemetry import WorkflowTelemetry
+from server_runner.workflow.workflow_builder import (
+    create_async_workflow_engine,
+    create_workflow_engine,
+)
+from server_runner.workflow.workflow_engine import WorkflowEngine
 
 setup_logging()
 log = get_logger()
 
 shutdown_event = threading.Event()
 
+# Threads for blocking work (steamcmd, graceful stops, REST calls) in asyncio mode
+BLOCKING_WORKERS = 4
+# Job and task timings, written on shutdown
+TELEMETRY_FILE = DEFAULT_LOG_DIR / "telemetry.json"
+
 
 def shutdown_signal_handler(signum: int, _: types.FrameType | None) -> None:
     log.info(f"Received signal {signum}, Initiating graceful shutdown...")
@@ -27,11 +43,16 @@ def main():
     command_line = CommandLine()
     config = command_line.parse_server_config()
 
+    if config.engine == "asyncio":
+        asyncio.run(run_async(config))
+        return
+
     server = build_game_server(config)
     engine = create_workflow_engine(server)
 
     engine.start()
     log.info("Workflow engine started")
+    stop_metrics = _start_metrics(config, server, engine)
 
     # Enqueue an initial job
     engine.enqueue_job(JobID.UPDATE_START)
@@ -44,11 +65,90 @@ def main():
         log.exception("Error during main loop")
         exit(1)
     finally:
+        stop_metrics()
+        server.cancel_operations()
         server.stop()
         engine.stop()
+        server.close()
+        _dump_telemetry(engine.telemetry)
         log.info("Cleanup operations complete. Exiting.")
 
 
+async def run_async(config: ServerConfig) -> None:
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(
+        ThreadPoolExecutor(max_workers=BLOCKING_WORKERS, thread_name_prefix="Blocking")
+    )
+    stopping = asyncio.Event()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signum, _stop_loop, signum, stopping)
+
+    server = build_game_server(config, loop=loop)
+    engine = create_async_workflow_engine(server)
+
+    engine.start()
+    log.info("Workflow engine started (asyncio)")
+    stop_metrics = _start_metrics(config, server, engine)
+
+    # Enqueue an initial job
+    engine.enqueue_job(JobID.UPDATE_START)
+
+    try:
+        await stopping.wait()
+    finally:
+        stop_metrics()
+        server.cancel_operations()
+        # Blocking stop; the game process it waits on is driven by this loop
+        await asyncio.to_thread(server.stop)
+        engine.stop()
+        await engine.wait_closed()
+        server.close()
+        _dump_telemetry(engine.telemetry)
+        log.info("Cleanup operations complete. Exiting.")
+
+
+def _stop_loop(signum: int, stopping: asyncio.Event) -> None:
+    log.info(f"Received signal {signum}, Initiating graceful shutdown...")
+    stopping.set()
+
+
+def _start_metrics(
+    config: ServerConfig, server: ManagedGameServer, engine: WorkflowEngine
+) -> Callable[[], None]:
+    """
+    Start sampling the server into its history, and serving the samples
+    if the metrics endpoint is enabled; returns a function stopping both.
+    """
+    # Without an endpoint the samples only feed the history
+    interval = (
+        config.metrics_interval
+        if config.metrics_port is not None
+        else config.history_interval
+    )
+    collector = RunnerMetricsCollector(server, engine, interval=interval)
+    collector.start()
+    exporter: MetricsExporter | None = None
+    if config.metrics_port is not None:
+        exporter = MetricsExporter(
+            collector.payload, host=config.metrics_host, port=config.metrics_port
+        )
+        exporter.start()
+
+    def stop() -> None:
+        if exporter is not None:
+            exporter.stop()
+        collector.stop()
+
+    return stop
+
+
+def _dump_telemetry(telemetry: WorkflowTelemetry) -> None:
+    try:
+        telemetry.dump(TELEMETRY_FILE)
+    except OSError as e:
+        log.error(f"Failed to write telemetry: {e}")
+
+
 if __name__ == "__main__":
     log.info("Program started")
     main()
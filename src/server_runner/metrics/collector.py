@@ -0,0 +1,198 @@
+import threading
+import time
+
+from server_runner.config.logging import get_logger
+from server_runner.metrics.prometheus import PrometheusWriter
+from server_runner.steam.managed_game_server import (
+    ManagedGameServer,
+    ServerSample,
+    ServerState,
+)
+from server_runner.workflow.workflow_engine import WorkflowEngine
+
+log = get_logger()
+
+DEFAULT_REFRESH_INTERVAL = 15.0
+
+
+class RunnerMetricsCollector:
+    """
+    Samples the server and workflow engine on an interval into a cached
+    Prometheus exposition.
+
+    All live work (psutil, the game's metrics endpoint) happens here, on
+    the collector thread; payload() only returns the last rendering. The
+    server records its samples into history at its own, slower interval.
+    """
+
+    def __init__(
+        self,
+        server: ManagedGameServer,
+        engine: WorkflowEngine,
+        *,
+        interval: float = DEFAULT_REFRESH_INTERVAL,
+    ):
+        self.server = server
+        self.engine = engine
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._payload = b""
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def payload(self) -> bytes:
+        with self._lock:
+            return self._payload
+
+    # ------------------------
+    # Collection
+    # ------------------------
+    def refresh(self) -> None:
+        started = time.monotonic()
+        writer = PrometheusWriter()
+        sample = self.server.sample()
+        self._collect_process(writer, sample)
+        self._collect_server(writer, sample)
+        self._collect_engine(writer)
+        writer.gauge(
+            "metrics_refresh_seconds",
+            time.monotonic() - started,
+            help="Time taken to collect this snapshot",
+        )
+        writer.gauge(
+            "metrics_refreshed_at_seconds",
+            time.time(),
+            help="Unix time this snapshot was collected",
+        )
+        payload = writer.render()
+        with self._lock:
+            self._payload = payload
+
+    def _collect_process(self, writer: PrometheusWriter, sample: ServerSample) -> None:
+        snapshot = sample.resources
+        writer.gauge(
+            "process_rss_bytes",
+            snapshot.rss_bytes,
+            help="Resident memory of the game process tree",
+        )
+        if snapshot.pss_bytes is not None:
+            writer.gauge(
+                "process_pss_bytes",
+                snapshot.pss_bytes,
+                help="Proportional set size of the game process tree",
+            )
+        writer.gauge(
+            "process_memory_percent",
+            snapshot.memory_percent,
+            help="Share of system memory used by the game process tree",
+        )
+        writer.gauge(
+            "process_cpu_percent",
+            snapshot.cpu_percent,
+            help="CPU use of the game process tree, summed across cores",
+        )
+        writer.gauge("process_count", snapshot.process_count)
+        writer.gauge("process_threads", snapshot.num_threads)
+
+    def _collect_server(self, writer: PrometheusWriter, sample: ServerSample) -> None:
+        for state in ServerState:
+            writer.gauge(
+                "server_state",
+                1 if state is sample.state else 0,
+                {"state": state.name},
+                help="Current server state (one series per state)",
+            )
+        for name, value in sample.game.items():
+            writer.gauge(f"game_{name}", value, help="Reported by the game server")
+        if sample.api_latency is not None:
+            writer.gauge(
+                "game_api_latency_seconds",
+                sample.api_latency,
+                help="Time taken by the game metrics call",
+            )
+
+        progress = self.server.update_progress
+        if progress is not None:
+            writer.gauge(
+                "update_progress_percent",
+                progress.percent,
+                {"state": progress.state},
+                help="Progress of the latest steamcmd update",
+            )
+
+    def _collect_engine(self, writer: PrometheusWriter) -> None:
+        telemetry = self.engine.telemetry
+        for (job, outcome), count in dict(telemetry.outcomes).items():
+            writer.counter(
+                "jobs",
+                count,
+                {"job": job, "outcome": outcome},
+                help="Workflow job runs by outcome",
+            )
+        writer.gauge("job_queue_depth", self.engine.queue.qsize())
+        for job, histogram in list(telemetry.queue_waits.items()):
+            writer.histogram(
+                "job_queue_wait_seconds",
+                histogram,
+                {"job": job},
+                help="Time jobs spent queued before running",
+            )
+        for task, histogram in list(telemetry.task_durations.items()):
+            # TaskUpdate and TaskPrepareUpdate are the steamcmd update runs
+            writer.histogram(
+                "task_duration_seconds",
+                histogram,
+                {"task": task},
+                help="Task run time; TaskUpdate covers steamcmd updates",
+            )
+        writer.histogram(
+            "downtime_seconds",
+            telemetry.downtime,
+            help="Observed time from last healthy to next healthy state",
+        )
+
+        lags: dict[str, tuple[float, float]] = {}
+        for handle in self.engine.scheduler.timers():
+            if not handle.name or not handle.fired:
+                continue
+            last, worst = lags.get(handle.name, (0.0, 0.0))
+            lags[handle.name] = (
+                max(last, handle.last_lag),
+                max(worst, handle.max_lag),
+            )
+        for name, (last, worst) in lags.items():
+            writer.gauge(
+                "timer_lag_seconds",
+                last,
+                {"timer": name},
+                help="How late the timer last fired",
+            )
+            writer.gauge(
+                "timer_max_lag_seconds",
+                worst,
+                {"timer": name},
+                help="Latest the timer has fired",
+            )
+
+    # ------------------------
+    # Lifecycle
+    # ------------------------
+    def _run(self) -> None:
+        while True:
+            try:
+                self.refresh()
+            except Exception as e:
+                log.error(f"Metrics refresh failed: {type(e).__name__} - {e}")
+            if self._stop_event.wait(self.interval):
+                return
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name="MetricsCollector", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
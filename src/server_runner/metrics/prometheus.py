@@ -0,0 +1,167 @@
+import math
+import threading
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Literal
+
+from server_runner.config.logging import get_logger
+from server_runner.utils.histogram import Histogram
+
+log = get_logger()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_METRICS_HOST = "127.0.0.1"
+DEFAULT_METRICS_PORT = 9877
+
+MetricType = Literal["gauge", "counter", "histogram"]
+Labels = Mapping[str, str]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Labels | None) -> str:
+    if not labels:
+        return ""
+    inner = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+    return f"{{{inner}}}"
+
+
+def _format_value(value: float) -> str:
+    value = float(value)
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+@dataclass(slots=True)
+class _Family:
+    kind: MetricType
+    help: str
+    samples: list[str] = field(default_factory=list[str])
+
+
+class PrometheusWriter:
+    """
+    Builds a Prometheus text-format exposition. Samples of one metric
+    name are grouped under a single HELP/TYPE header whatever order they
+    are added in.
+    """
+
+    def __init__(self, prefix: str = "server_runner"):
+        self.prefix = prefix
+        self._families: dict[str, _Family] = {}
+
+    def _family(self, name: str, kind: MetricType, help: str) -> tuple[str, _Family]:
+        full = f"{self.prefix}_{name}"
+        family = self._families.get(full)
+        if family is None:
+            family = self._families[full] = _Family(kind, help)
+        elif family.kind != kind:
+            raise ValueError(f"Metric {full} already declared as {family.kind}")
+        return full, family
+
+    def gauge(
+        self, name: str, value: float, labels: Labels | None = None, help: str = ""
+    ) -> None:
+        full, family = self._family(name, "gauge", help)
+        family.samples.append(f"{full}{_format_labels(labels)} {_format_value(value)}")
+
+    def counter(
+        self, name: str, value: float, labels: Labels | None = None, help: str = ""
+    ) -> None:
+        full, family = self._family(f"{name}_total", "counter", help)
+        family.samples.append(f"{full}{_format_labels(labels)} {_format_value(value)}")
+
+    def histogram(
+        self,
+        name: str,
+        histogram: Histogram,
+        labels: Labels | None = None,
+        help: str = "",
+    ) -> None:
+        full, family = self._family(name, "histogram", help)
+        cumulative = 0
+        for bound, count in zip(
+            [*histogram.bounds, math.inf], histogram.counts(), strict=True
+        ):
+            cumulative += count
+            bucket = {**(labels or {}), "le": _format_value(bound)}
+            family.samples.append(f"{full}_bucket{_format_labels(bucket)} {cumulative}")
+        suffix = _format_labels(labels)
+        family.samples.append(f"{full}_sum{suffix} {_format_value(histogram.sum)}")
+        family.samples.append(f"{full}_count{suffix} {cumulative}")
+
+    def render(self) -> bytes:
+        lines: list[str] = []
+        for name, family in self._families.items():
+            if family.help:
+                lines.append(f"# HELP {name} {family.help}")
+            lines.append(f"# TYPE {name} {family.kind}")
+            lines.extend(family.samples)
+        return ("\n".join(lines) + "\n").encode()
+
+
+class MetricsExporter:
+    """
+    Serves /metrics from a dedicated thread.
+
+    Each scrape returns whatever payload() currently holds; it is expected
+    to be a cached exposition, so scrapes never reach the game or psutil.
+    """
+
+    def __init__(
+        self,
+        payload: Callable[[], bytes],
+        *,
+        host: str = DEFAULT_METRICS_HOST,
+        port: int = DEFAULT_METRICS_PORT,
+    ):
+        self.payload = payload
+        self.host = host
+        self.port = port
+        self._httpd: HTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        payload = self.payload
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = payload()
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: object) -> None:
+                log.debug(f"metrics: {format % args}")
+
+        return Handler
+
+    def start(self) -> None:
+        self._httpd = HTTPServer((self.host, self.port), self._handler())
+        # Port 0 binds an ephemeral port; report the real one
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="MetricsExporter", daemon=True
+        )
+        self._thread.start()
+        log.info(f"Serving metrics on http://{self.host}:{self.port}/metrics")
+
+    def stop(self) -> None:
+        if self._httpd is None:
+            return
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._httpd = None
+        if self._thread is not None:
+            self._thread.join(timeout=5)
@@ -0,0 +1,120 @@
+import random
+import threading
+import time
+from collections.abc import Callable
+from enum import Enum, auto
+
+from server_runner.config.logging import get_logger
+
+log = get_logger()
+
+
+class BreakerState(Enum):
+    CLOSED = auto()  # Calls flow normally
+    OPEN = auto()  # Calls rejected until the backoff expires
+    HALF_OPEN = auto()  # A single trial call is in flight
+
+
+class CircuitBreaker:
+    """
+    Classic closed/open/half-open circuit breaker.
+
+    After failure_threshold consecutive failures the breaker opens and
+    rejects calls for a jittered, exponentially growing backoff. Once the
+    backoff expires one trial call is let through: success closes the
+    breaker, failure re-opens it with a longer backoff.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = 3,
+        base_backoff: float = 2.0,
+        max_backoff: float = 120.0,
+        jitter: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            failure_threshold: Consecutive failures before opening.
+            base_backoff: First open period in seconds.
+            max_backoff: Upper bound for the open period in seconds.
+            jitter: Fraction of the backoff randomly shaved off (0..1), so
+                callers on different threads do not retry in lockstep.
+            clock: Monotonic time source.
+        """
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._state = BreakerState.CLOSED
+        self._failures = 0
+        self._open_count = 0
+        self._retry_at = 0.0
+
+    @property
+    def state(self) -> BreakerState:
+        with self._lock:
+            return self._state
+
+    def retry_in(self) -> float:
+        """Seconds until the next trial call is allowed (0 if not open)."""
+        with self._lock:
+            if self._state is not BreakerState.OPEN:
+                return 0.0
+            return max(0.0, self._retry_at - self._clock())
+
+    def allow(self) -> bool:
+        """Return True if a call may proceed. May claim the half-open trial."""
+        with self._lock:
+            if self._state is BreakerState.CLOSED:
+                return True
+            if self._state is BreakerState.HALF_OPEN:
+                return False
+            if self._clock() < self._retry_at:
+                return False
+            self._state = BreakerState.HALF_OPEN
+            return True
+
+    def passes(self) -> bool:
+        """
+        Whether a call would be allowed, without claiming the half-open
+        trial. For checks whose success says nothing about health.
+        """
+        with self._lock:
+            if self._state is BreakerState.CLOSED:
+                return True
+            if self._state is BreakerState.HALF_OPEN:
+                return False
+            return self._clock() >= self._retry_at
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state is not BreakerState.CLOSED:
+                log.info("Circuit closed; API calls resumed")
+            self._state = BreakerState.CLOSED
+            self._failures = 0
+            self._open_count = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if (
+                self._state is BreakerState.HALF_OPEN
+                or self._failures >= self.failure_threshold
+            ):
+                self._open()
+
+    def _open(self) -> None:
+        self._open_count += 1
+        backoff = min(self.max_backoff, self.base_backoff * 2 ** (self._open_count - 1))
+        backoff *= 1.0 - self.jitter * random.random()  # noqa: S311
+        self._retry_at = self._clock() + backoff
+        self._state = BreakerState.OPEN
+        log.warning(
+            f"Circuit opened after {self._failures} failures; "
+            f"retrying in {backoff:.1f}s"
+        )
@@ -0,0 +1,99 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from concurrent.futures import Executor
+from functools import partial
+
+from server_runner.steam.api.games.base_rest_api import (
+    CircuitOpenError,
+    HealthResult,
+    HealthTier,
+    RESTSteamServerAPI,
+    SteamAPIRequestError,
+)
+
+
+class AsyncRESTSteamServerAPI:
+    """
+    Awaitable front for a RESTSteamServerAPI.
+
+    The TCP connect tier runs natively on the event loop. HTTP calls reuse
+    the wrapped client's pooled session, auth and circuit breaker on an
+    executor, so the number of threads they occupy is bounded by that
+    executor rather than by the number of concurrent callers.
+    """
+
+    def __init__(self, api: RESTSteamServerAPI, executor: Executor | None = None):
+        """
+        Args:
+            api: Blocking client whose session and breaker are shared.
+            executor: Runs the HTTP calls; the loop's default when None.
+        """
+        self.api = api
+        self.executor = executor
+
+    def call[T](self, func: Callable[..., T], *args: object) -> Awaitable[T]:
+        """Await any blocking method of the wrapped client, e.g. metrics."""
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(self.executor, partial(func, *args))
+
+    # ------------------------
+    # Health
+    # ------------------------
+    async def _connect_probe(self) -> None:
+        # Like RESTSteamServerAPI._connect_probe: success is not recorded
+        breaker = self.api.breaker
+        if not breaker.passes():
+            raise CircuitOpenError(
+                f"connect {self.api.base_url} skipped: circuit open, "
+                f"retry in {breaker.retry_in():.1f}s"
+            )
+        host, port = self.api.address()
+        try:
+            async with asyncio.timeout(self.api.connect_timeout):
+                _, writer = await asyncio.open_connection(host, port)
+        except (OSError, TimeoutError) as e:
+            breaker.record_failure()
+            raise SteamAPIRequestError(
+                f"connect {self.api.base_url} failed: {e}"
+            ) from e
+        writer.close()
+
+    async def health(self, *, full: bool = False) -> HealthResult:
+        """RESTSteamServerAPI.health() without blocking the loop."""
+        tiers = [HealthTier.CONNECT, HealthTier.PROBE]
+        if full:
+            tiers.append(HealthTier.FULL)
+
+        start = time.monotonic()
+        for tier in tiers:
+            try:
+                if tier is HealthTier.CONNECT:
+                    await self._connect_probe()
+                else:
+                    await self.call(self.api.probe, tier)
+            except CircuitOpenError as e:
+                return HealthResult(
+                    False, tier, time.monotonic() - start, str(e), circuit_open=True
+                )
+            except SteamAPIRequestError as e:
+                return HealthResult(False, tier, time.monotonic() - start, str(e))
+        return HealthResult(True, None, time.monotonic() - start)
+
+    async def health_check(self) -> bool:
+        return (await self.health()).healthy
+
+    # ------------------------
+    # Server Control
+    # ------------------------
+    async def announce(self, message: str) -> None:
+        await self.call(self.api.announce, message)
+
+    async def save(self) -> None:
+        await self.call(self.api.save)
+
+    async def shutdown(self, message: str, delay: int) -> None:
+        await self.call(self.api.shutdown, message, delay)
+
+    async def stop(self) -> None:
+        await self.call(self.api.stop)
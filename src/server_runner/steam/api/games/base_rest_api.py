@@ -1,10 +1,18 @@
+import socket
+import time
 from abc import ABC, abstractmethod
-from collections.abc import Iterable, Mapping
+from collections.abc import Generator, Iterable, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass
+from enum import Enum, auto
 from typing import Any, TypeVar
+from urllib.parse import urlsplit
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from server_runner.steam.api.auth_info import AuthInfo
+from server_runner.steam.api.circuit_breaker import CircuitBreaker
 
 T = TypeVar("T")
 
@@ -14,29 +22,95 @@ RequestParams = Mapping[ParamsKey, ParamsValue]
 
 JsonMapping = Mapping[str, object]
 
+DEFAULT_POOL_SIZE = 4
+DEFAULT_CONNECT_TIMEOUT = 0.1
+DEFAULT_PROBE_TIMEOUT = 2.0
+
 
 class SteamAPIRequestError(RuntimeError):
     """Raised when a REST request to a Steam server fails."""
 
 
+class CircuitOpenError(SteamAPIRequestError):
+    """Raised without a request being sent while the circuit breaker is open."""
+
+
+class HealthTier(Enum):
+    CONNECT = auto()  # TCP connect to the REST port
+    PROBE = auto()  # Short-timeout HTTP request, body not read
+    FULL = auto()  # Full info call, body decoded
+
+
+@dataclass(frozen=True, slots=True)
+class HealthResult:
+    healthy: bool
+    failed_tier: HealthTier | None = None
+    latency: float = 0.0  # seconds spent across all tiers
+    detail: str | None = None
+    circuit_open: bool = False  # failed fast without contacting the server
+
+
 class RESTSteamServerAPI(ABC):
     """
     Base class for RESTful Steam game APIs.
     Handles GET/POST requests and defines abstract server methods.
+
+    Requests share one pooled, keep-alive session. The session is configured
+    once here and never mutated afterwards, so it is safe to use from the
+    scheduler and consumer threads concurrently; the urllib3 pool underneath
+    hands each thread its own connection.
     """
 
     def __init__(
-        self, *, base_url: str, auth_info: AuthInfo | None = None, timeout: int = 10
+        self,
+        *,
+        base_url: str,
+        auth_info: AuthInfo | None = None,
+        timeout: int = 10,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        probe_timeout: float = DEFAULT_PROBE_TIMEOUT,
+        breaker: CircuitBreaker | None = None,
     ):
         """
         Args:
             base_url: Base URL of the REST API (e.g., "http://localhost:8212").
             auth_info: Optional requests-compatible authentication (e.g., HTTPBasicAuth).
             timeout: Request timeout in seconds.
+            pool_size: Maximum number of kept-alive connections to the server.
+            connect_timeout: Timeout for the TCP connect health tier.
+            probe_timeout: Timeout for the lightweight HTTP health tier.
+            breaker: Circuit breaker guarding every request.
         """
         self.base_url = base_url.rstrip("/")
         self.auth = self._build_auth(auth_info)
         self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.probe_timeout = probe_timeout
+        self.session = self._build_session(pool_size)
+        self.breaker = breaker or CircuitBreaker()
+
+    def _build_session(self, pool_size: int) -> requests.Session:
+        session = requests.Session()
+        session.auth = self.auth
+        session.headers["Connection"] = "keep-alive"
+
+        # One host, so a single pool sized for our handful of threads. Never
+        # block waiting on the pool and never retry: callers own retry policy.
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self.session.close()
+
+    def __enter__(self) -> "RESTSteamServerAPI":
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
 
     # ------------------------
     # HTTP Helpers
@@ -44,31 +118,145 @@ class RESTSteamServerAPI(ABC):
     def _full_url(self, endpoint: str) -> str:
         return f"{self.base_url}/{endpoint.lstrip('/')}"
 
+    def address(self) -> tuple[str, int]:
+        """Host and port of the REST API."""
+        parts = urlsplit(self.base_url)
+        host = parts.hostname or "localhost"
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        return host, port
+
+    @contextmanager
+    def _guarded(self, action: str) -> Generator[None]:
+        """
+        Run a request through the circuit breaker, translating transport
+        errors into SteamAPIRequestError. Only transport failures and 5xx
+        responses count against the breaker; a 4xx means the server is up.
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError(
+                f"{action} skipped: circuit open, "
+                f"retry in {self.breaker.retry_in():.1f}s"
+            )
+        try:
+            yield
+        except (requests.RequestException, OSError) as e:
+            if self._is_server_failure(e):
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            raise SteamAPIRequestError(f"{action} failed: {e}") from e
+        except BaseException:
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+
+    @staticmethod
+    def _is_server_failure(error: Exception) -> bool:
+        if isinstance(error, requests.HTTPError) and error.response is not None:
+            return error.response.status_code >= 500
+        return True
+
     def _get(
-        self, endpoint: str, params: RequestParams | None = None
+        self,
+        endpoint: str,
+        params: RequestParams | None = None,
+        timeout: float | None = None,
     ) -> dict[str, Any]:
         url = self._full_url(endpoint)
-        try:
-            response = requests.get(
-                url, auth=self.auth, params=params, timeout=self.timeout
+        with self._guarded(f"GET {url}"):
+            response = self.session.get(
+                url, params=params, timeout=timeout or self.timeout
             )
             response.raise_for_status()
             return response.json() if response.content else {}
-        except requests.RequestException as e:
-            raise SteamAPIRequestError(f"GET {url} failed: {e}") from e
 
     def _post(
         self, endpoint: str, json: JsonMapping | None = None
     ) -> dict[str, Any] | None:
         url = self._full_url(endpoint)
-        try:
-            response = requests.post(
-                url, auth=self.auth, json=json, timeout=self.timeout
-            )
+        with self._guarded(f"POST {url}"):
+            response = self.session.post(url, json=json, timeout=self.timeout)
             response.raise_for_status()
             return response.json() if response.content else None
-        except requests.RequestException as e:
-            raise SteamAPIRequestError(f"POST {url} failed: {e}") from e
+
+    def _get_status(self, endpoint: str, timeout: float) -> None:
+        """
+        GET a small endpoint and check its status without decoding it.
+        The body is still read, so the connection returns to the pool.
+        """
+        url = self._full_url(endpoint)
+        with self._guarded(f"GET {url}"):
+            response = self.session.get(url, timeout=timeout)
+            response.raise_for_status()
+
+    # ------------------------
+    # Health
+    # ------------------------
+    def _connect_probe(self) -> None:
+        """
+        Open and close a TCP connection to the REST port.
+
+        A hung server still accepts connections, so a connect never closes
+        or resets the breaker, nor takes its half-open trial; only HTTP
+        responses do. A failed connect counts as a failure.
+        """
+        action = f"connect {self.base_url}"
+        if not self.breaker.passes():
+            raise CircuitOpenError(
+                f"{action} skipped: circuit open, "
+                f"retry in {self.breaker.retry_in():.1f}s"
+            )
+        try:
+            with socket.create_connection(self.address(), self.connect_timeout):
+                pass
+        except OSError as e:
+            self.breaker.record_failure()
+            raise SteamAPIRequestError(f"{action} failed: {e}") from e
+
+    def probe(self, tier: HealthTier) -> None:
+        """Run a single health tier; raise SteamAPIRequestError on failure."""
+        match tier:
+            case HealthTier.CONNECT:
+                self._connect_probe()
+            case HealthTier.PROBE:
+                self._light_probe()
+            case HealthTier.FULL:
+                self._full_probe()
+
+    def health(self, *, full: bool = False) -> HealthResult:
+        """
+        Check server health in increasing tiers of cost, stopping at the
+        first failing tier. The full tier only runs when full=True.
+        """
+        tiers = [HealthTier.CONNECT, HealthTier.PROBE]
+        if full:
+            tiers.append(HealthTier.FULL)
+
+        start = time.monotonic()
+        for tier in tiers:
+            try:
+                self.probe(tier)
+            except CircuitOpenError as e:
+                return HealthResult(
+                    False, tier, time.monotonic() - start, str(e), circuit_open=True
+                )
+            except SteamAPIRequestError as e:
+                return HealthResult(False, tier, time.monotonic() - start, str(e))
+        return HealthResult(True, None, time.monotonic() - start)
+
+    def health_check(self) -> bool:
+        """Return True if the server passes the cheap health tiers."""
+        return self.health().healthy
+
+    # ------------------------
+    # Metrics
+    # ------------------------
+    def game_metrics(self) -> dict[str, float]:
+        """
+        Numeric server metrics (fps, player count, ...) keyed by name.
+        Games without a metrics endpoint report none.
+        """
+        return {}
 
     # ------------------------
     # Abstract Server Methods
@@ -78,8 +266,13 @@ class RESTSteamServerAPI(ABC):
         pass
 
     @abstractmethod
-    def health_check(self) -> bool:
-        """Get server info (health check)"""
+    def _light_probe(self) -> None:
+        """Cheap HTTP liveness request; raise SteamAPIRequestError on failure."""
+        pass
+
+    @abstractmethod
+    def _full_probe(self) -> None:
+        """Full info request; raise SteamAPIRequestError on failure."""
         pass
 
     @abstractmethod
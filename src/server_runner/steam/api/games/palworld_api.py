@@ -1,12 +1,21 @@
+from collections.abc import Mapping
 from typing import Any
 
 from requests.auth import HTTPBasicAuth
 
 from server_runner.steam.api.auth_info import AuthInfo
-from server_runner.steam.api.games.base_rest_api import (
-    RESTSteamServerAPI,
-    SteamAPIRequestError,
-)
+from server_runner.steam.api.games.base_rest_api import RESTSteamServerAPI
+
+# /v1/api/metrics field -> exported metric name
+PALWORLD_METRICS: Mapping[str, str] = {
+    "serverfps": "fps",
+    "serverframetime": "frame_time_ms",
+    "currentplayernum": "players",
+    "maxplayernum": "max_players",
+    "uptime": "uptime_seconds",
+    "basecampnum": "base_camps",
+    "days": "in_game_days",
+}
 
 
 class PalWorldAPI(RESTSteamServerAPI):
@@ -48,16 +57,28 @@ class PalWorldAPI(RESTSteamServerAPI):
         """Get server metrics."""
         return self._get("/v1/api/metrics")
 
+    def game_metrics(self) -> dict[str, float]:
+        data = self.metrics()
+        return {
+            name: float(value)
+            for key, name in PALWORLD_METRICS.items()
+            if isinstance(value := data.get(key), int | float)
+        }
+
     # ------------------------
-    # Server Control
+    # Health
     # ------------------------
-    def health_check(self) -> bool:
-        try:
-            self._get("/v1/api/info")
-            return True
-        except SteamAPIRequestError:
-            return False
+    def _light_probe(self) -> None:
+        # Palworld has no dedicated health endpoint; the info response is
+        # small, and only its status is checked.
+        self._get_status("/v1/api/info", timeout=self.probe_timeout)
+
+    def _full_probe(self) -> None:
+        self.info()
 
+    # ------------------------
+    # Server Control
+    # ------------------------
     def announce(self, message: str) -> None:
         """Send a server-wide announcement."""
         self._post("/v1/api/announce", {"message": message})
@@ -1,25 +1,73 @@
+import asyncio
+
 from server_runner.commandline.commandline import ServerConfig
+from server_runner.config.logging import DEFAULT_LOG_DIR
 from server_runner.steam.api.create_game_api import create_game_api
+from server_runner.steam.api.games.async_rest_api import AsyncRESTSteamServerAPI
 from server_runner.steam.app.steam_app_id import get_steam_app_id
-from server_runner.steam.managed_game_server import ManagedGameServer
+from server_runner.steam.managed_game_server import (
+    HISTORY_SERIES,
+    ManagedGameServer,
+    UpdateMode,
+)
 from server_runner.steam.server.install_resolver import SteamInstallResolver
 from server_runner.steam.server.process import SteamServerProcess
+from server_runner.steam.server.validate_policy import ValidateMode, ValidatePolicy
+from server_runner.utils.process_output import ProcessOutput
+from server_runner.utils.timeseries import TimeSeriesStore
 from server_runner.utils.wait import Wait
 
 
-def build_game_server(config: ServerConfig) -> ManagedGameServer:
+def build_game_server(
+    config: ServerConfig, loop: asyncio.AbstractEventLoop | None = None
+) -> ManagedGameServer:
+    """
+    Build the managed server. With a loop, its processes are driven by
+    that event loop and an async API client is attached.
+    """
     steam_app_id = get_steam_app_id(config.app_id)
 
     resolver = SteamInstallResolver(
         steam_app_id, steam_path=config.steam_path, install_dir=config.install_dir
     )
 
-    process = SteamServerProcess(steam_app_id, resolver, config.game_args)
+    # Drain game output so a chatty server never blocks on a full pipe.
+    output = ProcessOutput(
+        log_file=DEFAULT_LOG_DIR / f"{steam_app_id.name.lower()}.log"
+    )
+    process = SteamServerProcess(
+        steam_app_id,
+        resolver,
+        config.game_args,
+        output=output,
+        steamcmd_session=config.steamcmd_session,
+        validate_policy=ValidatePolicy(
+            steam_app_id.value,
+            ValidateMode(config.validate),
+            every=config.validate_every,
+        ),
+        loop=loop,
+    )
 
     api = create_game_api(
         steam_app_id, base_url=config.api_base_url, auth_info=config.auth_info
     )
 
+    async_api = AsyncRESTSteamServerAPI(api) if loop is not None else None
+
     wait = Wait()
 
-    return ManagedGameServer(process, api, wait)
+    update_mode = (
+        UpdateMode.STAGED if config.update_mode == "staged" else UpdateMode.IN_PLACE
+    )
+
+    return ManagedGameServer(
+        process,
+        api,
+        wait,
+        state_ttl=config.state_ttl,
+        update_mode=update_mode,
+        async_api=async_api,
+        history=TimeSeriesStore(HISTORY_SERIES, path=config.history_file),
+        history_interval=config.history_interval,
+    )
@@ -1,25 +1,89 @@
+import math
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
 from enum import Enum, auto
 
 from server_runner.config.logging import get_logger
-from server_runner.steam.api.games.base_rest_api import RESTSteamServerAPI
+from server_runner.steam.api.games.async_rest_api import AsyncRESTSteamServerAPI
+from server_runner.steam.api.games.base_rest_api import (
+    HealthResult,
+    RESTSteamServerAPI,
+    SteamAPIRequestError,
+)
+from server_runner.steam.oom_predictor import (
+    DEFAULT_OOM_THRESHOLD,
+    MemoryForecast,
+    OOMPredictor,
+)
+from server_runner.steam.server.depot_diff import MAX_COUNTDOWN_MINUTES, UpdatePlan
 from server_runner.steam.server.process import SteamServerProcess
+from server_runner.steam.server.steamcmd import ProgressCallback, SteamCmdProgress
+from server_runner.utils.cancellation import CancellationToken
+from server_runner.utils.coalescing_cache import CoalescingCache
+from server_runner.utils.managed_process import ProcessExit
+from server_runner.utils.resource_sampler import ResourceSnapshot
+from server_runner.utils.timeseries import TimeSeriesStore
 from server_runner.utils.wait import Wait
 
 log = get_logger()
 
+DEFAULT_STATE_TTL = 5.0
+DEFAULT_HISTORY_INTERVAL = 60.0  # minute buckets are what the OOM trend fits
+DEFAULT_BOOT_TIMEOUT = 300
+# Countdowns before an OOM restart: over the threshold, or forecast to be
+OOM_COUNTDOWN_MINUTES = 1
+PREDICTED_OOM_COUNTDOWN_MINUTES = 5
+# Series kept in ManagedGameServer.history; fps and players come from the game
+HISTORY_SERIES = (
+    "rss_bytes",
+    "memory_percent",
+    "cpu_percent",
+    "fps",
+    "players",
+    "api_latency_ms",
+)
+
 
 class StopMode(Enum):
     GRACEFUL = auto()
     FORCE = auto()
 
 
+class UpdateMode(Enum):
+    IN_PLACE = auto()  # Stop, then download and apply over the live install
+    STAGED = auto()  # Download beside the live install, then swap directories
+
+
 class ServerState(Enum):
     RUNNING = auto()  # Process running and API responsive
     UNRESPONSIVE = auto()  # Process running, API not responding
     STOPPED = auto()  # Process is not running
+    CIRCUIT_OPEN = auto()  # Process running, API calls suspended after failures
     UNKNOWN = auto()  # Cannot determine state
 
 
+@dataclass(frozen=True, slots=True)
+class ServerSample:
+    timestamp: float  # wall clock
+    state: ServerState
+    resources: ResourceSnapshot
+    game: dict[str, float]  # empty unless the game API answered
+    api_latency: float | None  # seconds taken by the game metrics call
+
+    def values(self) -> dict[str, float]:
+        """Values by history series name; NaN where nothing was measured."""
+        values: dict[str, float] = dict.fromkeys(HISTORY_SERIES, math.nan)
+        if self.resources.process_count:
+            values["rss_bytes"] = self.resources.rss_bytes
+            values["memory_percent"] = self.resources.memory_percent
+            values["cpu_percent"] = self.resources.cpu_percent
+        values.update(self.game)
+        if self.api_latency is not None:
+            values["api_latency_ms"] = self.api_latency * 1000
+        return values
+
+
 class ManagedGameServer:
     """
     High-level interface for managing a game server instance,
@@ -27,30 +91,197 @@ class ManagedGameServer:
     """
 
     def __init__(
-        self, process: SteamServerProcess, api: RESTSteamServerAPI, wait: Wait
+        self,
+        process: SteamServerProcess,
+        api: RESTSteamServerAPI,
+        wait: Wait,
+        state_ttl: float = DEFAULT_STATE_TTL,
+        update_mode: UpdateMode = UpdateMode.IN_PLACE,
+        boot_timeout: int = DEFAULT_BOOT_TIMEOUT,
+        async_api: AsyncRESTSteamServerAPI | None = None,
+        history: TimeSeriesStore | None = None,
+        history_interval: float = DEFAULT_HISTORY_INTERVAL,
     ):
         self.process = process
         self.api = api
+        # Set when running on an event loop; used by the *_async methods
+        self.async_api = async_api
         self.wait = wait
+        self.update_mode = update_mode
+        self.boot_timeout = boot_timeout
+        # Fed by sample(); in memory only unless given a file-backed store
+        self.history = history or TimeSeriesStore(HISTORY_SERIES)
+        self.history_interval = history_interval
+        self._record_due = 0.0  # monotonic time of the next history record
+        self.oom_predictor = OOMPredictor(self.history)
+        self._started_at: float | None = None  # wall clock of the last start()
+        # Last positive OOM check, and the countdown latched from it
+        self._oom_forecast: MemoryForecast | None = None
+        self._oom_countdown = OOM_COUNTDOWN_MINUTES
+
+        # Shared across the scheduler, consumer and main threads so that
+        # concurrent callers coalesce onto one health probe.
+        self._state_cache = CoalescingCache(self._probe_state, ttl=state_ttl)
+        self._state_observers: list[Callable[[ServerState], None]] = []
+        self.process.on_exit(lambda _: self._state_cache.invalidate())
+
+        self._update_plan: UpdatePlan | None = None
+        # Latest steamcmd progress of the running update, for metrics
+        self.update_progress: SteamCmdProgress | None = None
 
     # ---------------------------------------------------------------------
     # State
     # ---------------------------------------------------------------------
 
-    def state(self) -> ServerState:
-        process_alive = self.process.is_running()
-        api_responsive = self.api.health_check()
-
-        if not process_alive:
-            return ServerState.STOPPED
+    def state(self, *, fresh: bool = False) -> ServerState:
+        """
+        Return the server state, served from a short-lived cache.
+        Pass fresh=True when the decision must reflect the current state.
+        """
+        return self._state_cache.get(fresh=fresh)
+
+    def invalidate_state(self) -> None:
+        self._state_cache.invalidate()
+
+    def on_state(self, callback: Callable[[ServerState], None]) -> None:
+        """Register a callback fired with the result of every state probe."""
+        self._state_observers.append(callback)
+
+    def _observed(self, state: ServerState) -> ServerState:
+        for callback in list(self._state_observers):
+            try:
+                callback(state)
+            except Exception as e:
+                log.error(f"State observer failed: {type(e).__name__} - {e}")
+        return state
+
+    def _probe_state(self) -> ServerState:
+        if not self.process.is_running():
+            return self._observed(ServerState.STOPPED)
+        return self._observed(self._state_from_health(self.api.health()))
+
+    async def state_async(self, *, fresh: bool = False) -> ServerState:
+        """state() without blocking the event loop; shares the same cache."""
+        api = self.async_api
+        if api is None:
+            raise RuntimeError("No async API configured")
+        return await self._state_cache.get_async(
+            lambda: self._probe_state_async(api), fresh=fresh
+        )
 
-        if not api_responsive:
+    async def _probe_state_async(self, api: AsyncRESTSteamServerAPI) -> ServerState:
+        if not self.process.is_running():
+            return self._observed(ServerState.STOPPED)
+        return self._observed(self._state_from_health(await api.health()))
+
+    @staticmethod
+    def _state_from_health(health: HealthResult) -> ServerState:
+        if health.circuit_open:
+            return ServerState.CIRCUIT_OPEN
+
+        if not health.healthy:
+            tier = health.failed_tier.name if health.failed_tier else "unknown"
+            log.debug(
+                f"Health check failed at {tier} "
+                f"after {health.latency * 1000:.0f}ms: {health.detail}"
+            )
             return ServerState.UNRESPONSIVE
 
         return ServerState.RUNNING
 
-    def is_out_of_memory(self) -> bool:
-        return self.process.get_memory_usage() >= 80.0
+    def on_unexpected_exit(self, callback: Callable[[ProcessExit], None]) -> None:
+        """
+        Register a callback fired as soon as the game process exits
+        without having been asked to stop (i.e. a crash).
+        """
+
+        def handle_exit(event: ProcessExit) -> None:
+            if event.expected:
+                return
+            log.warning(
+                f"Server process {event.pid} exited unexpectedly "
+                f"(code {event.returncode})"
+            )
+            callback(event)
+
+        self.process.on_exit(handle_exit)
+
+    def resources(self) -> ResourceSnapshot:
+        """Return resource usage for the whole server process tree."""
+        return self.process.resources()
+
+    def game_metrics(self) -> dict[str, float]:
+        """Game-reported metrics, or none while the API is unavailable."""
+        if self.state() is not ServerState.RUNNING:
+            return {}
+        try:
+            return self.api.game_metrics()
+        except SteamAPIRequestError as e:
+            log.debug(f"Failed to read game metrics: {e}")
+            return {}
+
+    def sample(self) -> ServerSample:
+        """
+        Sample resources and game metrics. Recorded into history at most
+        once per history_interval, however often metrics are scraped.
+        """
+        resources = self.resources()
+        state = self.state()
+        started = time.monotonic()
+        game = self.game_metrics()
+        latency = time.monotonic() - started if game else None
+        sample = ServerSample(time.time(), state, resources, game, latency)
+        now = time.monotonic()
+        if now >= self._record_due:
+            # Step from the previous due time so that a sample arriving just
+            # before it does not stretch the cadence; restart after a gap
+            due = self._record_due + self.history_interval
+            self._record_due = due if due > now else now + self.history_interval
+            self.history.record(sample.values(), sample.timestamp)
+        return sample
+
+    def is_out_of_memory(self, threshold: float = DEFAULT_OOM_THRESHOLD) -> bool:
+        snapshot = self.resources()
+        log.debug(
+            f"Server memory {snapshot.memory_percent:.1f}% "
+            f"(rss={snapshot.rss_bytes}, pss={snapshot.pss_bytes}, "
+            f"processes={snapshot.process_count})"
+        )
+        return snapshot.memory_percent >= threshold
+
+    def oom_restart_due(self) -> bool:
+        """
+        Whether to restart for memory: it is over the threshold now, or the
+        memory trend reaches it soon and the server is quiet enough.
+        """
+        if self.is_out_of_memory(self.oom_predictor.threshold):
+            self._oom_forecast = None
+            return True
+        forecast = self.oom_predictor.restart_due(self._started_at)
+        if forecast is None or forecast.time_to_threshold is None:
+            return False
+        log.info(
+            f"Memory at {forecast.current:.1f}% is forecast to reach "
+            f"{self.oom_predictor.threshold:.0f}% in "
+            f"{forecast.time_to_threshold / 60:.0f} min; restarting early"
+        )
+        self._oom_forecast = forecast
+        return True
+
+    def latch_oom_countdown(self) -> None:
+        """
+        Fix the countdown of the OOM job from the check that enqueues it.
+        Called on the scheduler thread once oom_restart_due() returned True,
+        so later checks cannot change the countdown of a queued job.
+        """
+        if self._oom_forecast is None:
+            self._oom_countdown = OOM_COUNTDOWN_MINUTES
+        else:
+            self._oom_countdown = PREDICTED_OOM_COUNTDOWN_MINUTES
+
+    def oom_countdown_minutes(self) -> int:
+        """Countdown latched when the OOM job was last enqueued."""
+        return self._oom_countdown
 
     # ---------------------------------------------------------------------
     # Lifecycle
@@ -62,6 +293,8 @@ class ManagedGameServer:
             log.warning("Server already running")
             return
         self.process.start()
+        self._started_at = time.time()
+        self.invalidate_state()
 
     def stop(self, mode: StopMode = StopMode.GRACEFUL, timeout: int = 60) -> bool:
         """
@@ -70,7 +303,18 @@ class ManagedGameServer:
         GRACEFUL will attempt API shutdown first and escalate to FORCE
         if the server does not stop within the timeout.
         """
-        state = self.state()
+        stopped = False
+        try:
+            stopped = self._stop(mode, timeout)
+            return stopped
+        finally:
+            if not stopped and self.process.is_running():
+                # The stop gave up; a later exit of this process is a crash
+                self.process.clear_expected_exit()
+            self.invalidate_state()
+
+    def _stop(self, mode: StopMode, timeout: int) -> bool:
+        state = self.state(fresh=True)
 
         if state is ServerState.STOPPED:
             log.info("Server already stopped")
@@ -106,12 +350,10 @@ class ManagedGameServer:
         self.api.save()
 
         log.info("Requesting graceful shutdown via API")
+        self.process.expect_exit()
         self.api.shutdown("Server shutting down", delay=5)
 
-        stopped = self.wait.until(
-            lambda: not self.process.is_running(),
-            timeout=timeout,
-        )
+        stopped = self.process.wait_for_exit(timeout)
 
         if stopped:
             log.info("Server stopped successfully")
@@ -121,19 +363,14 @@ class ManagedGameServer:
 
     def _stop_forcefully(self, timeout: int) -> bool:
         """Terminate the server process at the OS level."""
-        state = self.state()
-
-        # Validate that it isn't already stopped
-        if state is ServerState.STOPPED:
+        # Only the process matters here; skip the API probe.
+        if not self.process.is_running():
             return True
 
         log.info("Force stopping server process")
         self.process.stop()
 
-        stopped = self.wait.until(
-            lambda: not self.process.is_running(),
-            timeout=timeout,
-        )
+        stopped = self.process.wait_for_exit(timeout)
 
         if stopped:
             log.info("Server force-stopped successfully")
@@ -147,7 +384,27 @@ class ManagedGameServer:
     # ---------------------------------------------------------------------
 
     def update_available(self) -> bool:
-        return self.process.is_update_available()
+        self._update_plan = self.process.update_plan()
+        return self._update_plan is not None and self._update_plan.update_required
+
+    def update_countdown_minutes(self) -> int:
+        """Countdown length for the last detected update, sized by its delta."""
+        if self._update_plan is None or not self._update_plan.update_required:
+            return MAX_COUNTDOWN_MINUTES
+        return self._update_plan.countdown_minutes
+
+    def prepare_update(self, cancel_token: CancellationToken | None = None) -> bool:
+        """
+        In STAGED mode, download a pending update beside the live install
+        while the server keeps running. No-op in IN_PLACE mode. Cancelling
+        cancel_token stops the download.
+        """
+        if self.update_mode is not UpdateMode.STAGED:
+            return False
+        if not self.update_available():
+            return False
+        log.info("Staging server update while the server is running")
+        return self.process.stage_update(self._progress_reporter(), cancel_token)
 
     def update(self) -> None:
         """
@@ -156,16 +413,96 @@ class ManagedGameServer:
         Safe to call at any time. If the server is running, it will be
         stopped before applying the update.
         """
-        if not self.process.is_update_available():
+        if not self.update_available():
             log.debug("No server update available")
             return
 
-        log.info("Server update available")
+        plan = self._update_plan
+        assert plan is not None
+        log.info(
+            f"Server update available; estimated downtime "
+            f"{plan.estimated_downtime / 60:.1f} min"
+        )
+
+        if self.update_mode is UpdateMode.STAGED:
+            self._apply_staged_update()
+            return
 
         self.stop(StopMode.GRACEFUL)
 
         log.info("Applying server update")
-        self.process.update()
+        self.process.update(self._progress_reporter())
+
+    def _apply_staged_update(self) -> None:
+        """Swap in the staged build, rolling back if it fails to come up."""
+        if not self.process.has_staged_update() and not self.process.stage_update(
+            self._progress_reporter()
+        ):
+            log.error("No staged update available; skipping update")
+            return
+
+        self.stop(StopMode.GRACEFUL)
+
+        log.info("Swapping in staged server build")
+        try:
+            self.process.swap_staged_update()
+        except OSError as e:
+            # swap() undid its steps; the old build is still in place
+            log.error(f"Failed to swap in staged build: {e}; restarting old build")
+            self.start()
+            return
+        self.start()
+
+        if self.wait.until(
+            lambda: self.state(fresh=True) is ServerState.RUNNING,
+            timeout=self.boot_timeout,
+            interval=5.0,
+        ):
+            log.info("Staged update is healthy")
+            self.process.commit_staged_update()
+            return
+
+        log.error("Staged build failed its health check; rolling back")
+        self.stop(StopMode.FORCE)
+        try:
+            self.process.rollback_staged_update()
+        except OSError as e:
+            log.error(f"Failed to roll back staged build: {e}")
+        self.start()
+
+    def _progress_reporter(self) -> ProgressCallback:
+        """Log update progress every 10% and announce it every 25%."""
+        last_logged = -1
+        last_announced = 0
+
+        def report(progress: SteamCmdProgress) -> None:
+            nonlocal last_logged, last_announced
+            self.update_progress = progress
+            step = int(progress.percent // 10)
+            if step != last_logged:
+                last_logged = step
+                log.info(
+                    f"Update {progress.state}: {progress.percent:.1f}% "
+                    f"({progress.current_bytes / 1024**2:.0f}"
+                    f"/{progress.total_bytes / 1024**2:.0f} MiB)"
+                )
+            quarter = int(progress.percent // 25)
+            if progress.state == "downloading" and quarter > last_announced:
+                last_announced = quarter
+                # Only reaches players when staging while the server runs
+                self.announce(f"Downloading update: {quarter * 25}%")
+
+        return report
+
+    def cancel_operations(self) -> None:
+        """Abort long-running operations such as an in-flight steamcmd run."""
+        self.process.cancel_operations()
+
+    def close(self) -> None:
+        """Release API connections, the steamcmd session and history file."""
+        self.api.close()
+        self.process.close()
+        self.history.close()
 
     def announce(self, message: str) -> bool:
         if self.state() is not ServerState.RUNNING:
@@ -174,3 +511,13 @@ class ManagedGameServer:
 
         self.api.announce(message)
         return True
+
+    async def announce_async(self, message: str) -> bool:
+        if self.async_api is None:
+            raise RuntimeError("No async API configured")
+        if await self.state_async() is not ServerState.RUNNING:
+            log.debug("Skipping announce; server not running")
+            return False
+
+        await self.async_api.announce(message)
+        return True
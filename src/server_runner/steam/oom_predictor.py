@@ -0,0 +1,161 @@
+import math
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from server_runner.config.logging import get_logger
+from server_runner.utils.timeseries import Point, TimeSeriesStore
+
+log = get_logger()
+
+DEFAULT_OOM_THRESHOLD = 80.0  # percent of system memory
+DEFAULT_FIT_WINDOW = 2 * 3600  # seconds of history the trend is fitted over
+DEFAULT_WARMUP = 10 * 60  # seconds after start while the world is loading
+DEFAULT_HORIZON = 6 * 3600  # only act on forecasts this close
+DEFAULT_URGENT_LEAD = 30 * 60  # restart regardless of players this close
+MIN_FIT_POINTS = 20  # minute buckets needed before trusting a trend
+MIN_R_SQUARED = 0.6  # how linear growth must look to be acted on
+QUIET_PLAYERS = 2  # at or below this many players a restart is cheap
+PLAYER_PROFILE_DAYS = 7  # history used for the expected players per hour
+
+
+@dataclass(frozen=True, slots=True)
+class Trend:
+    slope: float  # units per second
+    intercept: float  # value at timestamp 0
+    r_squared: float
+
+
+@dataclass(frozen=True, slots=True)
+class MemoryForecast:
+    current: float  # memory percent at the last sample
+    trend: Trend
+    samples: int  # minute buckets fitted
+    time_to_threshold: float | None  # seconds; None unless steadily growing
+
+
+def fit_trend(points: Sequence[Point]) -> Trend | None:
+    """Least-squares line through bucket means; None for fewer than 2 points."""
+    n = len(points)
+    if n < 2:
+        return None
+    # Centre on the first timestamp to keep the sums well conditioned
+    origin = points[0].timestamp
+    xs = [p.timestamp - origin for p in points]
+    ys = [p.mean for p in points]
+    mean_x = sum(xs) / n
+    mean_y = sum(ys) / n
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    if sxx == 0:
+        return None
+    sxy = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys, strict=True))
+    syy = sum((y - mean_y) ** 2 for y in ys)
+    slope = sxy / sxx
+    r_squared = sxy * sxy / (sxx * syy) if syy else 1.0
+    intercept = mean_y - slope * (mean_x + origin)
+    return Trend(slope, intercept, r_squared)
+
+
+class OOMPredictor:
+    """
+    Forecasts when the server will cross the OOM threshold from its memory
+    history, so the restart can be moved to a quiet time beforehand.
+
+    A line is fitted over the minute buckets of memory_percent since the
+    server started (after warm-up), capped at the fit window. A forecast
+    only counts when memory is growing and the fit is close to linear;
+    steady leaks look like this, load spikes and GC sawtooth do not.
+    """
+
+    def __init__(
+        self,
+        history: TimeSeriesStore,
+        *,
+        threshold: float = DEFAULT_OOM_THRESHOLD,
+        window: float = DEFAULT_FIT_WINDOW,
+        warmup: float = DEFAULT_WARMUP,
+        horizon: float = DEFAULT_HORIZON,
+        urgent_lead: float = DEFAULT_URGENT_LEAD,
+        quiet_players: int = QUIET_PLAYERS,
+    ):
+        self.history = history
+        self.threshold = threshold
+        self.window = window
+        self.warmup = warmup
+        self.horizon = horizon
+        self.urgent_lead = urgent_lead
+        self.quiet_players = quiet_players
+
+    def forecast(
+        self, started_at: float | None, now: float | None = None
+    ) -> MemoryForecast | None:
+        """Trend since started_at (wall clock), or None without enough data."""
+        now = time.time() if now is None else now
+        since = now - self.window
+        if started_at is not None:
+            since = max(since, started_at + self.warmup)
+        points = self.history.range("memory_percent", since, now, resolution=60.0)
+        if len(points) < MIN_FIT_POINTS:
+            return None
+        trend = fit_trend(points)
+        if trend is None:
+            return None
+
+        current = points[-1].mean
+        ttt: float | None = None
+        if trend.slope > 0 and trend.r_squared >= MIN_R_SQUARED:
+            ttt = max(0.0, (self.threshold - current) / trend.slope)
+        return MemoryForecast(current, trend, len(points), ttt)
+
+    def restart_due(
+        self, started_at: float | None, now: float | None = None
+    ) -> MemoryForecast | None:
+        """
+        The forecast when an early restart should happen now: the threshold
+        is within the urgent lead, or within the horizon and this is as
+        quiet as it will get before then. None otherwise.
+        """
+        now = time.time() if now is None else now
+        forecast = self.forecast(started_at, now)
+        if forecast is None or forecast.time_to_threshold is None:
+            return None
+        ttt = forecast.time_to_threshold
+        if ttt > self.horizon:
+            return None
+
+        trend = forecast.trend
+        log.debug(
+            f"Memory {forecast.current:.1f}% growing {trend.slope * 3600:.2f}%/h "
+            f"(r²={trend.r_squared:.2f}); {self.threshold:.0f}% in {ttt / 60:.0f} min"
+        )
+        if ttt <= self.urgent_lead or self.is_quiet(now, now + ttt):
+            return forecast
+        return None
+
+    def is_quiet(self, now: float, until: float) -> bool:
+        """
+        Whether the current player count is low, either outright or compared
+        with the players usually online at each hour before until.
+        Without player history nothing counts as quiet.
+        """
+        latest = self.history.latest("players")
+        if latest is None or now - latest[0] > 10 * 60:
+            return False
+        players = latest[1]
+        if players <= self.quiet_players:
+            return True
+
+        expected = self._expected_players(now, until)
+        return bool(expected) and players <= min(expected)
+
+    def _expected_players(self, now: float, until: float) -> list[float]:
+        """Mean players seen at each local hour of day from now until then."""
+        start = now - PLAYER_PROFILE_DAYS * 86400
+        by_hour: dict[int, list[float]] = {}
+        for point in self.history.range("players", start, now, resolution=3600.0):
+            by_hour.setdefault(time.localtime(point.timestamp).tm_hour, []).append(
+                point.mean
+            )
+        hours = range(1, math.ceil((until - now) / 3600) + 1)
+        upcoming = {time.localtime(now + h * 3600).tm_hour for h in hours}
+        return [sum(by_hour[h]) / len(by_hour[h]) for h in upcoming if h in by_hour]
@@ -0,0 +1,97 @@
+import threading
+from collections.abc import Mapping
+from dataclasses import dataclass
+from enum import IntFlag
+from pathlib import Path
+from typing import Any
+
+import vdf  # type: ignore[reportUnknownMemberType]
+
+from server_runner.config.logging import get_logger
+
+log = get_logger()
+
+
+class StateFlags(IntFlag):
+    """Subset of Steam's EAppState bits found in appmanifest StateFlags."""
+
+    UNINSTALLED = 1
+    UPDATE_REQUIRED = 2
+    FULLY_INSTALLED = 4
+    UPDATE_QUEUED = 8
+    FILES_MISSING = 32
+    FILES_CORRUPT = 128
+    UPDATE_RUNNING = 256
+    UPDATE_PAUSED = 512
+    UPDATE_STARTED = 1024
+
+
+@dataclass(frozen=True, slots=True)
+class InstalledDepot:
+    manifest: str
+    size: int
+
+
+@dataclass(frozen=True, slots=True)
+class AppState:
+    """The AppState section of an appmanifest ACF file."""
+
+    app_id: int
+    name: str
+    installdir: str
+    buildid: int
+    state_flags: StateFlags
+    size_on_disk: int
+    installed_depots: Mapping[str, InstalledDepot]
+
+    @property
+    def fully_installed(self) -> bool:
+        return StateFlags.FULLY_INSTALLED in self.state_flags
+
+    @classmethod
+    def from_vdf(cls, app_state: Mapping[str, Any]) -> "AppState":
+        depots: Mapping[str, Mapping[str, str]] = app_state.get("InstalledDepots", {})
+        return cls(
+            app_id=int(app_state["appid"]),
+            name=app_state.get("name", ""),
+            installdir=app_state["installdir"],
+            buildid=int(app_state["buildid"]),
+            state_flags=StateFlags(int(app_state.get("StateFlags", 0))),
+            size_on_disk=int(app_state.get("SizeOnDisk", 0)),
+            installed_depots={
+                depot_id: InstalledDepot(depot["manifest"], int(depot.get("size", 0)))
+                for depot_id, depot in depots.items()
+            },
+        )
+
+
+class AppManifestReader:
+    """
+    Reads a Steam appmanifest_<appid>.acf file.
+
+    The parsed AppState is cached and only re-read when the file's inode,
+    modification time or size changes, so repeated lookups cost a single
+    stat(). The inode catches a manifest swapped in by rename.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._key: tuple[int, int, int] | None = None
+        self._app_state: AppState | None = None
+
+    def read(self) -> AppState:
+        """Return the manifest's AppState section."""
+        st = self.path.stat()
+        key = (st.st_ino, st.st_mtime_ns, st.st_size)
+        with self._lock:
+            if key != self._key or self._app_state is None:
+                with open(self.path, encoding="utf-8") as f:
+                    self._app_state = AppState.from_vdf(vdf.load(f)["AppState"])
+                self._key = key
+                log.debug(f"Parsed app manifest {self.path}")
+            return self._app_state
+
+    def build_id(self) -> int:
+        """Return the installed build ID recorded in the manifest."""
+        return self.read().buildid
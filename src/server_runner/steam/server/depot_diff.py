@@ -0,0 +1,135 @@
+import math
+import sys
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from server_runner.steam.server.app_manifest import InstalledDepot
+
+# Steam oslist names keyed by sys.platform prefix
+STEAM_OS_NAMES = {"linux": "linux", "win32": "windows", "darwin": "macos"}
+
+# Conservative throughput assumptions used to estimate downtime
+DEFAULT_DOWNLOAD_BYTES_PER_SECOND = 20 * 1024 * 1024
+DEFAULT_APPLY_BYTES_PER_SECOND = 200 * 1024 * 1024
+# Fixed cost of stopping, steamcmd bootstrap and booting the server again
+DEFAULT_RESTART_OVERHEAD_SECONDS = 90.0
+
+MIN_COUNTDOWN_MINUTES = 5
+MAX_COUNTDOWN_MINUTES = 15
+
+
+def current_steam_os() -> str:
+    for prefix, name in STEAM_OS_NAMES.items():
+        if sys.platform.startswith(prefix):
+            return name
+    return sys.platform
+
+
+@dataclass(frozen=True, slots=True)
+class DepotChange:
+    depot_id: str
+    installed_manifest: str | None  # None when the depot is not installed
+    latest_manifest: str
+    download_bytes: int  # compressed bytes steamcmd will fetch
+    size_bytes: int  # size of the depot on disk
+
+
+@dataclass(frozen=True, slots=True)
+class DepotDiff:
+    changes: tuple[DepotChange, ...]
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.changes)
+
+    @property
+    def download_bytes(self) -> int:
+        return sum(c.download_bytes for c in self.changes)
+
+    @property
+    def size_bytes(self) -> int:
+        return sum(c.size_bytes for c in self.changes)
+
+
+@dataclass(frozen=True, slots=True)
+class UpdatePlan:
+    current_build: int | None
+    latest_build: int | None
+    diff: DepotDiff
+    estimated_downtime: float  # seconds
+
+    @property
+    def update_required(self) -> bool:
+        return self.diff.has_changes
+
+    @property
+    def countdown_minutes(self) -> int:
+        """Warn players roughly three times as long as they will be offline."""
+        minutes = math.ceil(self.estimated_downtime / 60) * 3
+        return max(MIN_COUNTDOWN_MINUTES, min(MAX_COUNTDOWN_MINUTES, minutes))
+
+
+def _depot_applies(depot: Mapping[str, Any], os_name: str) -> bool:
+    oslist = depot.get("config", {}).get("oslist")
+    if not oslist:
+        return True
+    return os_name in oslist.split(",")
+
+
+def diff_depots(
+    appinfo: Mapping[str, Any],
+    installed_depots: Mapping[str, InstalledDepot],
+    *,
+    os_name: str | None = None,
+    branch: str = "public",
+) -> DepotDiff:
+    """
+    Compare the depots published for a branch against those installed.
+
+    Args:
+        appinfo: The app's section of an api.steamcmd.net info response.
+        installed_depots: InstalledDepots from the app manifest.
+        os_name: Steam OS name to filter depots by; defaults to this host.
+        branch: Branch whose manifests are compared.
+    """
+    os_name = os_name or current_steam_os()
+    changes: list[DepotChange] = []
+
+    for depot_id, depot in appinfo.get("depots", {}).items():
+        if not depot_id.isdigit() or not isinstance(depot, Mapping):
+            continue  # "branches", "privatebranches", ...
+
+        manifest = depot.get("manifests", {}).get(branch)
+        if not manifest or not _depot_applies(depot, os_name):
+            continue
+
+        depot_state = installed_depots.get(depot_id)
+        installed = depot_state.manifest if depot_state else None
+        if installed == manifest["gid"]:
+            continue
+
+        changes.append(
+            DepotChange(
+                depot_id=depot_id,
+                installed_manifest=installed,
+                latest_manifest=manifest["gid"],
+                download_bytes=int(manifest.get("download", 0)),
+                size_bytes=int(manifest.get("size", 0)),
+            )
+        )
+
+    return DepotDiff(tuple(changes))
+
+
+def estimate_downtime(
+    diff: DepotDiff,
+    *,
+    download_rate: float = DEFAULT_DOWNLOAD_BYTES_PER_SECOND,
+    apply_rate: float = DEFAULT_APPLY_BYTES_PER_SECOND,
+    overhead: float = DEFAULT_RESTART_OVERHEAD_SECONDS,
+) -> float:
+    """Estimate seconds offline for an in-place update applying this diff."""
+    if not diff.has_changes:
+        return 0.0
+    return overhead + diff.download_bytes / download_rate + diff.size_bytes / apply_rate
@@ -1,10 +1,10 @@
 import sys
 from pathlib import Path
 
-import vdf  # type: ignore[reportUnknownMemberType]
-
 from server_runner.config.logging import get_logger
 from server_runner.steam.app.steam_app_id import SteamAppID
+from server_runner.steam.server.app_manifest import AppManifestReader, AppState
+from server_runner.steam.server.library_folders import LibraryIndex, SteamLibrary
 
 log = get_logger()
 
@@ -14,7 +14,8 @@ class SteamInstallResolver:
     Resolves the installation directory of a Steam game.
 
     Exactly one of steam_path or install_dir must be provided:
-    - steam_path: Steam root for manifest-based resolution
+    - steam_path: Steam root for manifest-based resolution across every
+      library listed in its libraryfolders.vdf
     - install_dir: explicit game directory (force_install_dir)
     """
 
@@ -39,6 +40,9 @@ class SteamInstallResolver:
         self.steam_path = Path(steam_path) if steam_path else None
 
         self._validate_paths()
+        self.libraries = LibraryIndex(self.steam_path) if self.steam_path else None
+        # Shared by resolution, version checks and updates; parsed once per change
+        self.manifest = AppManifestReader(self.get_manifest_path())
 
     @classmethod
     def from_install_dir(
@@ -63,30 +67,49 @@ class SteamInstallResolver:
                 f"Steam directory does not exist: {self.steam_path}"
             )
 
-    def _read_manifest(self, root: Path) -> str:
-        """Read the install directory name from the manifest."""
-        manifest = root / self.STEAM_APPS_DIR / f"appmanifest_{self.steam_app_id}.acf"
-        if not manifest.exists():
-            raise FileNotFoundError(
-                f"Manifest not found for App ID {self.steam_app_id}: {manifest}"
-            )
+    def get_manifest_path(self) -> Path:
+        """Return the path of the app's appmanifest ACF file."""
+        return self._manifest_path(self._library_root())
 
-        with open(manifest, encoding="utf-8") as f:
-            data = vdf.load(f)
-        return data["AppState"]["installdir"]
+    def _library_root(self) -> Path:
+        """The install_dir, or the Steam library that holds the app."""
+        if self.install_dir:
+            return self.install_dir
+        assert self.steam_path is not None and self.libraries is not None
+        library = self.libraries.library_for(self.steam_app_id.value)
+        return library.path if library else self.steam_path
+
+    def select_install_library(self, required_bytes: int = 0) -> SteamLibrary:
+        """Choose the library a fresh install should go to."""
+        if self.libraries is None:
+            raise ValueError("Library selection requires steam_path")
+        return self.libraries.select_for_install(required_bytes)
+
+    def _manifest_path(self, root: Path) -> Path:
+        return root / self.STEAM_APPS_DIR / f"appmanifest_{self.steam_app_id}.acf"
+
+    def app_state(self) -> AppState:
+        """Return the parsed manifest, re-reading it only after it changed."""
+        # Follows the app if Steam moved it to another library
+        self.manifest.path = self.get_manifest_path()
+        try:
+            return self.manifest.read()
+        except FileNotFoundError:
+            raise FileNotFoundError(
+                f"Manifest not found for App ID {self.steam_app_id}: "
+                f"{self.manifest.path}"
+            ) from None
 
     def get_game_dir(self) -> tuple[Path, str]:
         """
         Return the game's installation directory path and name.
         Resolves from install_dir if provided, otherwise via steam_path + manifest.
         """
+        name = self.app_state().installdir
         if self.install_dir:
-            name = self._read_manifest(self.install_dir)
             return self.install_dir, name
 
-        assert self.steam_path is not None
-        name = self._read_manifest(self.steam_path)
-        game_dir = self.steam_path / self.STEAM_APPS_DIR / self.COMMON_DIR / name
+        game_dir = self._library_root() / self.STEAM_APPS_DIR / self.COMMON_DIR / name
 
         if not game_dir.exists():
             raise FileNotFoundError(
@@ -0,0 +1,163 @@
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import requests
+from jsonschema import ValidationError, validators
+
+from server_runner.config.logging import get_logger
+from server_runner.steam.server.steamcmd_schema import make_steamcmd_schema
+
+log = get_logger()
+
+STEAMCMD_API_URL = "https://api.steamcmd.net/v1/info/{app_id}"
+DEFAULT_CACHE_DIR = Path("cache")
+DEFAULT_TTL = 300.0
+
+
+@dataclass(slots=True)
+class CachedAppInfo:
+    fetched_at: float  # wall clock, so it stays meaningful across restarts
+    build_id: int
+    change_number: int | None
+    sha: str | None
+    etag: str | None
+    last_modified: str | None
+    appinfo: dict[str, Any]  # data[<app_id>] section of the response
+
+
+class LatestVersionProvider:
+    """
+    Fetches the latest public build of an app from api.steamcmd.net.
+
+    Responses are cached for a TTL and persisted to disk so restarts do not
+    refetch. Refreshes are conditional (ETag / Last-Modified) and a body
+    whose _change_number and _sha match the cache is not re-validated.
+    """
+
+    def __init__(
+        self,
+        app_id: int,
+        *,
+        ttl: float = DEFAULT_TTL,
+        cache_file: Path | None = None,
+        timeout: int = 10,
+    ):
+        self.app_id = app_id
+        self.ttl = ttl
+        self.timeout = timeout
+        self.url = STEAMCMD_API_URL.format(app_id=app_id)
+        self.cache_file = cache_file or DEFAULT_CACHE_DIR / f"appinfo_{app_id}.json"
+
+        # Compile the schema validator once rather than on every check.
+        schema = make_steamcmd_schema(app_id)
+        validator_cls = validators.validator_for(schema)
+        validator_cls.check_schema(schema)
+        self._validator = validator_cls(schema)
+
+        self._session = requests.Session()
+        self._lock = threading.Lock()
+        self._cached = self._load_cache()
+
+    # ------------------------
+    # Public API
+    # ------------------------
+    def latest_version(self, *, force: bool = False) -> int | None:
+        cached = self._refresh(force)
+        return cached.build_id if cached else None
+
+    def app_info(self, *, force: bool = False) -> dict[str, Any] | None:
+        """Return the app's appinfo section (depots, branches, ...)."""
+        cached = self._refresh(force)
+        return cached.appinfo if cached else None
+
+    # ------------------------
+    # Refresh
+    # ------------------------
+    def _refresh(self, force: bool) -> CachedAppInfo | None:
+        with self._lock:
+            cached = self._cached
+            if (
+                cached is not None
+                and not force
+                and time.time() - cached.fetched_at < self.ttl
+            ):
+                return cached
+
+            try:
+                self._cached = self._fetch(cached)
+                self._save_cache(self._cached)
+            except (requests.RequestException, ValidationError, ValueError) as e:
+                log.error(f"Failed to fetch latest version: {e}")
+                if cached is not None:
+                    log.warning("Using last known app info")
+            return self._cached
+
+    def _fetch(self, cached: CachedAppInfo | None) -> CachedAppInfo:
+        headers: dict[str, str] = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        response = self._session.get(self.url, headers=headers, timeout=self.timeout)
+        if response.status_code == 304 and cached is not None:
+            log.debug("App info not modified")
+            cached.fetched_at = time.time()
+            return cached
+        response.raise_for_status()
+
+        data = response.json()
+        appinfo = data.get("data", {}).get(str(self.app_id), {})
+        change_number = appinfo.get("_change_number")
+        sha = appinfo.get("_sha")
+
+        if (
+            cached is not None
+            and change_number is not None
+            and (change_number, sha) == (cached.change_number, cached.sha)
+        ):
+            log.debug(f"App info unchanged (change {change_number})")
+            cached.fetched_at = time.time()
+            return cached
+
+        self._validator.validate(data)
+        build_id = int(appinfo["depots"]["branches"]["public"]["buildid"])
+
+        return CachedAppInfo(
+            fetched_at=time.time(),
+            build_id=build_id,
+            change_number=change_number,
+            sha=sha,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            appinfo=appinfo,
+        )
+
+    # ------------------------
+    # Persistence
+    # ------------------------
+    def _load_cache(self) -> CachedAppInfo | None:
+        try:
+            with open(self.cache_file, encoding="utf-8") as f:
+                return CachedAppInfo(**json.load(f))
+        except FileNotFoundError:
+            return None
+        except (OSError, TypeError, ValueError) as e:
+            log.warning(f"Ignoring unreadable app info cache {self.cache_file}: {e}")
+            return None
+
+    def _save_cache(self, cached: CachedAppInfo) -> None:
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_file.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(asdict(cached), f)
+            os.replace(tmp, self.cache_file)
+        except OSError as e:
+            log.warning(f"Could not persist app info cache: {e}")
@@ -0,0 +1,172 @@
+import os
+import shutil
+import threading
+from collections.abc import Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import vdf  # type: ignore[reportUnknownMemberType]
+
+from server_runner.config.logging import get_logger
+
+log = get_logger()
+
+STEAM_APPS_DIR = "steamapps"
+LIBRARY_FOLDERS_FILE = "libraryfolders.vdf"
+SYS_DEV_BLOCK = Path("/sys/dev/block")
+
+
+@dataclass(frozen=True, slots=True)
+class SteamLibrary:
+    path: Path
+    label: str
+    apps: Mapping[int, int]  # app_id -> size on disk, as recorded by Steam
+
+    @property
+    def steamapps(self) -> Path:
+        return self.path / STEAM_APPS_DIR
+
+    def manifest_path(self, app_id: int) -> Path:
+        return self.steamapps / f"appmanifest_{app_id}.acf"
+
+
+def free_bytes(path: Path) -> int:
+    return shutil.disk_usage(path).free
+
+
+def is_rotational(path: Path) -> bool | None:
+    """
+    Whether the block device backing path is a spinning disk.
+    None when it cannot be determined (non-Linux, network or overlay fs).
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    device = SYS_DEV_BLOCK / f"{os.major(st.st_dev)}:{os.minor(st.st_dev)}"
+    # Partitions keep their queue attributes on the parent disk
+    for queue in (device / "queue", device.resolve().parent / "queue"):
+        try:
+            return (queue / "rotational").read_text().strip() == "1"
+        except OSError:
+            continue
+    return None
+
+
+class LibraryIndex:
+    """
+    Index of the Steam libraries listed in steamapps/libraryfolders.vdf.
+
+    The file is parsed once into an app_id -> library map and re-read only
+    when its (st_mtime_ns, st_size) changes, so locating an app is a dict
+    lookup instead of a scan of every library.
+    """
+
+    def __init__(self, steam_path: Path):
+        self.steam_path = steam_path
+        self.vdf_path = steam_path / STEAM_APPS_DIR / LIBRARY_FOLDERS_FILE
+        self._lock = threading.Lock()
+        self._key: tuple[int, int] | None = None
+        self._libraries: tuple[SteamLibrary, ...] = ()
+        self._by_app: dict[int, SteamLibrary] = {}
+
+    def libraries(self) -> tuple[SteamLibrary, ...]:
+        self._refresh()
+        return self._libraries
+
+    def library_for(self, app_id: int) -> SteamLibrary | None:
+        """Return the library holding app_id's manifest, if any."""
+        self._refresh()
+        library = self._by_app.get(app_id)
+        if library is not None:
+            return library
+
+        # steamcmd does not always record apps in libraryfolders.vdf;
+        # one stat per library is still far cheaper than a directory scan
+        for library in self._libraries:
+            if library.manifest_path(app_id).exists():
+                with self._lock:
+                    self._by_app[app_id] = library
+                return library
+        return None
+
+    def select_for_install(self, required_bytes: int = 0) -> SteamLibrary:
+        """
+        Pick a library for a new install: enough free space first, then
+        solid-state over rotational disks, then the most free space.
+        """
+
+        def rank(library: SteamLibrary) -> tuple[bool, int, int]:
+            try:
+                free = free_bytes(library.path)
+            except OSError:
+                return (False, 0, -1)
+            rotational = is_rotational(library.path)
+            # Unknown media ranks between SSD and HDD
+            speed = {False: 2, None: 1, True: 0}[rotational]
+            return (free >= required_bytes, speed, free)
+
+        ranked = sorted(self.libraries(), key=rank, reverse=True)
+        best = ranked[0]
+        if not rank(best)[0]:
+            log.warning(
+                f"No Steam library has {required_bytes / 1024**3:.1f} GiB free; "
+                f"using {best.path}"
+            )
+        return best
+
+    # ------------------------
+    # Parsing
+    # ------------------------
+    def _refresh(self) -> None:
+        try:
+            st = self.vdf_path.stat()
+            key = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            key = None
+
+        with self._lock:
+            if self._libraries and key == self._key:
+                return
+            self._libraries = self._parse() if key else ()
+            self._key = key
+            if not any(lib.path == self.steam_path for lib in self._libraries):
+                # The Steam root is always a library, listed or not
+                self._libraries = (
+                    SteamLibrary(self.steam_path, "", {}),
+                    *self._libraries,
+                )
+            self._by_app = {
+                app_id: library
+                for library in self._libraries
+                for app_id in library.apps
+            }
+
+    def _parse(self) -> tuple[SteamLibrary, ...]:
+        try:
+            with open(self.vdf_path, encoding="utf-8") as f:
+                data: dict[str, Any] = vdf.load(f)
+        except (OSError, SyntaxError) as e:
+            log.warning(f"Could not read {self.vdf_path}: {e}")
+            return ()
+
+        # Older clients wrote "LibraryFolders" with bare path values
+        folders: Mapping[str, Any] = next(iter(data.values()), {})
+        libraries: list[SteamLibrary] = []
+        for key, entry in folders.items():
+            if not key.isdigit():
+                continue  # "TimeNextStatsReport", "ContentStatsID"
+            if isinstance(entry, str):
+                libraries.append(SteamLibrary(Path(entry), "", {}))
+                continue
+            apps = {
+                int(app_id): int(size or 0)
+                for app_id, size in entry.get("apps", {}).items()
+            }
+            libraries.append(
+                SteamLibrary(Path(entry["path"]), entry.get("label", ""), apps)
+            )
+
+        log.debug(f"Indexed {len(libraries)} Steam libraries from {self.vdf_path}")
+        return tuple(libraries)
@@ -1,11 +1,37 @@
+import asyncio
+import threading
+from collections.abc import Callable
+
 from server_runner.config.logging import get_logger
 from server_runner.steam.app.steam_app_id import SteamAppID
+from server_runner.steam.server.depot_diff import UpdatePlan
 from server_runner.steam.server.install_resolver import SteamInstallResolver
+from server_runner.steam.server.latest_version import DEFAULT_CACHE_DIR
+from server_runner.steam.server.staged_update import (
+    RUNTIME_FILES,
+    STEAMCMD_FILES,
+    StagedUpdate,
+)
+from server_runner.steam.server.steamcmd import (
+    AsyncSteamCmdRunner,
+    ProgressCallback,
+    SteamCmdRunner,
+)
+from server_runner.steam.server.steamcmd_session import SteamCmdSession
+from server_runner.steam.server.validate_policy import ValidatePolicy
 from server_runner.steam.server.version_manager import SteamServerVersionManager
-from server_runner.utils.managed_process import ManagedProcess
+from server_runner.utils.async_process import AsyncManagedProcess
+from server_runner.utils.cancellation import CancellationToken
+from server_runner.utils.integrity import IntegrityChecker
+from server_runner.utils.managed_process import ExitCallback, ManagedProcess
+from server_runner.utils.process_output import OutputLine, ProcessOutput
+from server_runner.utils.resource_sampler import ResourceSnapshot
 
 log = get_logger()
 
+# steamcmd's own files and those the server writes at runtime
+INTEGRITY_EXCLUDE = (*STEAMCMD_FILES, *RUNTIME_FILES)
+
 
 class SteamServerProcess:
     """
@@ -20,6 +46,10 @@ class SteamServerProcess:
         steam_app_id: SteamAppID,
         resolver: SteamInstallResolver,
         server_arguments: list[str] | None = None,
+        output: ProcessOutput | None = None,
+        steamcmd_session: bool = False,
+        validate_policy: ValidatePolicy | None = None,
+        loop: asyncio.AbstractEventLoop | None = None,
     ):
         self.steam_app_id = steam_app_id
         self.server_arguments = server_arguments or []
@@ -27,8 +57,37 @@ class SteamServerProcess:
         self.game_exe = resolver.get_game_executable()
         self.game_cmd = [str(self.game_exe)] + self.server_arguments
 
-        self.proc = ManagedProcess(self.game_cmd)
-        self.version_manager = SteamServerVersionManager(steam_app_id.value)
+        # Cancelled on shutdown to abort any in-flight steamcmd run
+        self.cancel_token = CancellationToken()
+        # With an event loop, the game and steamcmd are watched and drained
+        # by tasks on it instead of per-process threads
+        self.proc: ManagedProcess | AsyncManagedProcess
+        steamcmd: SteamCmdRunner
+        if loop is not None:
+            self.proc = AsyncManagedProcess(self.game_cmd, loop=loop, output=output)
+            steamcmd = AsyncSteamCmdRunner(loop=loop, cancel_token=self.cancel_token)
+        else:
+            self.proc = ManagedProcess(self.game_cmd, output=output)
+            steamcmd = SteamCmdRunner(cancel_token=self.cancel_token)
+        # Keeps one steamcmd logged in across version checks and updates
+        self.steamcmd_session = (
+            SteamCmdSession(cancel_token=self.cancel_token)
+            if steamcmd_session
+            else None
+        )
+        self.version_manager = SteamServerVersionManager(
+            steam_app_id.value,
+            resolver.manifest,
+            steamcmd=steamcmd,
+            session=self.steamcmd_session,
+            validate_policy=validate_policy,
+        )
+        self.staged_update = StagedUpdate(resolver, self.version_manager)
+        self.integrity = IntegrityChecker(
+            resolver.get_game_dir()[0],
+            DEFAULT_CACHE_DIR / f"files_{steam_app_id.value}.json",
+            exclude=INTEGRITY_EXCLUDE,
+        )
 
     # ---------- process management ----------
     def start(self, auto_update: bool = False) -> None:
@@ -36,9 +95,14 @@ class SteamServerProcess:
             log.warning(f"{self.steam_app_id.name} already running (PID {self.pid()})")
             return
 
+        updated = False
         if auto_update and self.version_manager.is_update_available():
             log.info(f"Auto-update enabled, updating {self.steam_app_id.name}...")
-            self.version_manager.update()
+            updated = self.update()
+        if not updated and not self.integrity.has_index:
+            # First run against this install; updates keep it current after
+            log.info("No file index for the install yet; building it")
+            self._refresh_integrity_index()
 
         self.proc.start()
         log.info(f"Started {self.steam_app_id.name} (PID {self.pid()})")
@@ -50,9 +114,27 @@ class SteamServerProcess:
     def is_running(self) -> bool:
         return self.proc.is_running()
 
+    def expect_exit(self) -> None:
+        self.proc.expect_exit()
+
+    def clear_expected_exit(self) -> None:
+        self.proc.clear_expected_exit()
+
+    def wait_for_exit(self, timeout: float | None = None) -> bool:
+        return self.proc.wait_for_exit(timeout)
+
+    def on_exit(self, callback: ExitCallback) -> Callable[[], None]:
+        return self.proc.on_exit(callback)
+
     def pid(self) -> int | None:
         return self.proc.pid()
 
+    def tail(self, n: int = 50) -> list[OutputLine]:
+        return self.proc.tail(n)
+
+    def resources(self) -> ResourceSnapshot:
+        return self.proc.resources()
+
     def get_memory_usage(self) -> float:
         return self.proc.get_process_memory_percent()
 
@@ -63,5 +145,78 @@ class SteamServerProcess:
             log.error(f"Failed to check for updates: {e}")
             return False
 
-    def update(self) -> None:
-        self.version_manager.update()
+    def update_plan(self) -> UpdatePlan | None:
+        try:
+            return self.version_manager.update_plan()
+        except Exception as e:
+            log.error(f"Failed to build update plan: {e}")
+            return None
+
+    def update(self, on_progress: ProgressCallback | None = None) -> bool:
+        updated = self.version_manager.update(
+            on_progress=on_progress, validate=self._validate_override()
+        )
+        if updated:
+            self._refresh_integrity_index()
+        return updated
+
+    # ---------- integrity ----------
+    def _validate_override(self) -> bool | None:
+        """Force a validating update when local files no longer match."""
+        if not self.integrity.has_index:
+            return None
+        try:
+            intact = self.integrity.is_intact()
+        except OSError as e:
+            log.warning(f"Integrity check failed: {e}")
+            return None
+        if not intact:
+            log.warning("Install does not match its file index; validating")
+            return True
+        return None
+
+    def _refresh_integrity_index(self) -> None:
+        # Hashing a fresh install takes a while; keep it off the update path
+        def refresh() -> None:
+            try:
+                self.integrity.refresh()
+            except OSError as e:
+                log.error(f"Failed to index install: {e}")
+
+        threading.Thread(target=refresh, name="IntegrityIndex", daemon=True).start()
+
+    def cancel_operations(self) -> None:
+        self.cancel_token.cancel("shutdown")
+
+    def close(self) -> None:
+        if self.steamcmd_session is not None:
+            self.steamcmd_session.close()
+
+    # ---------- staged updates ----------
+    def stage_update(
+        self,
+        on_progress: ProgressCallback | None = None,
+        cancel_token: CancellationToken | None = None,
+    ) -> bool:
+        try:
+            return self.staged_update.stage(
+                on_progress,
+                validate=self._validate_override(),
+                cancel_token=cancel_token,
+            )
+        except OSError as e:
+            log.error(f"Failed to stage update: {e}")
+            return False
+
+    def has_staged_update(self) -> bool:
+        return self.staged_update.is_staged()
+
+    def swap_staged_update(self) -> None:
+        self.staged_update.swap()
+
+    def rollback_staged_update(self) -> None:
+        self.staged_update.rollback()
+
+    def commit_staged_update(self) -> None:
+        self.staged_update.commit()
+        self._refresh_integrity_index()
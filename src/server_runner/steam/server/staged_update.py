@@ -0,0 +1,274 @@
+import fnmatch
+import os
+import shutil
+from collections.abc import Sequence
+from pathlib import Path
+
+from server_runner.config.logging import get_logger
+from server_runner.steam.server.app_manifest import AppManifestReader
+from server_runner.steam.server.install_resolver import SteamInstallResolver
+from server_runner.steam.server.steamcmd import ProgressCallback
+from server_runner.steam.server.version_manager import SteamServerVersionManager
+from server_runner.utils.cancellation import CancellationToken
+
+log = get_logger()
+
+# Files the server writes at runtime (relative, "/"-separated globs); they
+# belong to the live tree, not to a build
+RUNTIME_FILES = ("*/Saved/*", "*.log")
+# Owned by steamcmd; the staged manifest is copied in separately
+STEAMCMD_FILES = ("steamapps/*",)
+
+
+def _matches(rel: str, patterns: Sequence[str]) -> bool:
+    return any(fnmatch.fnmatch(rel, pattern) for pattern in patterns)
+
+
+def link_tree(
+    source: Path,
+    destination: Path,
+    *,
+    include: Sequence[str] | None = None,
+    exclude: Sequence[str] = (),
+) -> int:
+    """
+    Mirror source into destination using hard links for files, replacing
+    files already there. Only files matching include (all when None) and
+    not matching exclude are linked. Returns the number of files linked.
+    Falls back to copying when the filesystem does not support hard links.
+    """
+    linked = 0
+    for root, _, files in os.walk(source):
+        rel_root = Path(root).relative_to(source)
+        for name in files:
+            rel = (rel_root / name).as_posix()
+            if include is not None and not _matches(rel, include):
+                continue
+            if _matches(rel, exclude):
+                continue
+            src = Path(root) / name
+            dst = destination / rel
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            dst.unlink(missing_ok=True)
+            try:
+                os.link(src, dst)
+            except OSError:
+                shutil.copy2(src, dst)
+            linked += 1
+    return linked
+
+
+def carry_runtime_files(source: Path, destination: Path) -> int:
+    """
+    Make destination's runtime files (saves, logs) those of source: the
+    ones in destination are removed, then source's are linked in.
+    """
+    for root, _, files in os.walk(destination):
+        for name in files:
+            path = Path(root) / name
+            if _matches(path.relative_to(destination).as_posix(), RUNTIME_FILES):
+                path.unlink()
+    return link_tree(source, destination, include=RUNTIME_FILES)
+
+
+class StagedUpdate:
+    """
+    Downloads the next build into a side directory while the live install
+    keeps running, then swaps directories in a couple of renames.
+
+    Layout, next to the live game directory:
+      <game_dir>.staging   new build being prepared (force_install_dir)
+      <game_dir>.previous  last live build, kept until the swap is confirmed
+
+    The staging tree starts as hard links to the live files, so steamcmd
+    only downloads what changed. This relies on steamcmd replacing changed
+    files (write to its download area, then rename) rather than rewriting
+    them in place, which is how it commits updates.
+
+    Saves and logs keep changing in the live tree while the server runs,
+    so they are left out of staging and carried over from whichever tree
+    was live at the moment of a swap or rollback.
+    """
+
+    STAGING_SUFFIX = ".staging"
+    BACKUP_SUFFIX = ".previous"
+    # Written once steamcmd finished, so a half-staged tree is never swapped in
+    STAGED_MARKER = ".staged"
+
+    def __init__(
+        self,
+        resolver: SteamInstallResolver,
+        version_manager: SteamServerVersionManager,
+    ):
+        self.resolver = resolver
+        self.version_manager = version_manager
+
+    # ------------------------
+    # Paths
+    # ------------------------
+    @property
+    def game_dir(self) -> Path:
+        return self.resolver.get_game_dir()[0]
+
+    @property
+    def staging_dir(self) -> Path:
+        return self.game_dir.with_name(self.game_dir.name + self.STAGING_SUFFIX)
+
+    @property
+    def backup_dir(self) -> Path:
+        return self.game_dir.with_name(self.game_dir.name + self.BACKUP_SUFFIX)
+
+    def _staged_manifest(self, root: Path) -> Path:
+        return (
+            root / self.resolver.STEAM_APPS_DIR / self.resolver.get_manifest_path().name
+        )
+
+    def _manifest_is_external(self) -> bool:
+        """True when the manifest lives outside the game dir (steam_path mode)."""
+        manifest = self.resolver.get_manifest_path()
+        return not manifest.is_relative_to(self.game_dir)
+
+    # ------------------------
+    # Stage / Swap / Rollback
+    # ------------------------
+    def is_staged(self) -> bool:
+        return (self.staging_dir / self.STAGED_MARKER).exists()
+
+    def staged_build(self) -> int | None:
+        """Build ID of a completely staged tree, if there is one."""
+        if not self.is_staged():
+            return None
+        try:
+            return AppManifestReader(self._staged_manifest(self.staging_dir)).build_id()
+        except (OSError, KeyError, ValueError, SyntaxError) as e:
+            log.warning(f"Could not read staged build ID: {e}")
+            return None
+
+    def stage(
+        self,
+        on_progress: ProgressCallback | None = None,
+        validate: bool | None = None,
+        cancel_token: CancellationToken | None = None,
+    ) -> bool:
+        """
+        Prepare the new build in the staging directory. Cancelling
+        cancel_token stops the download and discards the staging directory.
+        """
+        staging = self.staging_dir
+        staged = self.staged_build()
+        if (
+            staged is not None
+            and staged == self.version_manager.latest.latest_version()
+        ):
+            log.info(f"Build {staged} is already staged in {staging}")
+            return True
+        if staging.exists():
+            shutil.rmtree(staging)
+
+        linked = link_tree(
+            self.game_dir, staging, exclude=(*STEAMCMD_FILES, *RUNTIME_FILES)
+        )
+        log.info(f"Linked {linked} files into {staging}")
+
+        # steamcmd rewrites the manifest, so it must never share an inode
+        staged_manifest = self._staged_manifest(staging)
+        staged_manifest.unlink(missing_ok=True)
+        staged_manifest.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(self.resolver.get_manifest_path(), staged_manifest)
+
+        if not self.version_manager.update(
+            install_dir=staging,
+            on_progress=on_progress,
+            validate=validate,
+            cancel_token=cancel_token,
+        ):
+            log.error("Staged download failed; discarding staging directory")
+            shutil.rmtree(staging, ignore_errors=True)
+            return False
+
+        (staging / self.STAGED_MARKER).touch()
+        log.info(f"Update staged in {staging}")
+        return True
+
+    def swap(self) -> None:
+        """
+        Make the staged build live. The server must be stopped.
+
+        Directories are swapped first and an external manifest is replaced
+        last, so the manifest never names a build that is not in place. If
+        a step fails, the steps already done are undone before the OSError
+        propagates, leaving the old build live and the staged one intact.
+        """
+        game_dir, staging, backup = self.game_dir, self.staging_dir, self.backup_dir
+        manifest = self.resolver.get_manifest_path()
+
+        if backup.exists():
+            shutil.rmtree(backup)
+
+        carried = carry_runtime_files(game_dir, staging)
+        log.info(f"Carried {carried} save and log files into {staging}")
+        os.rename(game_dir, backup)
+        try:
+            os.rename(staging, game_dir)
+        except OSError:
+            os.rename(backup, game_dir)
+            raise
+
+        if self._manifest_is_external():
+            # Keep the old manifest with the old tree for rollback
+            saved_manifest = self._staged_manifest(backup)
+            try:
+                saved_manifest.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(manifest, saved_manifest)
+                shutil.move(self._staged_manifest(game_dir), manifest)
+            except OSError:
+                self._restore_manifest(saved_manifest, manifest)
+                os.rename(game_dir, staging)
+                os.rename(backup, game_dir)
+                raise
+
+        (game_dir / self.STAGED_MARKER).unlink(missing_ok=True)
+        log.info(f"Swapped staged build into {game_dir}")
+
+    @staticmethod
+    def _restore_manifest(saved: Path, manifest: Path) -> None:
+        """Best effort: put the saved manifest back after a failed move."""
+        if not saved.exists():
+            return
+        try:
+            shutil.copy2(saved, manifest)
+        except OSError as e:
+            log.error(f"Failed to restore app manifest {manifest}: {e}")
+
+    def rollback(self) -> None:
+        """
+        Restore the previous build after a failed swap. On OSError the
+        directory renames already done are undone before it propagates.
+        """
+        game_dir, staging, backup = self.game_dir, self.staging_dir, self.backup_dir
+        if not backup.exists():
+            log.error("No previous build to roll back to")
+            return
+
+        if staging.exists():
+            shutil.rmtree(staging)
+        # Keep what the new build saved since the swap
+        carry_runtime_files(game_dir, backup)
+        os.rename(game_dir, staging)
+        try:
+            os.rename(backup, game_dir)
+        except OSError:
+            os.rename(staging, game_dir)
+            raise
+
+        if self._manifest_is_external():
+            shutil.copy2(
+                self._staged_manifest(game_dir), self.resolver.get_manifest_path()
+            )
+        log.warning(f"Rolled back to previous build in {game_dir}")
+
+    def commit(self) -> None:
+        """Drop the previous build once the new one is confirmed healthy."""
+        shutil.rmtree(self.backup_dir, ignore_errors=True)
+        if self._manifest_is_external():
+            self._staged_manifest(self.game_dir).unlink(missing_ok=True)
@@ -0,0 +1,325 @@
+import asyncio
+import queue
+import re
+import time
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass, field
+from enum import Enum, auto
+
+from server_runner.config.logging import get_logger
+from server_runner.utils.async_process import AsyncManagedProcess
+from server_runner.utils.cancellation import CancellationToken
+from server_runner.utils.managed_process import ManagedProcess
+from server_runner.utils.process_output import OutputLine, ProcessOutput
+
+log = get_logger()
+
+STEAMCMD_PATH = "steamcmd"
+
+# e.g. "Update state (0x61) downloading, progress: 43.12 (1312604096 / 3043707696)"
+PROGRESS_PATTERN = re.compile(
+    r"Update state \(0x(?P<code>[0-9a-fA-F]+)\) (?P<state>[^,]+), "
+    r"progress: (?P<percent>[\d.]+) \((?P<current>\d+) / (?P<total>\d+)\)"
+)
+
+
+class SteamCmdPhase(Enum):
+    STARTUP = auto()  # Bootstrap and self-update
+    LOGIN = auto()  # Connecting and logging in
+    COMMAND = auto()  # Running the requested commands
+
+
+DEFAULT_PHASE_TIMEOUTS: Mapping[SteamCmdPhase, float] = {
+    SteamCmdPhase.STARTUP: 300.0,
+    SteamCmdPhase.LOGIN: 120.0,
+    SteamCmdPhase.COMMAND: 3 * 60 * 60.0,
+}
+
+# Lines marking the start of each phase
+_PHASE_MARKERS: Sequence[tuple[str, SteamCmdPhase]] = (
+    ("Logging in user", SteamCmdPhase.LOGIN),
+    ("Connecting anonymously", SteamCmdPhase.LOGIN),
+    ("Waiting for user info", SteamCmdPhase.COMMAND),
+)
+
+
+@dataclass(frozen=True, slots=True)
+class SteamCmdProgress:
+    state_code: int
+    state: str  # e.g. "downloading", "verifying install", "committing"
+    percent: float
+    current_bytes: int
+    total_bytes: int
+
+
+ProgressCallback = Callable[[SteamCmdProgress], None]
+
+
+@dataclass(slots=True)
+class SteamCmdResult:
+    returncode: int | None
+    output: list[str] = field(default_factory=list)
+    timed_out: SteamCmdPhase | None = None
+    cancelled: bool = False
+
+    @property
+    def ok(self) -> bool:
+        if self.returncode != 0 or self.timed_out or self.cancelled:
+            return False
+        return not any(line.startswith("ERROR!") for line in self.output)
+
+
+def parse_progress(line: str) -> SteamCmdProgress | None:
+    match = PROGRESS_PATTERN.search(line)
+    if not match:
+        return None
+    return SteamCmdProgress(
+        state_code=int(match["code"], 16),
+        state=match["state"].strip(),
+        percent=float(match["percent"]),
+        current_bytes=int(match["current"]),
+        total_bytes=int(match["total"]),
+    )
+
+
+class SteamCmdRunner:
+    """
+    Runs steamcmd as a streaming subprocess.
+
+    Output is consumed line by line as it is produced. Progress lines are
+    parsed into SteamCmdProgress events, every phase has its own deadline,
+    and a cancellation token stops the run between lines.
+    """
+
+    def __init__(
+        self,
+        steamcmd_path: str = STEAMCMD_PATH,
+        *,
+        phase_timeouts: Mapping[SteamCmdPhase, float] | None = None,
+        cancel_token: CancellationToken | None = None,
+        output_lines: int = 500,
+    ):
+        self.steamcmd_path = steamcmd_path
+        self.phase_timeouts = {**DEFAULT_PHASE_TIMEOUTS, **(phase_timeouts or {})}
+        self.cancel_token = cancel_token or CancellationToken()
+        self.output_lines = output_lines
+
+    def run(
+        self,
+        args: Sequence[str],
+        *,
+        on_progress: ProgressCallback | None = None,
+        cancel_token: CancellationToken | None = None,
+    ) -> SteamCmdResult:
+        """
+        Run steamcmd with the given arguments (e.g. ["+login", "anonymous",
+        ..., "+quit"]) and block until it exits, times out or is cancelled.
+        The run is cancelled with the runner's token or with cancel_token,
+        e.g. a job's token when the job is preempted.
+        """
+        lines: queue.Queue[OutputLine | None] = queue.Queue()
+        output = ProcessOutput(max_lines=self.output_lines)
+        output.subscribe(lines.put)
+
+        proc = ManagedProcess([self.steamcmd_path, *args], output=output)
+        # None wakes the loop on exit or cancellation without polling; exit
+        # callbacks fire once the output has been drained, so it comes last
+        proc.on_exit(lambda _: lines.put(None))
+        token, unlink = self._run_token(cancel_token)
+        stop_following = token.on_cancel(lambda: lines.put(None))
+        proc.start()
+
+        result = SteamCmdResult(returncode=None)
+        phase = SteamCmdPhase.STARTUP
+        phase_deadline = time.monotonic() + self.phase_timeouts[phase]
+
+        try:
+            while True:
+                if token.cancelled:
+                    log.warning(f"steamcmd run cancelled: {token.reason}")
+                    result.cancelled = True
+                    break
+
+                remaining = phase_deadline - time.monotonic()
+                if remaining <= 0:
+                    log.error(f"steamcmd timed out during {phase.name}")
+                    result.timed_out = phase
+                    break
+
+                try:
+                    line = lines.get(timeout=remaining)
+                except queue.Empty:
+                    continue
+                if line is None:
+                    if token.cancelled:
+                        continue
+                    break
+
+                next_phase = self._advance(line, phase, on_progress)
+                if next_phase is not phase:
+                    phase = next_phase
+                    phase_deadline = time.monotonic() + self.phase_timeouts[phase]
+        finally:
+            stop_following()
+            unlink()
+            # Reaps the process and joins the output pump in every case
+            proc.terminate(timeout=10)
+            result.returncode = proc.exit_code()
+            result.output = [line.text for line in output.tail(self.output_lines)]
+
+        return result
+
+    def _run_token(
+        self, cancel_token: CancellationToken | None
+    ) -> tuple[CancellationToken, Callable[[], None]]:
+        """
+        Token for one run, cancelled with the runner's token or cancel_token.
+        Returns it with a function that detaches it from both.
+        """
+        token = CancellationToken(self.cancel_token)
+        stop_following = (
+            cancel_token.on_cancel(lambda: token.cancel(cancel_token.reason))
+            if cancel_token is not None
+            else lambda: None
+        )
+
+        def unlink() -> None:
+            stop_following()
+            token.close()
+
+        return token, unlink
+
+    @classmethod
+    def _advance(
+        cls,
+        line: OutputLine,
+        phase: SteamCmdPhase,
+        on_progress: ProgressCallback | None,
+    ) -> SteamCmdPhase:
+        """Report progress on line and return the phase it leaves us in."""
+        next_phase = cls._detect_phase(line.text, phase)
+        if next_phase is not phase:
+            log.debug(f"steamcmd phase {phase.name} -> {next_phase.name}")
+
+        progress = parse_progress(line.text)
+        if progress is not None and on_progress is not None:
+            on_progress(progress)
+        return next_phase
+
+    @staticmethod
+    def _detect_phase(text: str, current: SteamCmdPhase) -> SteamCmdPhase:
+        for marker, phase in _PHASE_MARKERS:
+            if marker in text and phase.value > current.value:
+                return phase
+        return current
+
+
+class AsyncSteamCmdRunner(SteamCmdRunner):
+    """
+    SteamCmdRunner whose subprocess lives on an asyncio event loop.
+
+    run_async() streams output through loop tasks instead of pump and
+    watcher threads. run() keeps the blocking interface for callers on
+    worker threads by running run_async() on the loop.
+    """
+
+    def __init__(
+        self,
+        steamcmd_path: str = STEAMCMD_PATH,
+        *,
+        loop: asyncio.AbstractEventLoop,
+        phase_timeouts: Mapping[SteamCmdPhase, float] | None = None,
+        cancel_token: CancellationToken | None = None,
+        output_lines: int = 500,
+    ):
+        super().__init__(
+            steamcmd_path,
+            phase_timeouts=phase_timeouts,
+            cancel_token=cancel_token,
+            output_lines=output_lines,
+        )
+        self.loop = loop
+
+    def run(
+        self,
+        args: Sequence[str],
+        *,
+        on_progress: ProgressCallback | None = None,
+        cancel_token: CancellationToken | None = None,
+    ) -> SteamCmdResult:
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self.loop:
+            raise RuntimeError("Blocking steamcmd run made on its own event loop")
+        future = asyncio.run_coroutine_threadsafe(
+            self.run_async(args, on_progress=on_progress, cancel_token=cancel_token),
+            self.loop,
+        )
+        return future.result()
+
+    async def run_async(
+        self,
+        args: Sequence[str],
+        *,
+        on_progress: ProgressCallback | None = None,
+        cancel_token: CancellationToken | None = None,
+    ) -> SteamCmdResult:
+        loop = asyncio.get_running_loop()
+        lines: asyncio.Queue[OutputLine | None] = asyncio.Queue()
+        output = ProcessOutput(max_lines=self.output_lines)
+        # Lines and exits are delivered on the loop; cancellation may not be
+        output.subscribe(lines.put_nowait)
+
+        proc = AsyncManagedProcess(
+            [self.steamcmd_path, *args], loop=loop, output=output
+        )
+        proc.on_exit(lambda _: lines.put_nowait(None))
+
+        def wake() -> None:
+            loop.call_soon_threadsafe(lines.put_nowait, None)
+
+        token, unlink = self._run_token(cancel_token)
+        stop_following = token.on_cancel(wake)
+        await proc.start_async()
+
+        result = SteamCmdResult(returncode=None)
+        phase = SteamCmdPhase.STARTUP
+        phase_deadline = time.monotonic() + self.phase_timeouts[phase]
+
+        try:
+            while True:
+                if token.cancelled:
+                    log.warning(f"steamcmd run cancelled: {token.reason}")
+                    result.cancelled = True
+                    break
+
+                remaining = phase_deadline - time.monotonic()
+                if remaining <= 0:
+                    log.error(f"steamcmd timed out during {phase.name}")
+                    result.timed_out = phase
+                    break
+
+                try:
+                    async with asyncio.timeout(remaining):
+                        line = await lines.get()
+                except TimeoutError:
+                    continue
+                if line is None:
+                    if token.cancelled:
+                        continue
+                    break
+
+                next_phase = self._advance(line, phase, on_progress)
+                if next_phase is not phase:
+                    phase = next_phase
+                    phase_deadline = time.monotonic() + self.phase_timeouts[phase]
+        finally:
+            stop_following()
+            unlink()
+            await proc.terminate_async(timeout=10)
+            result.returncode = proc.exit_code()
+            result.output = [line.text for line in output.tail(self.output_lines)]
+
+        return result
@@ -0,0 +1,293 @@
+import codecs
+import contextlib
+import os
+import queue
+import re
+import signal
+import subprocess
+import threading
+import time
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+import vdf  # type: ignore[reportUnknownMemberType]
+
+from server_runner.config.logging import get_logger
+from server_runner.steam.server.steamcmd import (
+    STEAMCMD_PATH,
+    ProgressCallback,
+    SteamCmdPhase,
+    SteamCmdResult,
+    parse_progress,
+)
+from server_runner.utils.cancellation import CancellationToken
+
+log = get_logger()
+
+PROMPT = "Steam>"
+ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;]*[A-Za-z]")
+DEFAULT_LOGIN_TIMEOUT = 300.0
+DEFAULT_COMMAND_TIMEOUT = 120.0
+
+# Reader thread events: a complete line, the prompt, or end of stream
+_LINE = "line"
+_PROMPT = "prompt"
+_EOF = "eof"
+
+
+class SteamCmdSession:
+    """
+    A long-lived, logged-in interactive steamcmd process.
+
+    Commands are written to stdin and their output is read until the next
+    "Steam>" prompt, so repeated calls skip the bootstrap and login cost of
+    a fresh steamcmd. A dead or wedged session is restarted on next use.
+    """
+
+    def __init__(
+        self,
+        steamcmd_path: str = STEAMCMD_PATH,
+        *,
+        login: Sequence[str] = ("anonymous",),
+        cancel_token: CancellationToken | None = None,
+        login_timeout: float = DEFAULT_LOGIN_TIMEOUT,
+    ):
+        self.steamcmd_path = steamcmd_path
+        self.login = list(login)
+        self.cancel_token = cancel_token or CancellationToken()
+        self.login_timeout = login_timeout
+
+        self._lock = threading.Lock()
+        self._proc: subprocess.Popen[bytes] | None = None
+        self._events: queue.Queue[tuple[str, str]] = queue.Queue()
+        self._install_dir: Path | None = None
+        self.cancel_token.on_cancel(self._close_on_cancel)
+
+    # ------------------------
+    # Lifecycle
+    # ------------------------
+    def is_alive(self) -> bool:
+        return self._proc is not None and self._proc.poll() is None
+
+    @property
+    def pid(self) -> int | None:
+        """PID of the current session process, if one was started."""
+        proc = self._proc
+        return proc.pid if proc is not None else None
+
+    def _start(self) -> None:
+        log.info("Starting persistent steamcmd session")
+        self._events = queue.Queue()
+        self._install_dir = None
+        self._proc = subprocess.Popen(  # noqa: S603
+            [self.steamcmd_path, "+login", *self.login],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            preexec_fn=os.setsid,
+            bufsize=0,
+        )
+        threading.Thread(
+            target=self._read,
+            args=(self._proc, self._events),
+            name="SteamCmdSession",
+            daemon=True,
+        ).start()
+
+        result = self._collect(self.login_timeout, SteamCmdPhase.LOGIN)
+        if not result.ok or any("FAILED" in line for line in result.output):
+            self._kill()
+            raise RuntimeError("steamcmd session failed to log in")
+        log.info("steamcmd session logged in")
+
+    def _kill(self) -> None:
+        proc, self._proc = self._proc, None
+        if proc is None or proc.poll() is not None:
+            return
+        with contextlib.suppress(ProcessLookupError):
+            os.killpg(proc.pid, signal.SIGKILL)
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            log.warning(f"steamcmd session (pid {proc.pid}) did not exit after kill")
+
+    def close(self) -> None:
+        """Log out and stop the session process."""
+        with self._lock:
+            self._close()
+
+    def _close_on_cancel(self) -> None:
+        # A running execute() holds the lock and closes the session itself
+        # once it sees the cancellation, so never block the canceller here
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            self._close()
+        finally:
+            self._lock.release()
+
+    def _close(self) -> None:
+        proc = self._proc
+        if proc is not None and proc.poll() is None and proc.stdin is not None:
+            with contextlib.suppress(OSError, subprocess.TimeoutExpired):
+                proc.stdin.write(b"quit\n")
+                proc.wait(timeout=10)
+        self._kill()
+
+    # ------------------------
+    # Output
+    # ------------------------
+    @staticmethod
+    def _read(
+        proc: subprocess.Popen[bytes], events: queue.Queue[tuple[str, str]]
+    ) -> None:
+        """Split raw output into lines and prompts; the prompt has no newline."""
+        assert proc.stdout is not None
+        fd = proc.stdout.fileno()
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        buffer = ""
+        while chunk := os.read(fd, 4096):
+            buffer += ANSI_ESCAPE.sub("", decoder.decode(chunk))
+            *lines, buffer = buffer.split("\n")
+            for line in lines:
+                events.put((_LINE, line.rstrip("\r")))
+            if buffer.rstrip().endswith(PROMPT):
+                events.put((_PROMPT, ""))
+                buffer = ""
+        events.put((_EOF, ""))
+
+    def _collect(
+        self,
+        timeout: float,
+        phase: SteamCmdPhase,
+        on_progress: ProgressCallback | None = None,
+        cancel_token: CancellationToken | None = None,
+    ) -> SteamCmdResult:
+        """Read output until the next prompt, EOF, timeout or cancellation."""
+        result = SteamCmdResult(returncode=None)
+        deadline = time.monotonic() + timeout
+        while True:
+            if self.cancel_token.cancelled or (
+                cancel_token is not None and cancel_token.cancelled
+            ):
+                result.cancelled = True
+                return result
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                result.timed_out = phase
+                return result
+            try:
+                kind, text = self._events.get(timeout=min(remaining, 1.0))
+            except queue.Empty:
+                continue
+
+            if kind == _PROMPT:
+                result.returncode = 0
+                return result
+            if kind == _EOF:
+                result.returncode = self._proc.wait() if self._proc else None
+                return result
+
+            result.output.append(text)
+            progress = parse_progress(text)
+            if progress is not None and on_progress is not None:
+                on_progress(progress)
+
+    # ------------------------
+    # Commands
+    # ------------------------
+    def execute(
+        self,
+        command: str,
+        *,
+        timeout: float = DEFAULT_COMMAND_TIMEOUT,
+        install_dir: Path | None = None,
+        on_progress: ProgressCallback | None = None,
+        cancel_token: CancellationToken | None = None,
+    ) -> SteamCmdResult:
+        """
+        Run one console command (e.g. "app_status 2394010") in the session.
+
+        Args:
+            command: steamcmd console command without the leading "+".
+            timeout: Seconds to wait for the command's prompt.
+            install_dir: force_install_dir for this command. The setting is
+                sticky inside steamcmd, so switching back to the default
+                install location restarts the session.
+            on_progress: Called for every parsed progress line.
+            cancel_token: Abandons the command when cancelled; the session
+                is restarted on next use since its state is then unknown.
+
+        Raises:
+            RuntimeError: The session could not be started or logged in.
+        """
+        with self._lock:
+            try:
+                return self._execute(
+                    command, timeout, install_dir, on_progress, cancel_token
+                )
+            finally:
+                if self.cancel_token.cancelled:
+                    # _close_on_cancel() left the session to us
+                    self._close()
+
+    def _execute(
+        self,
+        command: str,
+        timeout: float,
+        install_dir: Path | None,
+        on_progress: ProgressCallback | None,
+        cancel_token: CancellationToken | None,
+    ) -> SteamCmdResult:
+        if self.cancel_token.cancelled:
+            return SteamCmdResult(returncode=None, cancelled=True)
+        if self.is_alive() and install_dir is None and self._install_dir:
+            self._close()
+        if not self.is_alive():
+            self._start()
+
+        if install_dir is not None and install_dir != self._install_dir:
+            self._send(f"force_install_dir {install_dir.resolve()}")
+            if not self._collect(timeout, SteamCmdPhase.COMMAND).ok:
+                self._kill()
+                return SteamCmdResult(returncode=None)
+            self._install_dir = install_dir
+
+        self._send(command)
+        result = self._collect(
+            timeout, SteamCmdPhase.COMMAND, on_progress, cancel_token
+        )
+        if not result.ok:
+            # Unknown state after a failure; start fresh next time
+            self._kill()
+        return result
+
+    def _send(self, command: str) -> None:
+        assert self._proc is not None and self._proc.stdin is not None
+        log.debug(f"steamcmd> {command}")
+        self._proc.stdin.write(f"{command}\n".encode())
+
+    def app_info(self, app_id: int) -> dict[str, Any] | None:
+        """Return the app's appinfo as printed by app_info_print."""
+        self.execute("app_info_update 1")
+        result = self.execute(f"app_info_print {app_id}")
+        if not result.ok:
+            return None
+
+        # The VDF document starts at the quoted app ID line
+        start = next(
+            (
+                i
+                for i, line in enumerate(result.output)
+                if line.strip() == f'"{app_id}"'
+            ),
+            None,
+        )
+        if start is None:
+            return None
+        try:
+            return vdf.loads("\n".join(result.output[start:]))[str(app_id)]
+        except (SyntaxError, KeyError) as e:
+            log.error(f"Failed to parse app_info_print output: {e}")
+            return None
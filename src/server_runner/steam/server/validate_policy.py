@@ -0,0 +1,81 @@
+import json
+import os
+from enum import Enum
+from pathlib import Path
+
+from server_runner.config.logging import get_logger
+from server_runner.steam.server.latest_version import DEFAULT_CACHE_DIR
+
+log = get_logger()
+
+DEFAULT_VALIDATE_EVERY = 10
+
+
+class ValidateMode(Enum):
+    ALWAYS = "always"
+    NEVER = "never"
+    PERIODIC = "periodic"  # every Nth update
+
+
+class ValidatePolicy:
+    """
+    Decides whether an update passes "validate" to app_update, which makes
+    steamcmd rehash the whole install.
+
+    The number of updates since the last validated one is persisted, so
+    PERIODIC keeps its cadence across restarts.
+    """
+
+    def __init__(
+        self,
+        app_id: int,
+        mode: ValidateMode = ValidateMode.PERIODIC,
+        *,
+        every: int = DEFAULT_VALIDATE_EVERY,
+        state_file: Path | None = None,
+    ):
+        if every < 1:
+            raise ValueError("every must be at least 1")
+        self.mode = mode
+        self.every = every
+        self.state_file = state_file or DEFAULT_CACHE_DIR / f"validate_{app_id}.json"
+        self.updates_since_validate = self._load()
+
+    def should_validate(self) -> bool:
+        match self.mode:
+            case ValidateMode.ALWAYS:
+                return True
+            case ValidateMode.NEVER:
+                return False
+            case ValidateMode.PERIODIC:
+                return self.updates_since_validate + 1 >= self.every
+
+    def record_update(self, validated: bool) -> None:
+        """Count a successful update."""
+        self.updates_since_validate = (
+            0 if validated else self.updates_since_validate + 1
+        )
+        self._save()
+
+    # ------------------------
+    # Persistence
+    # ------------------------
+    def _load(self) -> int:
+        try:
+            with open(self.state_file, encoding="utf-8") as f:
+                return int(json.load(f)["updates_since_validate"])
+        except FileNotFoundError:
+            return 0
+        except (OSError, KeyError, TypeError, ValueError) as e:
+            log.warning(f"Ignoring unreadable validate state {self.state_file}: {e}")
+            return 0
+
+    def _save(self) -> None:
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.state_file.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"updates_since_validate": self.updates_since_validate}, f)
+            os.replace(tmp, self.state_file)
+        except OSError as e:
+            log.warning(f"Could not persist validate state: {e}")
@@ -1,19 +1,29 @@
-# ruff: noqa: S603
-# S603: subprocess calls in this module execute trusted, internal commands only.
-# Command inputs are not user-controlled and are validated at the call sites.
-
-import subprocess
-
-import requests
-from jsonschema import ValidationError, validate
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any
 
 from server_runner.config.logging import get_logger
-from server_runner.steam.server.steamcmd_schema import make_steamcmd_schema
+from server_runner.steam.server.app_manifest import AppManifestReader, InstalledDepot
+from server_runner.steam.server.depot_diff import (
+    DepotDiff,
+    UpdatePlan,
+    diff_depots,
+    estimate_downtime,
+)
+from server_runner.steam.server.latest_version import LatestVersionProvider
+from server_runner.steam.server.steamcmd import (
+    DEFAULT_PHASE_TIMEOUTS,
+    ProgressCallback,
+    SteamCmdPhase,
+    SteamCmdResult,
+    SteamCmdRunner,
+)
+from server_runner.steam.server.steamcmd_session import SteamCmdSession
+from server_runner.steam.server.validate_policy import ValidatePolicy
+from server_runner.utils.cancellation import CancellationToken
 
 log = get_logger()
 
-STEAMCMD_PATH = "steamcmd"
-
 
 class SteamServerVersionManager:
     """
@@ -21,15 +31,81 @@ class SteamServerVersionManager:
     and checking for updates.
     """
 
-    def __init__(self, app_id: int):
+    def __init__(
+        self,
+        app_id: int,
+        manifest: AppManifestReader | None = None,
+        *,
+        steamcmd_fallback: bool = True,
+        latest: LatestVersionProvider | None = None,
+        steamcmd: SteamCmdRunner | None = None,
+        session: SteamCmdSession | None = None,
+        validate_policy: ValidatePolicy | None = None,
+    ):
+        """
+        Args:
+            app_id: Steam App ID.
+            manifest: Reader for the appmanifest ACF holding the installed
+                build; usually shared with the install resolver.
+            steamcmd_fallback: Query steamcmd when the manifest is unavailable.
+            latest: Source of the latest published build.
+            steamcmd: Runner used for one-shot steamcmd invocations.
+            session: Persistent steamcmd session to prefer over the runner;
+                the runner is used whenever the session cannot be started.
+            validate_policy: Decides when updates pass "validate".
+        """
         self.app_id = app_id
-        self.steamcmd_schema = make_steamcmd_schema(self.app_id)
+        self.latest = latest or LatestVersionProvider(app_id)
+        self.steamcmd = steamcmd or SteamCmdRunner()
+        self.manifest = manifest
+        self.steamcmd_fallback = steamcmd_fallback
+        self.session = session
+        self.validate_policy = validate_policy or ValidatePolicy(app_id)
 
-    def get_current_version(self) -> int | None:
+    def _session_execute(
+        self,
+        command: str,
+        *,
+        timeout: float = DEFAULT_PHASE_TIMEOUTS[SteamCmdPhase.COMMAND],
+        install_dir: Path | None = None,
+        on_progress: ProgressCallback | None = None,
+        cancel_token: CancellationToken | None = None,
+    ) -> SteamCmdResult | None:
+        """Run a command in the session; None when no session is usable."""
+        if self.session is None:
+            return None
         try:
-            process = subprocess.run(
+            return self.session.execute(
+                command,
+                timeout=timeout,
+                install_dir=install_dir,
+                on_progress=on_progress,
+                cancel_token=cancel_token,
+            )
+        except (RuntimeError, OSError) as e:
+            log.warning(f"steamcmd session unavailable, using one-shot run: {e}")
+            return None
+
+    def get_current_version(self) -> int | None:
+        """
+        Return the installed build ID, read from the app manifest.
+        Falls back to steamcmd only when the manifest cannot be used.
+        """
+        if self.manifest is not None:
+            try:
+                return self.manifest.build_id()
+            except (OSError, KeyError, ValueError, SyntaxError) as e:
+                log.warning(f"Could not read build ID from manifest: {e}")
+
+        if not self.steamcmd_fallback:
+            return None
+        return self._get_current_version_steamcmd()
+
+    def _get_current_version_steamcmd(self) -> int | None:
+        result = self._session_execute(f"app_status {self.app_id}", timeout=120)
+        if result is None:
+            result = self.steamcmd.run(
                 [
-                    STEAMCMD_PATH,
                     "+login",
                     "anonymous",
                     "+app_info_update",
@@ -37,68 +113,150 @@ class SteamServerVersionManager:
                     "+app_status",
                     str(self.app_id),
                     "+quit",
-                ],
-                capture_output=True,
-                text=True,
-                check=True,
+                ]
             )
+        if not result.ok:
+            log.error(f"Failed to get current version (exit {result.returncode})")
+            return None
 
-            for line in process.stdout.splitlines():
-                if "BuildID" in line:
-                    _, build_id = line.split("BuildID", 1)
+        for line in result.output:
+            if "BuildID" in line:
+                _, build_id = line.split("BuildID", 1)
+                try:
                     return int(build_id.strip())
-
-        except (subprocess.CalledProcessError, ValueError) as e:
-            log.error(f"Failed to get current version: {e}")
+                except ValueError as e:
+                    log.error(f"Failed to get current version: {e}")
+                    return None
 
         return None
 
-    def get_latest_version(self) -> int | None:
-        url = f"https://api.steamcmd.net/v1/info/{self.app_id}"
+    def _installed_depots(self) -> Mapping[str, InstalledDepot]:
+        if self.manifest is None:
+            return {}
+        try:
+            return self.manifest.read().installed_depots
+        except (OSError, KeyError, ValueError, SyntaxError) as e:
+            log.warning(f"Could not read installed depots from manifest: {e}")
+            return {}
+
+    def update_plan(self) -> UpdatePlan | None:
+        """
+        Compare the installed depots with the latest published ones.
+
+        Returns None when either side cannot be determined. Without depot
+        information in the manifest, any build mismatch is treated as a
+        full download of every depot for this OS.
+        """
+        current = self.get_current_version()
+        appinfo = self.latest.app_info()
+        if appinfo is None and self.session is not None:
+            appinfo = self._session_app_info()
+        if current is None or appinfo is None:
+            return None
+
+        latest = int(appinfo["depots"]["branches"]["public"]["buildid"])
+        installed = self._installed_depots()
+
+        if installed:
+            diff = diff_depots(appinfo, installed)
+        elif current != latest:
+            diff = diff_depots(appinfo, {})
+        else:
+            diff = DepotDiff(())
+
+        if current != latest and not diff.has_changes:
+            log.info(f"Build {current} -> {latest} changes no depots for this host")
+
+        return UpdatePlan(current, latest, diff, estimate_downtime(diff))
+
+    def _session_app_info(self) -> dict[str, Any] | None:
+        assert self.session is not None
         try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            validate(instance=data, schema=self.steamcmd_schema)
-            buildid = data["data"][str(self.app_id)]["depots"]["branches"]["public"][
-                "buildid"
-            ]
-            latest_version = int(buildid)
-            return latest_version
-        except (requests.RequestException, ValidationError, ValueError) as e:
-            log.error(f"Failed to fetch latest version: {e}")
+            return self.session.app_info(self.app_id)
+        except (RuntimeError, OSError) as e:
+            log.warning(f"app_info_print via steamcmd session failed: {e}")
             return None
 
     def is_update_available(self) -> bool:
-        current = self.get_current_version()
-        latest = self.get_latest_version()
-        if current is None or latest is None:
+        plan = self.update_plan()
+        if plan is None or not plan.update_required:
             return False
-        if current != latest:
-            log.info(f"Update available: {current} -> {latest}")
-            return True
-        return False
 
-    def update(self) -> bool:
-        log.info(f"Updating app {self.app_id} via SteamCMD...")
-
-        process = subprocess.run(
-            [
-                STEAMCMD_PATH,
-                "+login",
-                "anonymous",
-                "+app_update",
-                str(self.app_id),
-                "validate",
-                "+quit",
-            ],
-            capture_output=True,
-            text=True,
+        depots = ", ".join(c.depot_id for c in plan.diff.changes)
+        log.info(
+            f"Update available: {plan.current_build} -> {plan.latest_build} "
+            f"(depots {depots}; {plan.diff.download_bytes / 1024**2:.0f} MiB to "
+            f"download; ~{plan.estimated_downtime / 60:.0f} min downtime)"
+        )
+        return True
+
+    def update(
+        self,
+        install_dir: Path | None = None,
+        on_progress: ProgressCallback | None = None,
+        validate: bool | None = None,
+        cancel_token: CancellationToken | None = None,
+    ) -> bool:
+        """
+        Install or update the app via steamcmd.
+
+        Args:
+            install_dir: Install into this directory (force_install_dir)
+                instead of the default library, e.g. for staged updates.
+            on_progress: Called for every parsed steamcmd progress line.
+            validate: Rehash the whole install; None defers to the policy.
+            cancel_token: Stops the download when cancelled.
+        """
+        if validate is None:
+            validate = self.validate_policy.should_validate()
+        log.info(
+            f"Updating app {self.app_id} via SteamCMD"
+            f"{' (validating)' if validate else ''}..."
         )
 
-        if process.returncode == 0:
+        command = f"app_update {self.app_id}" + (" validate" if validate else "")
+        result = self._session_execute(
+            command,
+            install_dir=install_dir,
+            on_progress=on_progress,
+            cancel_token=cancel_token,
+        )
+        if result is None:
+            result = self._run_update(install_dir, on_progress, validate, cancel_token)
+
+        if result.ok:
             log.info("Update completed successfully.")
+            self.validate_policy.record_update(validate)
             return True
 
-        log.error(process.stderr.strip() or "Update failed")
+        if result.cancelled:
+            log.warning("Update cancelled")
+        elif result.timed_out:
+            log.error(f"Update timed out during {result.timed_out.name}")
+        else:
+            errors = [line for line in result.output if line.startswith("ERROR!")]
+            log.error(errors[-1] if errors else "Update failed")
         return False
+
+    def _run_update(
+        self,
+        install_dir: Path | None,
+        on_progress: ProgressCallback | None,
+        validate: bool,
+        cancel_token: CancellationToken | None = None,
+    ) -> SteamCmdResult:
+        args: list[str] = []
+        if install_dir is not None:
+            # force_install_dir must precede login
+            args += ["+force_install_dir", str(install_dir.resolve())]
+        args += [
+            "+login",
+            "anonymous",
+            "+app_update",
+            str(self.app_id),
+            *(["validate"] if validate else []),
+            "+quit",
+        ]
+        return self.steamcmd.run(
+            args, on_progress=on_progress, cancel_token=cancel_token
+        )
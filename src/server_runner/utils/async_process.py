@@ -0,0 +1,295 @@
+import asyncio
+import os
+import signal
+import threading
+from collections.abc import Callable, Coroutine, Sequence
+from contextlib import suppress
+from typing import Any
+
+import psutil
+
+from server_runner.config.logging import get_logger
+from server_runner.utils.managed_process import ExitCallback, ProcessExit
+from server_runner.utils.process_output import (
+    MAX_LINE_CHARS,
+    LineSubscriber,
+    OutputLine,
+    ProcessOutput,
+)
+from server_runner.utils.resource_sampler import ProcessTreeSampler, ResourceSnapshot
+
+log = get_logger()
+
+# StreamReader buffer; longer lines are dropped rather than split
+STREAM_LIMIT = 64 * 1024
+
+
+class AsyncManagedProcess:
+    """
+    ManagedProcess counterpart driven by an asyncio event loop.
+
+    Exit detection and output draining are tasks on the loop rather than
+    a watcher thread and a pump thread per pipe. Coroutine methods
+    (start_async, terminate_async, ...) run on the loop; the blocking
+    methods of the same name without the suffix may be called from any
+    other thread, so this can stand in for a ManagedProcess used by
+    blocking code.
+    """
+
+    def __init__(
+        self,
+        command: Sequence[str],
+        *,
+        loop: asyncio.AbstractEventLoop,
+        cwd: str | None = None,
+        env: dict[str, str] | None = None,
+        output: ProcessOutput | None = None,
+    ):
+        """
+        Args:
+            command: Command and arguments to execute.
+            loop: Event loop that owns the subprocess.
+            cwd: Working directory for the process.
+            env: Environment for the process.
+            output: When provided, stdout/stderr are drained into this
+                buffer; otherwise they are discarded.
+        """
+        self.command = command
+        self.cwd = cwd
+        self.env = env
+        self.output = output
+        self._loop = loop
+        self._proc: asyncio.subprocess.Process | None = None
+        self._readers: list[asyncio.Task[None]] = []
+        self._watcher: asyncio.Task[None] | None = None
+        self._sampler: ProcessTreeSampler | None = None
+        self._exit_code: int | None = None
+        # Replaced on each start, as in ManagedProcess
+        self._exited = threading.Event()
+        self._exit_expected = threading.Event()
+        self._exit_callbacks: list[ExitCallback] = []
+
+    # ---------- lifecycle ----------
+
+    async def start_async(self) -> None:
+        if self.is_running():
+            raise RuntimeError("Process already started")
+        # A previous process that exited on its own is replaced here
+        await self._release()
+
+        self._proc = proc = await asyncio.create_subprocess_exec(
+            *self.command,
+            cwd=self.cwd,
+            env=self.env,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            start_new_session=True,
+            limit=STREAM_LIMIT,
+        )
+        self._sampler = ProcessTreeSampler(proc.pid)
+        self._exited = threading.Event()
+        self._exit_expected = threading.Event()
+        self._readers = [
+            asyncio.create_task(self._drain(proc.stdout, "stdout")),
+            asyncio.create_task(self._drain(proc.stderr, "stderr")),
+        ]
+        self._watcher = asyncio.create_task(
+            self._watch(proc, list(self._readers), self._exited, self._exit_expected),
+            name=f"ExitWatcher-{proc.pid}",
+        )
+
+    async def terminate_async(
+        self, timeout: float = 5.0, sig: int = signal.SIGTERM
+    ) -> None:
+        """Signal the process group, escalating to kill after timeout."""
+        proc = self._proc
+        if proc is None or not self.is_running():
+            await self._release()
+            return
+
+        self._exit_expected.set()
+        try:
+            os.killpg(proc.pid, sig)
+            async with asyncio.timeout(timeout):
+                await proc.wait()
+        except TimeoutError:
+            await self.kill_async()
+        except ProcessLookupError:
+            pass
+        finally:
+            await self._release()
+
+    async def kill_async(self) -> None:
+        """Kill the process and all child processes."""
+        proc = self._proc
+        if proc is None or not self.is_running():
+            await self._release()
+            return
+
+        self._exit_expected.set()
+        try:
+            parent = psutil.Process(proc.pid)
+            for child in parent.children(recursive=True):
+                with suppress(psutil.NoSuchProcess):
+                    child.kill()
+            with suppress(psutil.NoSuchProcess):
+                parent.kill()
+            with suppress(TimeoutError):
+                async with asyncio.timeout(5):
+                    await proc.wait()
+        except psutil.NoSuchProcess:
+            pass
+        finally:
+            await self._release()
+
+    async def wait_for_exit_async(self, timeout: float | None = None) -> bool:
+        watcher = self._watcher
+        if watcher is None or not self.is_running():
+            return True
+        try:
+            async with asyncio.timeout(timeout):
+                await asyncio.shield(watcher)
+        except TimeoutError:
+            return False
+        return True
+
+    def expect_exit(self) -> None:
+        """Mark the upcoming exit as intentional."""
+        self._exit_expected.set()
+
+    def clear_expected_exit(self) -> None:
+        """Undo expect_exit() when the announced shutdown did not happen."""
+        self._exit_expected.clear()
+
+    async def _drain(self, stream: asyncio.StreamReader | None, name: str) -> None:
+        if stream is None:
+            return
+        while True:
+            try:
+                raw = await stream.readline()
+            except ValueError:
+                # Longer than STREAM_LIMIT; the reader has discarded it
+                continue
+            except (OSError, asyncio.CancelledError):
+                return
+            if not raw:
+                return
+            if self.output is not None:
+                text = raw.decode(errors="replace").rstrip("\r\n")
+                self.output.append(name, text[:MAX_LINE_CHARS])
+
+    async def _watch(
+        self,
+        proc: asyncio.subprocess.Process,
+        readers: list[asyncio.Task[None]],
+        exited: threading.Event,
+        expected: threading.Event,
+    ) -> None:
+        returncode = await proc.wait()
+        # Report the exit after the output that preceded it
+        await asyncio.wait(readers, timeout=1.0)
+        exited.set()
+        log.debug(f"Process {proc.pid} exited with {returncode}")
+        if self._proc is not None and self._proc is not proc:
+            # A newer process has been started since
+            return
+        self._exit_code = returncode
+        event = ProcessExit(proc.pid, returncode, expected.is_set())
+        for callback in list(self._exit_callbacks):
+            try:
+                callback(event)
+            except Exception as e:
+                log.error(f"Exit callback failed: {type(e).__name__} - {e}")
+
+    async def _release(self) -> None:
+        """
+        Drop the process handle once its output has been drained, and close
+        the output log file until the next start.
+        """
+        if self._readers:
+            _, pending = await asyncio.wait(self._readers, timeout=1.0)
+            for reader in pending:
+                reader.cancel()
+            self._readers = []
+        if self._proc is not None:
+            if self._proc.returncode is not None:
+                self._exit_code = self._proc.returncode
+            if self.output is not None:
+                self.output.close()
+        self._proc = None
+
+    # ---------- blocking facade ----------
+
+    def _call[T](self, coro: Coroutine[Any, Any, T]) -> T:
+        """Run coro on the owning loop and block until it completes."""
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            coro.close()
+            raise RuntimeError("Blocking process call made on its own event loop")
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def start(self) -> None:
+        self._call(self.start_async())
+
+    def terminate(self, timeout: float = 5.0, sig: int = signal.SIGTERM) -> None:
+        self._call(self.terminate_async(timeout, sig))
+
+    def kill(self) -> None:
+        self._call(self.kill_async())
+
+    def wait_for_exit(self, timeout: float | None = None) -> bool:
+        if not self.is_running():
+            return True
+        return self._exited.wait(timeout)
+
+    # ---------- inspection ----------
+
+    def is_running(self) -> bool:
+        return self._proc is not None and self._proc.returncode is None
+
+    def on_exit(self, callback: ExitCallback) -> Callable[[], None]:
+        """
+        Register a callback fired on the event loop as soon as the process
+        exits. Returns a function that removes the callback.
+        """
+        self._exit_callbacks.append(callback)
+
+        def remove() -> None:
+            if callback in self._exit_callbacks:
+                self._exit_callbacks.remove(callback)
+
+        return remove
+
+    def exit_code(self) -> int | None:
+        if self._proc is not None:
+            return self._proc.returncode
+        return self._exit_code
+
+    def pid(self) -> int | None:
+        if self.is_running() and self._proc:
+            return self._proc.pid
+        return None
+
+    def resources(self) -> ResourceSnapshot:
+        if self._sampler is None or not self.is_running():
+            return ResourceSnapshot.empty()
+        return self._sampler.sample()
+
+    def get_process_memory_percent(self) -> float:
+        return self.resources().memory_percent
+
+    # ---------- output ----------
+
+    def tail(self, n: int = 50) -> list[OutputLine]:
+        if self.output is None:
+            return []
+        return self.output.tail(n)
+
+    def subscribe(self, subscriber: LineSubscriber) -> Callable[[], None]:
+        if self.output is None:
+            raise RuntimeError("Output draining is not enabled for this process")
+        return self.output.subscribe(subscriber)
@@ -0,0 +1,87 @@
+import asyncio
+import threading
+from collections.abc import Callable
+
+
+class OperationCancelledError(Exception):
+    """Raised when work observes that its cancellation token was triggered."""
+
+
+class CancellationToken:
+    """
+    Cooperative cancellation flag shared between a requester and the work.
+
+    Child tokens are cancelled with their parent, so an engine-wide token
+    can fan out to per-job and per-task tokens.
+    """
+
+    def __init__(self, parent: "CancellationToken | None" = None):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: list[Callable[[], None]] = []
+        self.reason: str | None = None
+        self._detach: Callable[[], None] = lambda: None
+        if parent is not None:
+            self._detach = parent.on_cancel(lambda: self.cancel(parent.reason))
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self, reason: str | None = None) -> None:
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self._event.set()
+            callbacks = list(self._callbacks)
+        for callback in callbacks:
+            callback()
+
+    def on_cancel(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """
+        Run callback when cancelled (immediately if already cancelled).
+        Returns a function that removes the callback.
+        """
+
+        def remove() -> None:
+            with self._lock:
+                if callback in self._callbacks:
+                    self._callbacks.remove(callback)
+
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return remove
+        callback()
+        return remove
+
+    def close(self) -> None:
+        """Stop following the parent token once the work is finished."""
+        self._detach()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Sleep up to timeout; returns True early if cancelled."""
+        return self._event.wait(timeout)
+
+    async def wait_async(self, timeout: float | None = None) -> bool:
+        """wait() for coroutines; the event loop keeps running meanwhile."""
+        loop = asyncio.get_running_loop()
+        cancelled = asyncio.Event()
+
+        def wake() -> None:
+            loop.call_soon_threadsafe(cancelled.set)
+
+        remove = self.on_cancel(wake)
+        try:
+            async with asyncio.timeout(timeout):
+                await cancelled.wait()
+        except TimeoutError:
+            pass
+        finally:
+            remove()
+        return self.cancelled
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise OperationCancelledError(self.reason or "Operation cancelled")
@@ -0,0 +1,121 @@
+import asyncio
+import threading
+import time
+from collections.abc import Awaitable, Callable
+
+
+class CoalescingCache[T]:
+    """
+    Caches the result of an expensive loader for a TTL.
+
+    Concurrent callers share a single in-flight load (single-flight) rather
+    than each invoking the loader. Callers needing an up-to-date value can
+    pass fresh=True, which only accepts a result whose load started after
+    the call was made.
+    """
+
+    def __init__(self, loader: Callable[[], T], ttl: float):
+        self._loader = loader
+        self.ttl = ttl
+        self._cond = threading.Condition()
+        self._value: T | None = None
+        self._has_value = False
+        self._loaded_at = 0.0
+        self._load_started_at = 0.0
+        self._invalidated_at = 0.0
+        self._loading = False
+        self._pending: asyncio.Future[T] | None = None  # in-flight get_async() load
+
+    def _lookup(self, fresh: bool, requested_at: float) -> tuple[bool, T | None]:
+        # Caller holds self._cond
+        if self._has_value:
+            if fresh:
+                if self._load_started_at >= requested_at:
+                    return True, self._value
+            elif time.monotonic() - self._loaded_at <= self.ttl:
+                return True, self._value
+        return False, None
+
+    def _store(self, value: T, started_at: float) -> None:
+        # Caller holds self._cond
+        self._value = value
+        # A load that raced with invalidate() is returned to its caller
+        # but not served to anyone else.
+        self._has_value = started_at >= self._invalidated_at
+        self._load_started_at = started_at
+        self._loaded_at = time.monotonic()
+
+    def get(self, *, fresh: bool = False) -> T:
+        with self._cond:
+            requested_at = time.monotonic()
+            while True:
+                found, value = self._lookup(fresh, requested_at)
+                if found:
+                    return value  # type: ignore[return-value]
+                if not self._loading:
+                    break
+                self._cond.wait()
+
+            self._loading = True
+            started_at = time.monotonic()
+
+        try:
+            value = self._loader()
+        except BaseException:
+            with self._cond:
+                self._loading = False
+                self._cond.notify_all()
+            raise
+
+        with self._cond:
+            self._store(value, started_at)
+            self._loading = False
+            self._cond.notify_all()
+        return value
+
+    async def get_async(
+        self, loader: Callable[[], Awaitable[T]], *, fresh: bool = False
+    ) -> T:
+        """
+        get() for coroutines, loading through the given async loader.
+
+        Async callers share one in-flight load and the cached value with
+        get(), but never wait for a load running on another thread, as
+        that would block the event loop.
+        """
+        requested_at = time.monotonic()
+        while True:
+            with self._cond:
+                found, value = self._lookup(fresh, requested_at)
+            if found:
+                return value  # type: ignore[return-value]
+            pending = self._pending
+            if pending is None:
+                break
+            # Re-check afterwards: the load may have failed or been invalidated
+            await asyncio.wait([pending])
+
+        async def load() -> T:
+            started_at = time.monotonic()
+            try:
+                value = await loader()
+            finally:
+                self._pending = None
+            with self._cond:
+                self._store(value, started_at)
+                self._cond.notify_all()
+            return value
+
+        self._pending = task = asyncio.ensure_future(load())
+        return await task
+
+    def peek(self) -> T | None:
+        """Return the last loaded value without triggering a load."""
+        with self._cond:
+            return self._value
+
+    def invalidate(self) -> None:
+        """Drop the cached value so the next get() reloads."""
+        with self._cond:
+            self._has_value = False
+            self._invalidated_at = time.monotonic()
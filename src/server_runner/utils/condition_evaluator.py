@@ -0,0 +1,120 @@
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+
+from server_runner.config.logging import get_logger
+from server_runner.utils.timer_scheduler import TimerHandle, TimerScheduler
+
+log = get_logger()
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_DEADLINE = 30.0
+
+
+@dataclass(slots=True)
+class _Flight:
+    started: float
+    deadline: float
+    expired: bool = False
+    timer: TimerHandle | None = None
+
+
+class ConditionEvaluator:
+    """
+    Evaluates schedule conditions on a small thread pool so a slow check
+    (HTTP, steamcmd) never holds up the scheduler thread.
+
+    Each condition is single-flight: a new evaluation is skipped while the
+    previous one is still running. A condition that misses its deadline
+    is logged and its eventual result discarded; threads cannot be killed,
+    so it keeps its slot until it returns. Results are handed back to run
+    on the scheduler thread.
+    """
+
+    def __init__(
+        self,
+        scheduler: TimerScheduler,
+        *,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        default_deadline: float = DEFAULT_DEADLINE,
+    ):
+        self.scheduler = scheduler
+        self.default_deadline = default_deadline
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="Condition"
+        )
+        self._lock = threading.Lock()
+        self._in_flight: dict[str, _Flight] = {}
+
+    def submit(
+        self,
+        name: str,
+        condition: Callable[[], bool],
+        on_true: Callable[[], None],
+        *,
+        deadline: float | None = None,
+    ) -> bool:
+        """
+        Start evaluating condition; on_true runs on the scheduler thread if
+        it returns True in time. Returns False if name is already running.
+        """
+        deadline = deadline or self.default_deadline
+        with self._lock:
+            running = self._in_flight.get(name)
+            if running is not None:
+                age = time.monotonic() - running.started
+                log.warning(f"Skipping condition '{name}'; still running ({age:.0f}s)")
+                return False
+            flight = _Flight(time.monotonic(), deadline)
+            self._in_flight[name] = flight
+
+        flight.timer = self.scheduler.call_later(
+            deadline, lambda: self._expire(name, flight), name=f"deadline:{name}"
+        )
+        try:
+            future = self._pool.submit(condition)
+        except RuntimeError:  # pool shut down
+            self._finish(name, flight)
+            return False
+        future.add_done_callback(lambda f: self._done(name, flight, f, on_true))
+        return True
+
+    def _expire(self, name: str, flight: _Flight) -> None:
+        with self._lock:
+            if self._in_flight.get(name) is not flight:
+                return
+            flight.expired = True
+        log.warning(f"Condition '{name}' missed its {flight.deadline:.0f}s deadline")
+
+    def _finish(self, name: str, flight: _Flight) -> None:
+        with self._lock:
+            if self._in_flight.get(name) is flight:
+                del self._in_flight[name]
+        if flight.timer is not None:
+            flight.timer.cancel()
+
+    def _done(
+        self,
+        name: str,
+        flight: _Flight,
+        future: Future[bool],
+        on_true: Callable[[], None],
+    ) -> None:
+        self._finish(name, flight)
+        elapsed = time.monotonic() - flight.started
+        if future.cancelled():
+            return
+        if (error := future.exception()) is not None:
+            log.error(f"Error evaluating condition '{name}': {error}")
+            return
+        if flight.expired:
+            log.warning(f"Condition '{name}' finished after {elapsed:.0f}s; ignored")
+            return
+        if future.result():
+            self.scheduler.call_later(0, on_true, name=f"result:{name}")
+
+    def shutdown(self) -> None:
+        """Drop queued evaluations; running ones finish in the background."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
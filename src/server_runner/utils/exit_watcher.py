@@ -0,0 +1,58 @@
+import os
+import selectors
+import threading
+from collections.abc import Callable
+from subprocess import Popen
+
+from server_runner.config.logging import get_logger
+
+log = get_logger()
+
+
+class ExitWatcher:
+    """
+    Notifies a callback the moment a child process exits, without polling.
+
+    On Linux the watcher thread sleeps in a selector on a pidfd, which becomes
+    readable when the process terminates. Elsewhere (or when pidfd_open is
+    unavailable) the thread blocks in waitpid via Popen.wait().
+    """
+
+    def __init__(self, proc: Popen[str], on_exit: Callable[[int | None], None]):
+        self._proc = proc
+        self._on_exit = on_exit
+        self._thread = threading.Thread(
+            target=self._watch, name=f"ExitWatcher-{proc.pid}", daemon=True
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def _watch(self) -> None:
+        try:
+            if hasattr(os, "pidfd_open"):
+                self._wait_pidfd()
+            returncode = self._proc.wait()
+        except Exception as e:
+            log.error(f"Exit watcher failed for PID {self._proc.pid}: {e}")
+            returncode = self._proc.poll()
+
+        try:
+            self._on_exit(returncode)
+        except Exception as e:
+            log.error(f"Exit callback failed: {type(e).__name__} - {e}")
+
+    def _wait_pidfd(self) -> None:
+        try:
+            pidfd = os.pidfd_open(self._proc.pid)
+        except OSError:
+            # Already reaped, or pidfds unsupported by the kernel; the
+            # blocking wait in _watch covers both cases.
+            return
+
+        try:
+            with selectors.DefaultSelector() as selector:
+                selector.register(pidfd, selectors.EVENT_READ)
+                selector.select()
+        finally:
+            os.close(pidfd)
@@ -0,0 +1,97 @@
+import bisect
+import math
+import threading
+from array import array
+from collections.abc import Sequence
+from typing import Any
+
+# Seconds; spans a quick API call up to a long steamcmd download
+DEFAULT_DURATION_BUCKETS: Sequence[float] = (
+    0.01,
+    0.05,
+    0.1,
+    0.5,
+    1,
+    5,
+    10,
+    30,
+    60,
+    120,
+    300,
+    600,
+    1800,
+    3600,
+    3 * 3600,
+)
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram with counts in a flat array.
+
+    Bucket i counts observations <= bounds[i] that did not fit an earlier
+    bucket; a final overflow bucket takes everything larger. Memory stays
+    constant however many values are observed.
+    """
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_DURATION_BUCKETS):
+        if list(bounds) != sorted(set(bounds)):
+            raise ValueError("Histogram bounds must be strictly increasing")
+        self.bounds: tuple[float, ...] = tuple(bounds)
+        self._counts = array("Q", bytes(8 * (len(self.bounds) + 1)))
+        self._lock = threading.Lock()
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self.count += 1
+            self.sum += value
+            self.min = min(self.min, value)
+            self.max = max(self.max, value)
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def counts(self) -> list[int]:
+        """Per-bucket counts, the overflow bucket last."""
+        with self._lock:
+            return self._counts.tolist()
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate the q-quantile (0..1) by interpolating within its bucket.
+        Returns 0.0 when empty.
+        """
+        with self._lock:
+            if not self.count:
+                return 0.0
+            rank = q * self.count
+            seen = 0
+            for index, count in enumerate(self._counts):
+                if count and seen + count >= rank:
+                    lower = self.bounds[index - 1] if index else self.min
+                    upper = self.bounds[index] if index < len(self.bounds) else self.max
+                    lower, upper = max(lower, self.min), min(upper, self.max)
+                    return lower + (upper - lower) * (rank - seen) / count
+                seen += count
+            return self.max
+
+    def to_dict(self) -> dict[str, Any]:
+        empty = self.count == 0
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "min": None if empty else self.min,
+            "max": None if empty else self.max,
+            "mean": self.mean,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "bounds": list(self.bounds),
+            "counts": self.counts(),
+        }
@@ -0,0 +1,233 @@
+import fnmatch
+import hashlib
+import json
+import mmap
+import os
+import threading
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from server_runner.config.logging import get_logger
+
+log = get_logger()
+
+# hashlib releases the GIL for large updates, so chunks hash in parallel
+HASH_CHUNK_BYTES = 8 * 1024 * 1024
+INDEX_VERSION = 1
+
+
+def hash_file(path: Path) -> str:
+    """BLAKE2b digest of a file, read through a memory map."""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return digest.hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                for offset in range(0, size, HASH_CHUNK_BYTES):
+                    digest.update(view[offset : offset + HASH_CHUNK_BYTES])
+            finally:
+                view.release()
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True, slots=True)
+class FileRecord:
+    size: int
+    mtime_ns: int
+    digest: str
+
+    def matches(self, st: os.stat_result) -> bool:
+        return st.st_size == self.size and st.st_mtime_ns == self.mtime_ns
+
+
+@dataclass(slots=True)
+class IntegrityReport:
+    checked: int = 0
+    rehashed: int = 0
+    missing: list[str] = field(default_factory=list)
+    modified: list[str] = field(default_factory=list)
+
+    @property
+    def intact(self) -> bool:
+        return not self.missing and not self.modified
+
+
+class IntegrityChecker:
+    """
+    Keeps an index of (size, mtime_ns, digest) for every file of an install
+    and answers whether the tree still matches it.
+
+    Files whose size and mtime are unchanged are trusted without reading
+    them, so checking an untouched install costs one stat per file. Only
+    files that changed on disk are rehashed, on a thread pool.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        index_file: Path,
+        *,
+        exclude: Sequence[str] = (),
+        workers: int | None = None,
+    ):
+        """
+        Args:
+            root: Install directory to index.
+            index_file: JSON file the index is persisted to.
+            exclude: Glob patterns (relative, "/"-separated) for files the
+                game itself writes, such as saves and logs.
+            workers: Hashing threads; defaults to the executor's default.
+        """
+        self.root = root
+        self.index_file = index_file
+        self.exclude = list(exclude)
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._index = self._load()
+
+    @property
+    def has_index(self) -> bool:
+        return bool(self._index)
+
+    # ------------------------
+    # Checking
+    # ------------------------
+    def verify(self) -> IntegrityReport:
+        """Compare the install against the index."""
+        with self._lock:
+            return self._verify()
+
+    def _verify(self) -> IntegrityReport:
+        report = IntegrityReport()
+        suspects: dict[str, os.stat_result] = {}
+
+        for rel, record in self._index.items():
+            report.checked += 1
+            try:
+                st = (self.root / rel).stat()
+            except FileNotFoundError:
+                report.missing.append(rel)
+                continue
+            if not record.matches(st):
+                suspects[rel] = st
+
+        digests = self._hash_all(suspects)
+        report.rehashed = len(digests)
+        for rel, digest in digests.items():
+            st = suspects[rel]
+            if digest is None or digest != self._index[rel].digest:
+                report.modified.append(rel)
+            else:
+                # Touched but identical; trust the new stat from now on
+                self._index[rel] = FileRecord(st.st_size, st.st_mtime_ns, digest)
+
+        if digests and len(report.modified) < len(digests):
+            self._save()
+
+        log.info(
+            f"Integrity check of {self.root}: {report.checked} files, "
+            f"{report.rehashed} rehashed, {len(report.missing)} missing, "
+            f"{len(report.modified)} modified"
+        )
+        return report
+
+    def is_intact(self) -> bool:
+        """False when there is no index yet or anything no longer matches."""
+        return self.has_index and self.verify().intact
+
+    # ------------------------
+    # Indexing
+    # ------------------------
+    def refresh(self) -> int:
+        """
+        Re-index the install after a trusted change such as an update.
+        Returns the number of files that had to be hashed.
+        """
+        with self._lock:
+            return self._refresh()
+
+    def _refresh(self) -> int:
+        index: dict[str, FileRecord] = {}
+        pending: dict[str, os.stat_result] = {}
+
+        for rel, st in self._walk():
+            record = self._index.get(rel)
+            if record is not None and record.matches(st):
+                index[rel] = record
+            else:
+                pending[rel] = st
+
+        for rel, digest in self._hash_all(pending).items():
+            if digest is not None:
+                st = pending[rel]
+                index[rel] = FileRecord(st.st_size, st.st_mtime_ns, digest)
+
+        self._index = index
+        self._save()
+        log.info(f"Indexed {len(index)} files in {self.root} ({len(pending)} hashed)")
+        return len(pending)
+
+    def _walk(self) -> Iterable[tuple[str, os.stat_result]]:
+        for dirpath, _, files in os.walk(self.root):
+            for name in files:
+                path = Path(dirpath) / name
+                rel = path.relative_to(self.root).as_posix()
+                if self._excluded(rel):
+                    continue
+                try:
+                    yield rel, path.stat()
+                except FileNotFoundError:
+                    continue
+
+    def _excluded(self, rel: str) -> bool:
+        return any(fnmatch.fnmatch(rel, pattern) for pattern in self.exclude)
+
+    def _hash_all(self, files: Iterable[str]) -> dict[str, str | None]:
+        """Hash files in parallel; unreadable files map to None."""
+        rels = list(files)
+        if not rels:
+            return {}
+
+        def hash_one(rel: str) -> str | None:
+            try:
+                return hash_file(self.root / rel)
+            except OSError as e:
+                log.warning(f"Could not hash {rel}: {e}")
+                return None
+
+        with ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="IntegrityHash"
+        ) as pool:
+            return dict(zip(rels, pool.map(hash_one, rels), strict=True))
+
+    # ------------------------
+    # Persistence
+    # ------------------------
+    def _load(self) -> dict[str, FileRecord]:
+        try:
+            with open(self.index_file, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != INDEX_VERSION:
+                return {}
+            return {rel: FileRecord(*entry) for rel, entry in data["files"].items()}
+        except FileNotFoundError:
+            return {}
+        except (OSError, KeyError, TypeError, ValueError) as e:
+            log.warning(f"Ignoring unreadable file index {self.index_file}: {e}")
+            return {}
+
+    def _save(self) -> None:
+        files = {rel: [r.size, r.mtime_ns, r.digest] for rel, r in self._index.items()}
+        try:
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.index_file.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"version": INDEX_VERSION, "files": files}, f)
+            os.replace(tmp, self.index_file)
+        except OSError as e:
+            log.warning(f"Could not persist file index: {e}")
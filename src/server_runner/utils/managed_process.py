@@ -1,14 +1,36 @@
 import os
 import signal
 import subprocess
+import threading
 import time
-from collections.abc import Sequence
+from collections.abc import Callable, Sequence
 from contextlib import suppress
 from subprocess import Popen
-from typing import IO
+from typing import IO, NamedTuple
 
 import psutil
 
+from server_runner.config.logging import get_logger
+from server_runner.utils.exit_watcher import ExitWatcher
+from server_runner.utils.process_output import (
+    LineSubscriber,
+    OutputLine,
+    OutputPump,
+    ProcessOutput,
+)
+from server_runner.utils.resource_sampler import ProcessTreeSampler, ResourceSnapshot
+
+log = get_logger()
+
+
+class ProcessExit(NamedTuple):
+    pid: int
+    returncode: int | None
+    expected: bool  # True when the exit was requested via terminate/kill
+
+
+ExitCallback = Callable[[ProcessExit], None]
+
 
 class ManagedProcess:
     def __init__(
@@ -17,12 +39,29 @@ class ManagedProcess:
         *,
         cwd: str | None = None,
         env: dict[str, str] | None = None,
+        output: ProcessOutput | None = None,
     ):
+        """
+        Args:
+            command: Command and arguments to execute.
+            cwd: Working directory for the process.
+            env: Environment for the process.
+            output: When provided, stdout/stderr are drained on background
+                threads into this buffer instead of being left on the pipes.
+        """
         self.command = command
         self.cwd = cwd
         self.env = env
+        self.output = output
         self._proc: Popen[str] | None = None
+        self._pump: OutputPump | None = None
+        self._sampler: ProcessTreeSampler | None = None
         self._exit_code: int | None = None
+        # Replaced on each start() so a late watcher of an earlier process
+        # only ever touches that process's events
+        self._exited = threading.Event()
+        self._exit_expected = threading.Event()
+        self._exit_callbacks: list[ExitCallback] = []
 
     # ---------- lifecycle ----------
 
@@ -32,6 +71,8 @@ class ManagedProcess:
         """
         if self.is_running():
             raise RuntimeError("Process already started")
+        # A previous process that exited on its own is replaced here
+        self._release()
 
         self._proc = subprocess.Popen(  # noqa: S603
             self.command,
@@ -42,7 +83,17 @@ class ManagedProcess:
             stderr=subprocess.PIPE,
             preexec_fn=os.setsid,
             text=True,
+            errors="replace",
         )
+        self._sampler = ProcessTreeSampler(self._proc.pid)
+        self._exited = threading.Event()
+        self._exit_expected = threading.Event()
+
+        if self.output is not None:
+            self._pump = OutputPump(self.output)
+            self._pump.attach(self._proc.stdout, "stdout")
+            self._pump.attach(self._proc.stderr, "stderr")
+        ExitWatcher(self._proc, self._make_exit_handler(self._proc)).start()
 
     def terminate(self, timeout: float = 5.0, sig: int = signal.SIGTERM) -> None:
         """
@@ -50,9 +101,10 @@ class ManagedProcess:
         Falls back to kill() if timeout expires.
         """
         if not self._proc or not self.is_running():
-            self._proc = None
+            self._release()
             return
 
+        self._exit_expected.set()
         try:
             os.killpg(self._proc.pid, sig)
             self._proc.wait(timeout=timeout)
@@ -62,16 +114,17 @@ class ManagedProcess:
         except ProcessLookupError:
             pass
         finally:
-            self._proc = None
+            self._release()
 
     def kill(self) -> None:
         """
         Kill the process and all child processes using psutil.
         """
         if not self._proc or not self.is_running():
-            self._proc = None
+            self._release()
             return
 
+        self._exit_expected.set()
         try:
             parent = psutil.Process(self._proc.pid)
             children = parent.children(recursive=True)
@@ -85,7 +138,55 @@ class ManagedProcess:
         except psutil.NoSuchProcess:
             pass
         finally:
-            self._proc = None
+            self._release()
+
+    def expect_exit(self) -> None:
+        """
+        Mark the upcoming exit as intentional, e.g. when the process was
+        asked to shut itself down through some other channel.
+        """
+        self._exit_expected.set()
+
+    def clear_expected_exit(self) -> None:
+        """
+        Undo expect_exit() when the shutdown it announced did not happen,
+        so that a later exit of the still-running process counts as a crash.
+        """
+        self._exit_expected.clear()
+
+    def _make_exit_handler(self, proc: Popen[str]) -> Callable[[int | None], None]:
+        exited, expected, pump = self._exited, self._exit_expected, self._pump
+
+        def handle_exit(returncode: int | None) -> None:
+            if pump is not None:
+                # Report the exit after the output that preceded it
+                pump.join(timeout=1.0)
+            event = ProcessExit(proc.pid, returncode, expected.is_set())
+            exited.set()
+            log.debug(f"Process {proc.pid} exited with {returncode}")
+            if self._proc is not None and self._proc is not proc:
+                # A newer process has been started since
+                return
+            self._exit_code = returncode
+            for callback in list(self._exit_callbacks):
+                try:
+                    callback(event)
+                except Exception as e:
+                    log.error(f"Exit callback failed: {type(e).__name__} - {e}")
+
+        return handle_exit
+
+    def _release(self) -> None:
+        """
+        Drop the process handle once its output has been drained, and close
+        the output log file until the next start().
+        """
+        if self._pump is not None:
+            self._pump.join(timeout=1.0)
+            self._pump = None
+        if self._proc is not None and self.output is not None:
+            self.output.close()
+        self._proc = None
 
     def restart(self, delay: float = 0.5) -> None:
         """
@@ -107,6 +208,28 @@ class ManagedProcess:
             return False
         return self._proc.poll() is None
 
+    def wait_for_exit(self, timeout: float | None = None) -> bool:
+        """
+        Block until the process exits or timeout expires.
+        Returns True if the process is no longer running.
+        """
+        if not self.is_running():
+            return True
+        return self._exited.wait(timeout)
+
+    def on_exit(self, callback: ExitCallback) -> Callable[[], None]:
+        """
+        Register a callback fired from the watcher thread as soon as the
+        process exits. Returns a function that removes the callback.
+        """
+        self._exit_callbacks.append(callback)
+
+        def remove() -> None:
+            if callback in self._exit_callbacks:
+                self._exit_callbacks.remove(callback)
+
+        return remove
+
     def exit_code(self) -> int | None:
         """
         Return the exit code if the process has finished, otherwise None.
@@ -123,18 +246,38 @@ class ManagedProcess:
             return self._proc.pid
         return None
 
+    def resources(self) -> ResourceSnapshot:
+        """
+        Return resource usage summed over the process and all descendants,
+        so wrapper scripts report the memory of the real server binary.
+        """
+        if self._sampler is None or not self.is_running():
+            return ResourceSnapshot.empty()
+        return self._sampler.sample()
+
     def get_process_memory_percent(self) -> float:
         """
-        Return the percentage (%) of total memory used by the process
-        result = (process_memory / total_system_memory)
+        Return the percentage (%) of total memory used by the process tree
+        result = (process_tree_memory / total_system_memory)
         """
+        return self.resources().memory_percent
+
+    # ---------- output ----------
 
-        pid = self.pid()
-        if not self._proc:
-            return 0.0
+    def tail(self, n: int = 50) -> list[OutputLine]:
+        """Return the last n drained output lines (empty if not draining)."""
+        if self.output is None:
+            return []
+        return self.output.tail(n)
 
-        process = psutil.Process(pid)
-        return process.memory_percent()
+    def subscribe(self, subscriber: LineSubscriber) -> Callable[[], None]:
+        """
+        Subscribe to drained output lines.
+        Returns a function that removes the subscription.
+        """
+        if self.output is None:
+            raise RuntimeError("Output draining is not enabled for this process")
+        return self.output.subscribe(subscriber)
 
     # ---------- interaction ----------
     def stdin(self) -> IO[str] | None:
@@ -145,9 +288,19 @@ class ManagedProcess:
         return self._proc.stdin if self._proc else None
 
     def stdout(self) -> IO[str] | None:
-        """Return the process stdout stream if available."""
-        return self._proc.stdout if self._proc else None
+        """
+        Return the process stdout stream if available.
+        None while output is being drained; use tail() or subscribe() instead.
+        """
+        if self._proc is None or self._pump is not None:
+            return None
+        return self._proc.stdout
 
     def stderr(self) -> IO[str] | None:
-        """Return the process stderr stream if available."""
-        return self._proc.stderr if self._proc else None
+        """
+        Return the process stderr stream if available.
+        None while output is being drained; use tail() or subscribe() instead.
+        """
+        if self._proc is None or self._pump is not None:
+            return None
+        return self._proc.stderr
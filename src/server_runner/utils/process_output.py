@@ -0,0 +1,149 @@
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import IO, NamedTuple
+
+from server_runner.config.logging import get_logger
+
+log = get_logger()
+
+DEFAULT_MAX_LINES = 2000
+DEFAULT_LOG_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_LOG_BACKUP_COUNT = 5
+# Cap a single line so a runaway writer without newlines cannot grow memory.
+MAX_LINE_CHARS = 4096
+
+
+class OutputLine(NamedTuple):
+    stream: str  # "stdout" or "stderr"
+    text: str
+    timestamp: float
+
+
+LineSubscriber = Callable[[OutputLine], None]
+
+
+class ProcessOutput:
+    """
+    Bounded, thread-safe ring buffer of process output lines.
+
+    Lines are optionally tee'd to a size-rotated log file and fanned out
+    to subscribers as they arrive.
+    """
+
+    def __init__(
+        self,
+        max_lines: int = DEFAULT_MAX_LINES,
+        *,
+        log_file: Path | None = None,
+        log_max_bytes: int = DEFAULT_LOG_MAX_BYTES,
+        log_backup_count: int = DEFAULT_LOG_BACKUP_COUNT,
+    ):
+        self._lines: deque[OutputLine] = deque(maxlen=max_lines)
+        self._subscribers: list[LineSubscriber] = []
+        self._lock = threading.Lock()
+
+        self._file_handler: RotatingFileHandler | None = None
+        if log_file is not None:
+            log_file.parent.mkdir(parents=True, exist_ok=True)
+            self._file_handler = RotatingFileHandler(
+                log_file,
+                maxBytes=log_max_bytes,
+                backupCount=log_backup_count,
+                encoding="utf-8",
+            )
+            self._file_handler.setFormatter(
+                logging.Formatter("%(asctime)s [%(stream)s] %(message)s")
+            )
+
+    def append(self, stream: str, text: str) -> None:
+        line = OutputLine(stream, text, time.time())
+        with self._lock:
+            self._lines.append(line)
+            subscribers = list(self._subscribers)
+
+        if self._file_handler is not None:
+            record = logging.makeLogRecord(
+                {"msg": text, "stream": stream, "created": line.timestamp}
+            )
+            self._file_handler.handle(record)
+
+        for subscriber in subscribers:
+            try:
+                subscriber(line)
+            except Exception as e:
+                log.error(f"Output subscriber failed: {type(e).__name__} - {e}")
+
+    def tail(self, n: int = 50) -> list[OutputLine]:
+        """Return the last n buffered lines, oldest first."""
+        if n <= 0:
+            return []
+        with self._lock:
+            count = len(self._lines)
+            return [self._lines[i] for i in range(max(0, count - n), count)]
+
+    def subscribe(self, subscriber: LineSubscriber) -> Callable[[], None]:
+        """
+        Register a callback invoked for every new line.
+        Returns a function that removes the subscription.
+        """
+        with self._lock:
+            self._subscribers.append(subscriber)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if subscriber in self._subscribers:
+                    self._subscribers.remove(subscriber)
+
+        return unsubscribe
+
+    def clear(self) -> None:
+        with self._lock:
+            self._lines.clear()
+
+    def close(self) -> None:
+        """
+        Close the log file. A line appended afterwards, e.g. by a restarted
+        process, reopens it in append mode.
+        """
+        if self._file_handler is not None:
+            self._file_handler.close()
+
+
+class OutputPump:
+    """Drains process pipes on background threads into a ProcessOutput."""
+
+    def __init__(self, output: ProcessOutput):
+        self.output = output
+        self._threads: list[threading.Thread] = []
+
+    def attach(self, stream: IO[str] | None, name: str) -> None:
+        if stream is None:
+            return
+        thread = threading.Thread(
+            target=self._drain,
+            args=(stream, name),
+            name=f"OutputPump-{name}",
+            daemon=True,
+        )
+        self._threads.append(thread)
+        thread.start()
+
+    def _drain(self, stream: IO[str], name: str) -> None:
+        try:
+            for line in iter(lambda: stream.readline(MAX_LINE_CHARS), ""):
+                self.output.append(name, line.rstrip("\r\n"))
+        except (OSError, ValueError):
+            # Pipe closed underneath us during shutdown.
+            pass
+
+    def join(self, timeout: float = 1.0) -> None:
+        """Wait for the reader threads to reach EOF."""
+        deadline = time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+        self._threads = [t for t in self._threads if t.is_alive()]
@@ -0,0 +1,112 @@
+import threading
+import time
+from contextlib import suppress
+from dataclasses import dataclass
+
+import psutil
+
+
+@dataclass(frozen=True, slots=True)
+class ResourceSnapshot:
+    """Aggregated resource usage for a process and all of its descendants."""
+
+    timestamp: float
+    process_count: int
+    rss_bytes: int
+    pss_bytes: int | None  # None when smaps_rollup is unreadable
+    memory_percent: float  # of total system memory, PSS when available
+    cpu_percent: float  # summed across the tree; may exceed 100 on SMP
+    num_threads: int
+    num_fds: int
+    read_bytes: int
+    write_bytes: int
+
+    @classmethod
+    def empty(cls) -> "ResourceSnapshot":
+        return cls(time.time(), 0, 0, None, 0.0, 0.0, 0, 0, 0, 0)
+
+
+class ProcessTreeSampler:
+    """
+    Samples resource usage across a process tree.
+
+    psutil handles are cached per PID so that CPU percentages are measured
+    against the previous sample, and each process is read in a single
+    oneshot() pass.
+    """
+
+    def __init__(self, root_pid: int):
+        self.root_pid = root_pid
+        self._handles: dict[int, psutil.Process] = {}
+        self._total_memory = psutil.virtual_memory().total
+        self._lock = threading.Lock()
+
+    def _handle(self, pid: int) -> psutil.Process:
+        handle = self._handles.get(pid)
+        if handle is None or not handle.is_running():
+            handle = psutil.Process(pid)
+            # Prime the CPU counter; the first reading is always 0.0.
+            handle.cpu_percent(None)
+            self._handles[pid] = handle
+        return handle
+
+    def _tree(self) -> list[psutil.Process]:
+        root = self._handle(self.root_pid)
+        tree = [root]
+        for child in root.children(recursive=True):
+            with suppress(psutil.NoSuchProcess):
+                tree.append(self._handle(child.pid))
+
+        alive = {p.pid for p in tree}
+        for pid in list(self._handles):
+            if pid not in alive:
+                del self._handles[pid]
+        return tree
+
+    def sample(self) -> ResourceSnapshot:
+        """Return a snapshot of the whole tree, or an empty one if it is gone."""
+        with self._lock:
+            try:
+                tree = self._tree()
+            except psutil.NoSuchProcess:
+                self._handles.clear()
+                return ResourceSnapshot.empty()
+
+            count = rss = pss = threads = fds = reads = writes = 0
+            cpu = 0.0
+            pss_available = True
+
+            for proc in tree:
+                try:
+                    with proc.oneshot():
+                        rss += proc.memory_info().rss
+                        cpu += proc.cpu_percent(None)
+                        threads += proc.num_threads()
+                        with suppress(psutil.AccessDenied, AttributeError):
+                            fds += proc.num_fds()
+                        with suppress(psutil.AccessDenied, AttributeError):
+                            io = proc.io_counters()
+                            reads += io.read_bytes
+                            writes += io.write_bytes
+                        try:
+                            # Served from smaps_rollup on modern kernels.
+                            pss += proc.memory_full_info().pss
+                        except (psutil.AccessDenied, AttributeError):
+                            pss_available = False
+                    count += 1
+                except psutil.NoSuchProcess:
+                    continue
+
+            resident = pss if pss_available else rss
+            return ResourceSnapshot(
+                timestamp=time.time(),
+                process_count=count,
+                rss_bytes=rss,
+                pss_bytes=pss if pss_available else None,
+                memory_percent=resident / self._total_memory * 100.0,
+                cpu_percent=cpu,
+                num_threads=threads,
+                num_fds=fds,
+                read_bytes=reads,
+                write_bytes=writes,
+            )
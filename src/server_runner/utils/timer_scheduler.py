@@ -0,0 +1,336 @@
+import asyncio
+import heapq
+import itertools
+import re
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Literal
+
+from server_runner.config.logging import get_logger
+
+log = get_logger()
+
+Interval = Literal["minute", "hour", "day"]
+TimerCallback = Callable[[], None]
+
+# Longest uninterrupted sleep; bounds how long a wall-clock jump goes unseen
+DEFAULT_MAX_SLEEP = 60.0
+# Wall/monotonic drift that triggers recomputing wall-clock deadlines
+REALIGN_TOLERANCE = 1.0
+# Firing later than this is logged as a warning
+LAG_WARNING = 1.0
+
+_AT_FORMATS: dict[Interval, re.Pattern[str]] = {
+    "minute": re.compile(r"^:(?P<second>[0-5]\d)$"),
+    "hour": re.compile(r"^(?P<minute>[0-5]\d)?:(?P<second>[0-5]\d)$"),
+    "day": re.compile(
+        r"^(?P<hour>[01]\d|2[0-3]):(?P<minute>[0-5]\d)(:(?P<second>[0-5]\d))?$"
+    ),
+}
+_PERIODS: dict[Interval, timedelta] = {
+    "minute": timedelta(minutes=1),
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class RecurringTime:
+    """
+    A local wall-clock time repeating every minute, hour or day.
+
+    "at" follows the JobSchedule formats: ":SS" each minute, ":MM" or
+    "MM:SS" each hour, "HH:MM" or "HH:MM:SS" each day.
+    """
+
+    interval: Interval
+    hour: int = 0
+    minute: int = 0
+    second: int = 0
+
+    @classmethod
+    def parse(cls, interval: Interval, at: str) -> "RecurringTime":
+        match = _AT_FORMATS[interval].match(at)
+        if not match:
+            raise ValueError(f"Invalid time {at!r} for interval {interval!r}")
+        parts = {k: int(v) for k, v in match.groupdict().items() if v is not None}
+        if interval == "hour" and "minute" not in parts:
+            # ":MM" means a minute of the hour, not a second
+            parts = {"minute": parts["second"]}
+        return cls(interval, **parts)
+
+    def next_after(self, now: datetime) -> datetime:
+        """Return the first occurrence strictly after now."""
+        candidate = now.replace(second=self.second, microsecond=0)
+        if self.interval in ("hour", "day"):
+            candidate = candidate.replace(minute=self.minute)
+        if self.interval == "day":
+            candidate = candidate.replace(hour=self.hour)
+        if candidate <= now:
+            candidate += _PERIODS[self.interval]
+        return candidate
+
+
+class TimerHandle:
+    """A scheduled timer; also records how late it has fired."""
+
+    def __init__(self, name: str, callback: TimerCallback, owner: "TimerScheduler"):
+        self.name = name
+        self.callback = callback
+        self.cancelled = False
+        self.fired = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self._owner = owner
+
+    def cancel(self) -> None:
+        self._owner.cancel(self)
+
+    def record_fire(self, lag: float) -> None:
+        self.fired += 1
+        self.last_lag = lag
+        self.max_lag = max(self.max_lag, lag)
+
+
+@dataclass(slots=True)
+class _Timer:
+    handle: TimerHandle
+    deadline: float  # monotonic
+    wall_target: float | None = None  # epoch seconds, for wall-clock timers
+    recurring: RecurringTime | None = None
+
+
+class TimerScheduler:
+    """
+    Runs callbacks at deadlines kept in a min-heap.
+
+    The thread sleeps on a condition variable until the earliest deadline
+    and is woken early when timers are added, cancelled or the scheduler
+    stops. Deadlines are monotonic; wall-clock timers are converted with
+    the current wall/monotonic offset and realigned when that offset
+    shifts (NTP steps, suspend/resume).
+
+    Callbacks run on the scheduler thread and should only hand work off.
+    """
+
+    def __init__(
+        self,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        wall_clock: Callable[[], float] = time.time,
+        max_sleep: float = DEFAULT_MAX_SLEEP,
+    ):
+        self._clock = clock
+        self._wall_clock = wall_clock
+        self.max_sleep = max_sleep
+
+        self._cond = threading.Condition()
+        self._heap: list[tuple[float, int, _Timer]] = []
+        self._seq = itertools.count()
+        self._offset = wall_clock() - clock()
+        self._stopped = False
+        self._thread: threading.Thread | None = None
+
+    # ------------------------
+    # Adding / Removing
+    # ------------------------
+    def every(
+        self, recurring: RecurringTime, callback: TimerCallback, *, name: str = ""
+    ) -> TimerHandle:
+        """Run callback at every occurrence of a wall-clock time."""
+        handle = TimerHandle(name, callback, self)
+        wall_target = self._next_wall(recurring, self._wall_clock())
+        self._push(
+            _Timer(handle, self._to_deadline(wall_target), wall_target, recurring)
+        )
+        return handle
+
+    def call_later(
+        self, delay: float, callback: TimerCallback, *, name: str = ""
+    ) -> TimerHandle:
+        """Run callback once, delay seconds from now."""
+        handle = TimerHandle(name, callback, self)
+        self._push(_Timer(handle, self._clock() + delay))
+        return handle
+
+    def cancel(self, handle: TimerHandle) -> None:
+        with self._cond:
+            handle.cancelled = True
+            self._wake()
+
+    def _push(self, timer: _Timer) -> None:
+        with self._cond:
+            heapq.heappush(self._heap, (timer.deadline, next(self._seq), timer))
+            self._wake()
+
+    def _wake(self) -> None:
+        """Interrupt the loop's sleep. Called with _cond held."""
+        self._cond.notify()
+
+    # ------------------------
+    # Clock helpers
+    # ------------------------
+    @staticmethod
+    def _next_wall(recurring: RecurringTime, after: float) -> float:
+        return recurring.next_after(datetime.fromtimestamp(after)).timestamp()
+
+    def _to_deadline(self, wall_target: float) -> float:
+        return wall_target - self._offset
+
+    def _realign(self) -> None:
+        """Recompute wall-clock deadlines if the wall clock jumped."""
+        offset = self._wall_clock() - self._clock()
+        if abs(offset - self._offset) < REALIGN_TOLERANCE:
+            return
+        log.info(f"Wall clock shifted by {offset - self._offset:+.1f}s; realigning")
+        self._offset = offset
+        heap: list[tuple[float, int, _Timer]] = []
+        for _, seq, timer in self._heap:
+            if timer.wall_target is not None:
+                timer.deadline = self._to_deadline(timer.wall_target)
+            heap.append((timer.deadline, seq, timer))
+        heapq.heapify(heap)
+        self._heap = heap
+
+    # ------------------------
+    # Loop
+    # ------------------------
+    def _pop_due(self) -> tuple[list[_Timer], float]:
+        """
+        Pop the timers that are due, and how long to sleep if there are
+        none. Called with _cond held.
+        """
+        self._realign()
+        while self._heap and self._heap[0][2].handle.cancelled:
+            heapq.heappop(self._heap)
+
+        now = self._clock()
+        due: list[_Timer] = []
+        while self._heap and self._heap[0][0] <= now:
+            timer = heapq.heappop(self._heap)[2]
+            if not timer.handle.cancelled:
+                due.append(timer)
+
+        timeout = self.max_sleep
+        if self._heap:
+            timeout = min(timeout, self._heap[0][0] - now)
+        return due, timeout
+
+    def _take_due(self) -> list[_Timer] | None:
+        """Block until timers are due; None once stopped."""
+        with self._cond:
+            while not self._stopped:
+                due, timeout = self._pop_due()
+                if due:
+                    return due
+                self._cond.wait(timeout)
+            return None
+
+    def _fire(self, timer: _Timer) -> None:
+        handle = timer.handle
+        lag = max(0.0, self._clock() - timer.deadline)
+        handle.record_fire(lag)
+        if lag > LAG_WARNING:
+            log.warning(f"Timer '{handle.name}' fired {lag:.1f}s late")
+        try:
+            handle.callback()
+        except Exception as e:
+            log.error(f"Timer '{handle.name}' failed: {type(e).__name__} - {e}")
+
+        if timer.recurring is not None and timer.wall_target is not None:
+            # Skip occurrences missed while late rather than firing a burst
+            after = max(self._wall_clock(), timer.wall_target)
+            timer.wall_target = self._next_wall(timer.recurring, after)
+            timer.deadline = self._to_deadline(timer.wall_target)
+            with self._cond:
+                if not handle.cancelled:
+                    heapq.heappush(self._heap, (timer.deadline, next(self._seq), timer))
+
+    def run(self) -> None:
+        while (due := self._take_due()) is not None:
+            for timer in due:
+                self._fire(timer)
+
+    # ------------------------
+    # Lifecycle
+    # ------------------------
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self.run, name="SchedulerThread", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        with self._cond:
+            self._stopped = True
+            self._wake()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def timers(self) -> list[TimerHandle]:
+        with self._cond:
+            return [timer.handle for _, _, timer in self._heap]
+
+
+class AsyncTimerScheduler(TimerScheduler):
+    """
+    TimerScheduler driven by a task on an asyncio event loop instead of a
+    thread. Timers may still be added and cancelled from any thread.
+
+    Callbacks run on the event loop and should only hand work off, e.g.
+    by creating a task.
+    """
+
+    def __init__(
+        self,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        wall_clock: Callable[[], float] = time.time,
+        max_sleep: float = DEFAULT_MAX_SLEEP,
+    ):
+        super().__init__(clock=clock, wall_clock=wall_clock, max_sleep=max_sleep)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    def _wake(self) -> None:
+        loop, wakeup = self._loop, self._wakeup
+        if loop is not None and wakeup is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(wakeup.set)
+
+    async def run_async(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = wakeup = asyncio.Event()
+        while True:
+            with self._cond:
+                if self._stopped:
+                    return
+                # Wakeups requested after this point are delivered by the
+                # loop once we are waiting, so none can be lost
+                wakeup.clear()
+                due, timeout = self._pop_due()
+
+            for timer in due:
+                self._fire(timer)
+            if due:
+                continue
+
+            try:
+                async with asyncio.timeout(timeout):
+                    await wakeup.wait()
+            except TimeoutError:
+                pass
+
+    def start(self) -> None:
+        """Start the scheduler task; must be called on the event loop."""
+        self._task = asyncio.get_running_loop().create_task(
+            self.run_async(), name="SchedulerTask"
+        )
+
+    async def wait_closed(self) -> None:
+        """Wait for the scheduler task to exit after stop()."""
+        if self._task is not None:
+            await self._task
@@ -0,0 +1,288 @@
+import math
+import mmap
+import struct
+import threading
+import time
+import zlib
+from array import array
+from collections.abc import Iterator, Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+from server_runner.config.logging import get_logger
+
+log = get_logger()
+
+MAGIC = b"SRTSRING"
+FORMAT_VERSION = 1
+# Magic, version, layout checksum; padded so the data stays 8-byte aligned
+HEADER = struct.Struct("<8sII")
+HEADER_SIZE = 64
+# Per series in each row: count, sum, min, max
+FIELDS = 4
+
+
+@dataclass(frozen=True, slots=True)
+class Tier:
+    resolution: float  # seconds per bucket
+    capacity: int  # buckets kept
+
+    @property
+    def retention(self) -> float:
+        return self.resolution * self.capacity
+
+
+# 1 s for an hour, 1 min for a day, 1 h for 90 days
+DEFAULT_TIERS: Sequence[Tier] = (
+    Tier(1.0, 3600),
+    Tier(60.0, 1440),
+    Tier(3600.0, 24 * 90),
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Point:
+    timestamp: float  # bucket start, wall clock
+    mean: float
+    min: float
+    max: float
+    count: int
+
+
+@dataclass(frozen=True, slots=True)
+class Aggregate:
+    count: int
+    mean: float
+    min: float
+    max: float
+    first: Point
+    last: Point
+
+
+class TimeSeriesStore:
+    """
+    Fixed-size store for a set of numeric series, downsampled at write time.
+
+    Every tier is a ring of buckets indexed by timestamp // resolution,
+    so a bucket's slot is implied by its time and no head pointer is
+    needed. A slot holds the bucket start followed by count, sum, min and
+    max for each series; a slot whose start does not match is stale and
+    is reset on write and skipped on read.
+
+    Rows live in one flat buffer of doubles: an array in memory, or a
+    memory-mapped file when path is given, so history survives restarts.
+    A file written with different series or tiers is reinitialised.
+    """
+
+    def __init__(
+        self,
+        series: Sequence[str],
+        tiers: Sequence[Tier] = DEFAULT_TIERS,
+        path: Path | None = None,
+    ):
+        if list(tiers) != sorted(tiers, key=lambda t: t.resolution):
+            raise ValueError("Tiers must be ordered finest first")
+        self.series: tuple[str, ...] = tuple(series)
+        self.tiers: tuple[Tier, ...] = tuple(tiers)
+        self.path = path
+        self._index = {name: i for i, name in enumerate(self.series)}
+        self._width = 1 + FIELDS * len(self.series)
+        self._offsets: list[int] = []
+        rows = 0
+        for tier in self.tiers:
+            self._offsets.append(rows * self._width)
+            rows += tier.capacity
+        self._size = rows * self._width
+
+        self._lock = threading.Lock()
+        self._closed = False
+        self._last: dict[str, tuple[float, float]] = {}
+        self._file: BinaryIO | None = None
+        self._mmap: mmap.mmap | None = None
+        if path is None:
+            self._view = memoryview(bytearray(8 * self._size))
+            self._data = self._view.cast("d")
+        else:
+            self._view = memoryview(self._open(path))
+            self._data = self._view[HEADER_SIZE:].cast("d")
+
+    # ------------------------
+    # Storage
+    # ------------------------
+    def _layout_crc(self) -> int:
+        layout = repr((self.series, [(t.resolution, t.capacity) for t in self.tiers]))
+        return zlib.crc32(layout.encode())
+
+    def _open(self, path: Path) -> mmap.mmap:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        length = HEADER_SIZE + 8 * self._size
+        expected = HEADER.pack(MAGIC, FORMAT_VERSION, self._layout_crc())
+        # Kept open for the mapping's lifetime and closed in close()
+        mode = "r+b" if path.exists() else "w+b"
+        self._file = file = open(path, mode)  # noqa: SIM115
+        header = file.read(HEADER.size)
+        fresh = header != expected or path.stat().st_size != length
+        if fresh:
+            if header:
+                log.warning(f"History file {path} has another layout; resetting")
+            file.truncate(0)
+            file.truncate(length)
+        self._mmap = mm = mmap.mmap(file.fileno(), length)
+        if fresh:
+            mm[: HEADER.size] = expected
+        return mm
+
+    def flush(self) -> None:
+        if self._mmap is not None:
+            self._mmap.flush()
+
+    def close(self) -> None:
+        """Release the file; later records are dropped and reads are empty."""
+        with self._lock:
+            self._closed = True
+            if self._mmap is None:
+                return
+            self._data.release()
+            self._view.release()
+            self._mmap.flush()
+            self._mmap.close()
+            self._mmap = None
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    # ------------------------
+    # Writing
+    # ------------------------
+    def _row(self, tier: int, bucket: int) -> int:
+        return self._offsets[tier] + (bucket % self.tiers[tier].capacity) * self._width
+
+    def record(
+        self, values: Mapping[str, float], timestamp: float | None = None
+    ) -> None:
+        """Add a sample for each named series; NaN values are skipped."""
+        ts = time.time() if timestamp is None else timestamp
+        present = [
+            (self._index[name], value)
+            for name, value in values.items()
+            if name in self._index and not math.isnan(value)
+        ]
+        with self._lock:
+            if self._closed:
+                return
+            data = self._data
+            for tier_index, tier in enumerate(self.tiers):
+                bucket = math.floor(ts / tier.resolution)
+                start = bucket * tier.resolution
+                row = self._row(tier_index, bucket)
+                if data[row] != start:
+                    data[row] = start
+                    for base in range(row + 1, row + self._width, FIELDS):
+                        data[base : base + FIELDS] = _EMPTY_FIELDS
+                for i, value in present:
+                    base = row + 1 + FIELDS * i
+                    data[base] += 1
+                    data[base + 1] += value
+                    data[base + 2] = min(data[base + 2], value)
+                    data[base + 3] = max(data[base + 3], value)
+            for i, value in present:
+                self._last[self.series[i]] = (ts, value)
+
+    # ------------------------
+    # Reading
+    # ------------------------
+    def _tier_for(self, start: float, resolution: float | None) -> int:
+        if resolution is not None:
+            for i, tier in enumerate(self.tiers):
+                if tier.resolution == resolution:
+                    return i
+            raise ValueError(f"No tier with {resolution}s resolution")
+        age = time.time() - start
+        for i, tier in enumerate(self.tiers):
+            if tier.retention >= age:
+                return i
+        return len(self.tiers) - 1
+
+    def _points(
+        self, tier_index: int, series: int, start: float, end: float
+    ) -> Iterator[Point]:
+        tier = self.tiers[tier_index]
+        data = self._data
+        last = math.floor(end / tier.resolution)
+        first = max(math.floor(start / tier.resolution), last - tier.capacity + 1)
+        for bucket in range(first, last + 1):
+            row = self._row(tier_index, bucket)
+            bucket_start = bucket * tier.resolution
+            if data[row] != bucket_start:
+                continue
+            base = row + 1 + FIELDS * series
+            count = data[base]
+            if count:
+                yield Point(
+                    bucket_start,
+                    data[base + 1] / count,
+                    data[base + 2],
+                    data[base + 3],
+                    int(count),
+                )
+
+    def range(
+        self,
+        series: str,
+        start: float,
+        end: float | None = None,
+        *,
+        resolution: float | None = None,
+    ) -> list[Point]:
+        """
+        Points for series between start and end (wall clock), from the
+        finest tier still holding start unless a resolution is given.
+        """
+        end = time.time() if end is None else end
+        index = self._index[series]
+        with self._lock:
+            if self._closed:
+                return []
+            tier = self._tier_for(start, resolution)
+            return list(self._points(tier, index, start, end))
+
+    def aggregate(
+        self,
+        series: str,
+        start: float,
+        end: float | None = None,
+        *,
+        resolution: float | None = None,
+    ) -> Aggregate | None:
+        """Count, mean, min and max of series over a window; None if empty."""
+        points = self.range(series, start, end, resolution=resolution)
+        if not points:
+            return None
+        count = sum(p.count for p in points)
+        total = sum(p.mean * p.count for p in points)
+        return Aggregate(
+            count=count,
+            mean=total / count,
+            min=min(p.min for p in points),
+            max=max(p.max for p in points),
+            first=points[0],
+            last=points[-1],
+        )
+
+    def latest(self, series: str) -> tuple[float, float] | None:
+        """(timestamp, value) of the newest sample of series, if any."""
+        index = self._index[series]
+        with self._lock:
+            last = self._last.get(series)
+            if last is not None or self._closed:
+                return last
+            # Nothing recorded since opening; fall back to the persisted rings
+            for tier in range(len(self.tiers)):
+                points = list(self._points(tier, index, 0.0, time.time()))
+                if points:
+                    return points[-1].timestamp, points[-1].mean
+        return None
+
+
+_EMPTY_FIELDS = memoryview(array("d", [0.0, 0.0, math.inf, -math.inf]))
@@ -0,0 +1,112 @@
+import asyncio
+import queue
+
+from server_runner.config.logging import get_logger
+from server_runner.steam.managed_game_server import ManagedGameServer
+from server_runner.utils.cancellation import CancellationToken
+from server_runner.utils.timer_scheduler import AsyncTimerScheduler, TimerScheduler
+from server_runner.workflow.job_definitions import JobID, JobSchedule
+from server_runner.workflow.workflow_engine import WorkflowEngine
+from server_runner.workflow.workflow_job import WorkflowJob
+
+log = get_logger()
+
+
+class AsyncWorkflowEngine(WorkflowEngine):
+    """
+    WorkflowEngine whose scheduler and consumer are tasks on one asyncio
+    event loop instead of threads.
+
+    Jobs run through WorkflowJob.run_all_async(): countdowns wait on the
+    loop, and blocking tasks (stop, steamcmd) use the loop's default
+    executor, which bounds how many threads the engine needs. Jobs may
+    still be enqueued from any thread.
+    """
+
+    def __init__(
+        self,
+        server: ManagedGameServer,
+        jobs: dict[JobID, WorkflowJob],
+        schedules: dict[JobID, JobSchedule],
+    ):
+        super().__init__(server, jobs, schedules)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._consumer_task: asyncio.Task[None] | None = None
+
+    def _create_scheduler(self) -> TimerScheduler:
+        return AsyncTimerScheduler()
+
+    def _wake(self) -> None:
+        loop, wakeup = self._loop, self._wakeup
+        if loop is not None and wakeup is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(wakeup.set)
+
+    # ------------------------
+    # Consumer
+    # ------------------------
+    async def _consume(self, wakeup: asyncio.Event) -> None:
+        while True:
+            try:
+                job = self.queue.get_nowait()
+            except queue.Empty:
+                # Producers wake us through the loop, so a job enqueued
+                # after this clear() is never missed
+                wakeup.clear()
+                await wakeup.wait()
+                continue
+
+            if job.is_sentinel:
+                self.queue.task_done()
+                log.debug("Sentinel WorkflowJob found... exiting consumer")
+                break
+
+            token = CancellationToken(self._cancel_token)
+            self._running = job
+            self.telemetry.job_started(job)
+            completed: bool | None = None
+            try:
+                log.info(f"Running job: {job}")
+                completed = await job.run_all_async(token)
+                self._job_finished(job, token, completed)
+            except Exception:
+                log.exception(f"Job failed: {job}")
+            finally:
+                self.telemetry.job_finished(job, completed)
+                self._running = None
+                token.close()
+                self.queue.task_done()
+
+    def _submit(self, job: WorkflowJob) -> bool:
+        if not super()._submit(job):
+            return False
+        self._wake()
+        return True
+
+    # ------------------------
+    # Public API
+    # ------------------------
+    def start(self) -> None:
+        """Start the engine; must be called on the event loop."""
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self.server.on_unexpected_exit(self._on_server_crash)
+        self.server.on_state(self.telemetry.observe_state)
+        log.debug("Starting WorkflowEngine tasks")
+        self._consumer_task = self._loop.create_task(
+            self._consume(self._wakeup), name="ConsumerTask"
+        )
+        self._setup_schedules()
+        self.scheduler.start()
+        log.debug("WorkflowEngine tasks started")
+
+    def stop(self) -> None:
+        """Signal shutdown; await wait_closed() for the tasks to finish."""
+        super().stop()
+        self._wake()
+
+    async def wait_closed(self) -> None:
+        if self._consumer_task is not None:
+            await self._consumer_task
+        if isinstance(self.scheduler, AsyncTimerScheduler):
+            await self.scheduler.wait_closed()
@@ -25,6 +25,8 @@ class JobSchedule(TypedDict, total=False):
     times: list[str]  # e.g., [":00", ":15"]
     interval: Literal["minute", "hour", "day"]
     condition: Callable[[], bool]  # lambda returning bool
+    deadline: float  # seconds the condition may take before it is ignored
+    on_true: Callable[[], None]  # on the scheduler thread, before enqueueing
 
 
 # ------------------------
@@ -38,6 +40,7 @@ class JobDef(TypedDict):
     priority: int
     tasks: list[TaskBuilder]
     schedule: JobSchedule | None  # optional scheduling info
+    supersedes: list[JobID]  # pending jobs this one replaces
 
 
 JobDefs = dict[JobID, JobDef]  # <-- use enum as key
@@ -54,12 +57,15 @@ def get_job_definitions(server: ManagedGameServer) -> JobDefs:
                 "times": [":00"],
                 "interval": "minute",
                 "condition": lambda: server.state() is not ServerState.RUNNING,
+                "deadline": 15,
             },
+            "supersedes": [],
         },
         JobID.UPDATE_START: {
             "priority": 2,
             "tasks": [tf.update, tf.start],
             "schedule": None,  # manual only
+            "supersedes": [JobID.START, JobID.UPDATE, JobID.RESTART, JobID.OOM],
         },
         JobID.RESTART: {
             "priority": 3,
@@ -75,14 +81,19 @@ def get_job_definitions(server: ManagedGameServer) -> JobDefs:
                 "times": ["05:45"],
                 "interval": "day",
                 "condition": lambda: server.state() is not ServerState.RUNNING,
+                "deadline": 15,
             },
+            "supersedes": [],
         },
         JobID.OOM: {
             "priority": 4,
             "tasks": [
-                # Countdown with short, frequent checkpoints for quick OOM restart
+                # 1 min when out of memory; 5 min when restarting ahead of a
+                # forecast OOM in a quiet window
                 lambda: tf.countdown(
-                    "OOM detected", delay_minutes=1, checkpoints=[60, 30, 15, 5]
+                    "Low memory",
+                    delay_minutes=server.oom_countdown_minutes,
+                    checkpoints=[300, 60, 30, 15, 5],
                 ),
                 tf.stop,
                 tf.start,
@@ -90,15 +101,22 @@ def get_job_definitions(server: ManagedGameServer) -> JobDefs:
             "schedule": {
                 "times": [":00", ":10", ":20", ":30", ":40", ":50"],
                 "interval": "hour",
-                "condition": lambda: server.is_out_of_memory(),
+                "condition": lambda: server.oom_restart_due(),
+                "deadline": 10,
+                "on_true": lambda: server.latch_oom_countdown(),
             },
+            "supersedes": [JobID.RESTART],
         },
         JobID.UPDATE: {
             "priority": 5,
             "tasks": [
-                # Countdown with custom checkpoints: 15min, 5 min, 1 min, 30s
+                # Download ahead of the countdown when staged updates are on
+                tf.prepare_update,
+                # Countdown sized by the update's depot delta (5-15 min)
                 lambda: tf.countdown(
-                    "Update incoming", delay_minutes=15, checkpoints=[600, 300, 60, 30]
+                    "Update incoming",
+                    delay_minutes=server.update_countdown_minutes,
+                    checkpoints=[600, 300, 60, 30],
                 ),
                 tf.stop,
                 tf.update,
@@ -107,11 +125,15 @@ def get_job_definitions(server: ManagedGameServer) -> JobDefs:
                 "times": [":00", ":15", ":30", ":45"],
                 "interval": "hour",
                 "condition": lambda: server.update_available(),
+                # May fall back to steamcmd and the network
+                "deadline": 180,
             },
+            "supersedes": [JobID.RESTART],
         },
         JobID.STOP: {
             "priority": 6,
             "tasks": [tf.stop],
             "schedule": None,  # manual only
+            "supersedes": [JobID.START, JobID.UPDATE_START, JobID.RESTART, JobID.OOM],
         },
     }
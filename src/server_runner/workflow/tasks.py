@@ -1,9 +1,15 @@
+import asyncio
+import math
+import threading
+import time
 from abc import ABC, abstractmethod
-from collections.abc import Sequence
-from dataclasses import dataclass
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from typing import ClassVar
 
 from server_runner.config.logging import get_logger
 from server_runner.steam.managed_game_server import ManagedGameServer, ServerState
+from server_runner.utils.cancellation import CancellationToken
 
 log = get_logger()
 
@@ -18,16 +24,25 @@ class TaskResult:
 
 
 class Task(ABC):
+    # Whether the job may be abandoned during this task. Once a job reaches a
+    # task that is not preemptible (e.g. stop), it runs to completion.
+    preemptible: ClassVar[bool] = False
+
     def __init__(self, server: ManagedGameServer):
         self.server: ManagedGameServer = server
 
     @abstractmethod
-    def run(self) -> TaskResult:
+    def run(self, token: CancellationToken) -> TaskResult:
         raise NotImplementedError
 
+    async def run_async(self, token: CancellationToken) -> TaskResult:
+        """Run on the event loop's executor; override to run on the loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.run, token)
+
 
 class TaskStart(Task):
-    def run(self) -> TaskResult:
+    def run(self, token: CancellationToken) -> TaskResult:
         if self.server.state() is ServerState.RUNNING:
             return TaskResult(True, "Server already running")
 
@@ -36,7 +51,7 @@ class TaskStart(Task):
 
 
 class TaskStop(Task):
-    def run(self) -> TaskResult:
+    def run(self, token: CancellationToken) -> TaskResult:
         if self.server.state() is ServerState.STOPPED:
             return TaskResult(True, "Server already stopped")
 
@@ -45,44 +60,150 @@ class TaskStop(Task):
 
 
 class TaskUpdate(Task):
-    def run(self) -> TaskResult:
+    def run(self, token: CancellationToken) -> TaskResult:
         self.server.update()
         return TaskResult(True, "Update complete")
 
 
+class TaskPrepareUpdate(Task):
+    # Preempting the job stops the download through the token
+    preemptible = True
+
+    def run(self, token: CancellationToken) -> TaskResult:
+        if self.server.prepare_update(token):
+            return TaskResult(True, "Update staged")
+        if token.cancelled:
+            return TaskResult(False, "Staging cancelled")
+        return TaskResult(True, "Nothing staged")
+
+
+@dataclass(slots=True)
+class _CountdownHandoff:
+    deadline: float  # monotonic
+    announced: set[int] = field(default_factory=set[int])
+
+
+class CountdownTracker:
+    """
+    Carries an interrupted countdown over to the next one, so a preempting
+    job continues the announcement stream players already saw instead of
+    starting a new, longer one.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._handoff: _CountdownHandoff | None = None
+
+    def hand_off(self, deadline: float, announced: set[int]) -> None:
+        with self._lock:
+            self._handoff = _CountdownHandoff(deadline, set(announced))
+
+    def take(self) -> _CountdownHandoff | None:
+        """Return and clear a pending handoff that has not expired."""
+        with self._lock:
+            handoff, self._handoff = self._handoff, None
+        if handoff is None or handoff.deadline <= time.monotonic():
+            return None
+        return handoff
+
+
 class TaskCountdown(Task):
+    preemptible = True
+
     def __init__(
         self,
         server: ManagedGameServer,
         title: str,
-        delay_minutes: int = 0,
+        delay_minutes: int | Callable[[], int] = 0,
         checkpoints: Sequence[int] | None = None,  # seconds
+        tracker: CountdownTracker | None = None,
     ) -> None:
         super().__init__(server)
         self.title = title
-        self.total_seconds = delay_minutes * SECONDS_IN_A_MINUTE
+        self.tracker = tracker or CountdownTracker()
+        # A callable delay is resolved on each run, e.g. from the update size
+        self.delay_minutes = delay_minutes
         # Default checkpoints: 5min, 1min, 30s, 15s
-        self.checkpoints = sorted(checkpoints or [5 * 60, 60, 30, 15], reverse=True)
-
-    def run(self) -> TaskResult:
-        remaining = self.total_seconds
+        self.default_checkpoints = sorted(
+            checkpoints or [5 * 60, 60, 30, 15], reverse=True
+        )
+
+    @property
+    def total_seconds(self) -> int:
+        delay = self.delay_minutes
+        minutes = delay() if callable(delay) else delay
+        return minutes * SECONDS_IN_A_MINUTE
+
+    def _begin(self) -> tuple[float, set[int]]:
+        """Return the deadline and already-announced checkpoints."""
+        deadline = time.monotonic() + self.total_seconds
+        announced: set[int] = set()
+
+        # Fold into a countdown that was interrupted by this job
+        handoff = self.tracker.take()
+        if handoff is not None and handoff.deadline < deadline:
+            log.info(f"[{self.title}] continuing earlier countdown")
+            deadline, announced = handoff.deadline, handoff.announced
+
+        remaining = math.ceil(deadline - time.monotonic())
+        self.checkpoints = [
+            cp
+            for cp in self.default_checkpoints
+            if cp <= remaining and cp not in announced
+        ]
+        return deadline, announced
+
+    def _due_checkpoint(self, remaining: int, announced: set[int]) -> int | None:
+        """Claim the checkpoint to announce at remaining seconds, if any."""
+        for cp in self.checkpoints:
+            if remaining <= cp:
+                self.checkpoints.remove(cp)
+                announced.add(cp)
+                return cp
+        return None
+
+    def _sleep_for(self, remaining: int) -> int:
+        """Seconds until the next checkpoint or the end."""
+        next_cp = max((cp for cp in self.checkpoints if cp < remaining), default=0)
+        return remaining - next_cp
+
+    def run(self, token: CancellationToken) -> TaskResult:
+        deadline, announced = self._begin()
+        remaining = math.ceil(deadline - time.monotonic())
 
         while remaining > 0:
             # Announce if we are at or below a checkpoint
-            for cp in self.checkpoints:
-                if remaining <= cp:
-                    self._announce(remaining)
-                    self.checkpoints.remove(cp)
-                    break
+            if self._due_checkpoint(remaining, announced) is not None:
+                self._announce(remaining)
 
-            # Sleep a small interval (max 15s) or remaining time
-            sleep_time = min(15, remaining)
-            self.server.wait.sleep(sleep_time)
-            remaining -= sleep_time
+            # Sleep until the next checkpoint or the end, waking if preempted
+            if token.wait(self._sleep_for(remaining)):
+                self.tracker.hand_off(deadline, announced)
+                return TaskResult(False, f"Countdown interrupted: {token.reason}")
+            remaining = math.ceil(deadline - time.monotonic())
+
+        return TaskResult(True, "Countdown completed")
+
+    async def run_async(self, token: CancellationToken) -> TaskResult:
+        # Waiting is the whole task, so it stays on the loop
+        deadline, announced = self._begin()
+        remaining = math.ceil(deadline - time.monotonic())
+
+        while remaining > 0:
+            if self._due_checkpoint(remaining, announced) is not None:
+                await self.server.announce_async(self._message(remaining))
+
+            if await token.wait_async(self._sleep_for(remaining)):
+                self.tracker.hand_off(deadline, announced)
+                return TaskResult(False, f"Countdown interrupted: {token.reason}")
+            remaining = math.ceil(deadline - time.monotonic())
 
         return TaskResult(True, "Countdown completed")
 
     def _announce(self, seconds: int) -> None:
+        self.server.announce(self._message(seconds))
+
+    def _message(self, seconds: int) -> str:
         if seconds >= SECONDS_IN_A_MINUTE:
             value = seconds // SECONDS_IN_A_MINUTE
             unit = "minutes" if value > 1 else "minute"
@@ -90,12 +211,14 @@ class TaskCountdown(Task):
             value = seconds
             unit = "seconds" if value > 1 else "second"
 
-        self.server.announce(f"[{self.title}] restarting in {value} {unit}")
+        return f"[{self.title}] restarting in {value} {unit}"
 
 
 class TaskFactory:
     def __init__(self, server: ManagedGameServer) -> None:
         self.server = server
+        # Shared so every job's countdowns can fold into one another
+        self.countdowns = CountdownTracker()
 
     def start(self) -> TaskStart:
         return TaskStart(self.server)
@@ -106,10 +229,15 @@ class TaskFactory:
     def update(self) -> TaskUpdate:
         return TaskUpdate(self.server)
 
+    def prepare_update(self) -> TaskPrepareUpdate:
+        return TaskPrepareUpdate(self.server)
+
     def countdown(
         self,
         title: str,
-        delay_minutes: int = 0,
+        delay_minutes: int | Callable[[], int] = 0,
         checkpoints: Sequence[int] | None = None,
     ) -> TaskCountdown:
-        return TaskCountdown(self.server, title, delay_minutes, checkpoints)
+        return TaskCountdown(
+            self.server, title, delay_minutes, checkpoints, self.countdowns
+        )
@@ -0,0 +1,169 @@
+import json
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from server_runner.config.logging import get_logger
+from server_runner.steam.managed_game_server import ServerState
+from server_runner.utils.histogram import Histogram
+from server_runner.workflow.workflow_job import WorkflowJob
+
+log = get_logger()
+
+DEFAULT_HISTORY = 100
+
+
+@dataclass(frozen=True, slots=True)
+class JobRun:
+    job: str
+    outcome: str  # "completed", "preempted" or "failed"
+    finished_at: float  # wall clock
+    queue_wait: float  # seconds from enqueue to start
+    duration: float  # seconds from start to finish
+    tasks: list[tuple[str, float]]  # (task, seconds) in run order
+
+
+@dataclass(frozen=True, slots=True)
+class Downtime:
+    started_at: float  # wall clock of the last healthy observation
+    duration: float  # seconds until the next healthy observation
+    job: str | None  # job running when the server was first seen down
+
+
+class WorkflowTelemetry:
+    """
+    Execution telemetry for workflow jobs and the server they manage.
+
+    Keeps duration histograms per task type, queue-wait and run-time
+    histograms per job, recent runs and observed downtime. Downtime runs
+    from the last RUNNING observation to the next one, so its resolution
+    is that of the state probes feeding observe_state().
+    """
+
+    def __init__(self, history: int = DEFAULT_HISTORY):
+        self._lock = threading.Lock()
+        self.task_durations: defaultdict[str, Histogram] = defaultdict(Histogram)
+        self.job_durations: defaultdict[str, Histogram] = defaultdict(Histogram)
+        self.queue_waits: defaultdict[str, Histogram] = defaultdict(Histogram)
+        self.downtime = Histogram()
+        self.runs: deque[JobRun] = deque(maxlen=history)
+        # Lifetime (job, outcome) totals; runs only keeps the recent ones
+        self.outcomes: Counter[tuple[str, str]] = Counter()
+        self.outages: deque[Downtime] = deque(maxlen=history)
+
+        self._current_job: str | None = None
+        self._healthy_at: float | None = None  # monotonic
+        self._healthy_wall: float | None = None
+        self._down_since: float | None = None  # monotonic, first unhealthy
+        self._down_job: str | None = None
+
+    # ------------------------
+    # Jobs
+    # ------------------------
+    def job_started(self, job: WorkflowJob) -> None:
+        with self._lock:
+            self._current_job = job.name
+
+    def job_finished(self, job: WorkflowJob, completed: bool | None) -> None:
+        """Record a run; completed is None when the job raised."""
+        if completed is None:
+            outcome = "failed"
+        else:
+            outcome = "completed" if completed else "preempted"
+
+        started = job.started_at or time.monotonic()
+        finished = job.finished_at or time.monotonic()
+        run = JobRun(
+            job=job.name,
+            outcome=outcome,
+            finished_at=time.time(),
+            queue_wait=job.queue_wait,
+            duration=finished - started,
+            tasks=list(job.task_durations),
+        )
+        with self._lock:
+            self._current_job = None
+            self.runs.append(run)
+            self.outcomes[job.name, outcome] += 1
+            self.queue_waits[job.name].observe(run.queue_wait)
+            self.job_durations[job.name].observe(run.duration)
+            for task, seconds in run.tasks:
+                self.task_durations[task].observe(seconds)
+        log.debug(
+            f"{job.name} {outcome} in {run.duration:.1f}s "
+            f"after {run.queue_wait:.1f}s queued"
+        )
+
+    # ------------------------
+    # Downtime
+    # ------------------------
+    def observe_state(self, state: ServerState) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if state is not ServerState.RUNNING:
+                if self._down_since is None:
+                    self._down_since = now
+                    self._down_job = self._current_job
+                return
+
+            healthy_at, healthy_wall = self._healthy_at, self._healthy_wall
+            self._healthy_at, self._healthy_wall = now, time.time()
+            if self._down_since is None or healthy_at is None:
+                self._down_since = None
+                return
+
+            outage = Downtime(
+                started_at=healthy_wall or 0.0,
+                duration=now - healthy_at,
+                job=self._down_job,
+            )
+            self._down_since = None
+            self._down_job = None
+            self.outages.append(outage)
+            self.downtime.observe(outage.duration)
+        log.info(
+            f"Server healthy again after {outage.duration:.0f}s down"
+            + (f" ({outage.job})" if outage.job else "")
+        )
+
+    def current_downtime(self) -> float:
+        """Seconds since the last healthy observation while down, else 0."""
+        with self._lock:
+            return self._current_downtime()
+
+    def _current_downtime(self) -> float:
+        if self._down_since is None or self._healthy_at is None:
+            return 0.0
+        return time.monotonic() - self._healthy_at
+
+    # ------------------------
+    # Export
+    # ------------------------
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "tasks": {k: h.to_dict() for k, h in self.task_durations.items()},
+                "jobs": {
+                    name: {
+                        "duration": self.job_durations[name].to_dict(),
+                        "queue_wait": self.queue_waits[name].to_dict(),
+                    }
+                    for name in self.job_durations
+                },
+                "downtime": self.downtime.to_dict(),
+                "current_downtime": self._current_downtime(),
+                "runs": [asdict(run) for run in self.runs],
+                "outages": [asdict(outage) for outage in self.outages],
+            }
+
+    def to_json(self, indent: int | None = 2) -> str:
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def dump(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(self.to_json(), encoding="utf-8")
+        tmp.replace(path)
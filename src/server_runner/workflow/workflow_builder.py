@@ -1,4 +1,5 @@
 from server_runner.steam.managed_game_server import ManagedGameServer
+from server_runner.workflow.async_workflow_engine import AsyncWorkflowEngine
 from server_runner.workflow.job_definitions import (
     JobID,
     JobSchedule,
@@ -24,7 +25,11 @@ def build_jobs_and_schedules(
 
     for job_id, data in job_defs.items():
         # Build job with tasks
-        job = WorkflowJob(name=job_id.name, priority=data["priority"])
+        job = WorkflowJob(
+            name=job_id.name,
+            priority=data["priority"],
+            supersedes=frozenset(j.name for j in data["supersedes"]),
+        )
         for builder in data["tasks"]:
             job.add_task(builder())
 
@@ -41,3 +46,8 @@ def build_jobs_and_schedules(
 def create_workflow_engine(server: ManagedGameServer) -> WorkflowEngine:
     jobs, schedules = build_jobs_and_schedules(server)
     return WorkflowEngine(server, jobs, schedules)
+
+
+def create_async_workflow_engine(server: ManagedGameServer) -> AsyncWorkflowEngine:
+    jobs, schedules = build_jobs_and_schedules(server)
+    return AsyncWorkflowEngine(server, jobs, schedules)
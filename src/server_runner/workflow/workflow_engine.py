@@ -1,14 +1,17 @@
 import queue
 import threading
-import time
 from collections.abc import Callable
 
-import schedule  # type: ignore
-
 from server_runner.config.logging import get_logger
 from server_runner.steam.managed_game_server import ManagedGameServer
+from server_runner.utils.cancellation import CancellationToken
+from server_runner.utils.condition_evaluator import ConditionEvaluator
+from server_runner.utils.managed_process import ProcessExit
+from server_runner.utils.timer_scheduler import RecurringTime, TimerScheduler
 from server_runner.workflow.job_definitions import JobID, JobSchedule
+from server_runner.workflow.telemetry import WorkflowTelemetry
 from server_runner.workflow.workflow_job import WorkflowJob
+from server_runner.workflow.workflow_queue import WorkflowQueue
 
 log = get_logger()
 
@@ -25,17 +28,21 @@ class WorkflowEngine:
         self.server = server
         self.jobs = jobs
         self.schedules = schedules
-        self.queue: queue.Queue[WorkflowJob] = queue.Queue()
+        self.queue = WorkflowQueue()
 
         self._stop_event = threading.Event()
         self._sentinel: WorkflowJob = WorkflowJob.sentinel()
+        # Parent of every job's token; cancelled on shutdown
+        self._cancel_token = CancellationToken()
+        self._running: WorkflowJob | None = None
 
-        self._consumer_thread = threading.Thread(
-            target=self._consumer, name="ConsumerThread", daemon=True
-        )
-        self._scheduler_thread = threading.Thread(
-            target=self._scheduler, name="SchedulerThread", daemon=True
-        )
+        self._consumer_thread: threading.Thread | None = None
+        self.scheduler = self._create_scheduler()
+        self.conditions = ConditionEvaluator(self.scheduler)
+        self.telemetry = WorkflowTelemetry()
+
+    def _create_scheduler(self) -> TimerScheduler:
+        return TimerScheduler()
 
     # ------------------------
     # Scheduler Helpers
@@ -45,6 +52,8 @@ class WorkflowEngine:
         times = schedule_info.get("times", [])
         interval = schedule_info.get("interval")
         condition: Callable[[], bool] = schedule_info.get("condition", lambda: True)
+        deadline = schedule_info.get("deadline")
+        on_true = schedule_info.get("on_true")
 
         if not interval or not times:
             return
@@ -54,37 +63,27 @@ class WorkflowEngine:
             log.warning(f"Cannot schedule unknown job '{job_id.name}'")
             return
 
+        def enqueue() -> None:
+            if on_true is not None:
+                on_true()
+            self._submit(job)
+
         def conditional_job():
-            try:
-                if condition():
-                    self.queue.put(job)
-            except Exception as e:
-                log.error(f"Error evaluating schedule for job '{job.name}': {e}")
+            # Evaluated off the scheduler thread; one evaluation per job at a time
+            self.conditions.submit(job.name, condition, enqueue, deadline=deadline)
 
         for t in times:
-            if interval == "minute":
-                schedule.every().minutes.at(t).do(conditional_job)
-            elif interval == "hour":
-                schedule.every().hour.at(t).do(conditional_job)
-            elif interval == "day":
-                schedule.every().day.at(t).do(conditional_job)
+            try:
+                recurring = RecurringTime.parse(interval, t)
+            except ValueError as e:
+                log.error(f"Cannot schedule job '{job.name}': {e}")
+                continue
+            self.scheduler.every(recurring, conditional_job, name=f"{job_id.name}@{t}")
 
     def _setup_schedules(self):
         for job_id, schedule_info in self.schedules.items():
             self._schedule_job(job_id, schedule_info)
 
-    # ------------------------
-    # Scheduler (Producer)
-    # ------------------------
-    def _scheduler(self):
-        self._setup_schedules()
-        while not self._stop_event.is_set():
-            try:
-                schedule.run_pending()
-                time.sleep(1)
-            except Exception as e:
-                log.error(f"Error during schedule loop: {type(e).__name__} - {e}")
-
     # ------------------------
     # Consumer
     # ------------------------
@@ -100,28 +99,86 @@ class WorkflowEngine:
                 log.debug("Sentinel WorkflowJob found... exiting consumer")
                 break
 
+            token = CancellationToken(self._cancel_token)
+            self._running = job
+            self.telemetry.job_started(job)
+            completed: bool | None = None
             try:
                 log.info(f"Running job: {job}")
-                job.run_all()
-                log.info(f"Completed job: {job}")
+                completed = job.run_all(token)
+                self._job_finished(job, token, completed)
+            except Exception:
+                # A failing task must not take down the only consumer
+                log.exception(f"Job failed: {job}")
             finally:
+                self.telemetry.job_finished(job, completed)
+                self._running = None
+                token.close()
                 self.queue.task_done()
 
+    def _job_finished(
+        self, job: WorkflowJob, token: CancellationToken, completed: bool
+    ) -> None:
+        if completed:
+            log.info(f"Completed job: {job}")
+        elif not self._stop_event.is_set():
+            # Re-queued behind the preempting job, or dropped if it
+            # was superseded
+            log.info(f"Preempted job: {job} ({token.reason})")
+            self.queue.enqueue(job)
+
+    # ------------------------
+    # Preemption
+    # ------------------------
+    def _submit(self, job: WorkflowJob) -> bool:
+        if not self.queue.enqueue(job):
+            return False
+
+        running = self._running
+        if (
+            running is not None
+            and running is not job
+            and (job.priority < running.priority or running.name in job.supersedes)
+            and running.preempt(f"preempted by {job.name}")
+        ):
+            log.info(f"Preempting {running} for {job}")
+        return True
+
+    # ------------------------
+    # Crash Recovery
+    # ------------------------
+    def _on_server_crash(self, _: ProcessExit) -> None:
+        if self._stop_event.is_set():
+            return
+        log.info("Server crash detected; enqueueing immediate restart")
+        self.enqueue_job(JobID.START)
+
     # ------------------------
     # Public API
     # ------------------------
     def start(self):
+        self.server.on_unexpected_exit(self._on_server_crash)
+        self.server.on_state(self.telemetry.observe_state)
         log.debug("Starting WorkflowEngine threads")
+        self._consumer_thread = threading.Thread(
+            target=self._consumer, name="ConsumerThread", daemon=True
+        )
         self._consumer_thread.start()
-        self._scheduler_thread.start()
+        self._setup_schedules()
+        self.scheduler.start()
         log.debug("WorkflowEngine threads started")
 
     def stop(self):
         log.debug("Stopping WorkflowEngine")
         self._stop_event.set()
-        self.queue.put(self._sentinel)
-        self._scheduler_thread.join()
-        self._consumer_thread.join()
+        self._cancel_token.cancel("shutdown")
+        self.server.cancel_operations()
+        # Pending jobs are dropped; the sentinel is all that remains
+        self.queue.enqueue(self._sentinel)
+        self.conditions.shutdown()
+        self.scheduler.stop()
+        if self._consumer_thread is not None:
+            self._consumer_thread.join()
         log.debug("WorkflowEngine stopped")
 
     def enqueue_job(self, job_id: JobID) -> bool:
@@ -129,6 +186,4 @@ class WorkflowEngine:
         if not job:
             log.warning(f"Job '{job_id.name}' not found")
             return False
-        self.queue.put(job)
-        log.info(f"Job '{job.name}' enqueued")
-        return True
+        return self._submit(job)
@@ -1,6 +1,10 @@
+import time
+from collections.abc import Generator
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 
 from server_runner.config.logging import get_logger
+from server_runner.utils.cancellation import CancellationToken
 from server_runner.workflow.tasks import Task
 
 log = get_logger()
@@ -17,6 +21,22 @@ class WorkflowJob:
     _tasks: list[Task] = field(default_factory=list, compare=False)
     _working: bool = field(default=False, compare=False)
     is_sentinel: bool = field(default=False, compare=False)
+    # Names of jobs made redundant while this one is pending
+    supersedes: frozenset[str] = field(default=frozenset(), compare=False)
+    _token: CancellationToken | None = field(default=None, compare=False, repr=False)
+    # Set once a non-preemptible task has started
+    _committed: bool = field(default=False, compare=False)
+    # Monotonic timestamps of the latest enqueue and run
+    enqueued_at: float | None = field(default=None, compare=False)
+    started_at: float | None = field(default=None, compare=False)
+    finished_at: float | None = field(default=None, compare=False)
+    # Seconds between the enqueue and start of the latest run; captured at
+    # start because a preempted job is re-enqueued before it is recorded
+    queue_wait: float = field(default=0.0, compare=False)
+    # (task, seconds) for each task of the latest run that got to start
+    task_durations: list[tuple[str, float]] = field(
+        default_factory=list[tuple[str, float]], compare=False
+    )
 
     @classmethod
     def sentinel(cls) -> "WorkflowJob":
@@ -39,11 +59,81 @@ class WorkflowJob:
         """Append a task to this workflow."""
         self._tasks.append(task)
 
-    def run_all(self):
-        """Execute all tasks in sequence."""
-        self._working = True
+    @property
+    def is_preemptible(self) -> bool:
+        return self._working and not self._committed
+
+    def preempt(self, reason: str) -> bool:
+        """Cancel the running job if it has not committed yet."""
+        token = self._token
+        if token is None or not self.is_preemptible:
+            return False
+        token.cancel(reason)
+        return True
+
+    def run_all(self, token: CancellationToken | None = None) -> bool:
+        """
+        Execute all tasks in sequence.
+        Returns False if the job was cancelled before finishing.
+        """
+        token = self._begin(token)
+        try:
+            for task in self._tasks:
+                if not self._enter(task, token):
+                    return False
+                with self._timed(task):
+                    task.run(token)
+            return True
+        finally:
+            self._end()
+
+    async def run_all_async(self, token: CancellationToken | None = None) -> bool:
+        """run_all() on an event loop, via each task's run_async()."""
+        token = self._begin(token)
         try:
             for task in self._tasks:
-                task.run()
+                if not self._enter(task, token):
+                    return False
+                with self._timed(task):
+                    await task.run_async(token)
+            return True
         finally:
-            self._working = False
+            self._end()
+
+    def _begin(self, token: CancellationToken | None) -> CancellationToken:
+        token = token or CancellationToken()
+        self._token = token
+        self._committed = False
+        self._working = True
+        self.started_at = time.monotonic()
+        self.finished_at = None
+        if self.enqueued_at is not None:
+            self.queue_wait = max(0.0, self.started_at - self.enqueued_at)
+        else:
+            self.queue_wait = 0.0
+        self.task_durations = []
+        return token
+
+    def _enter(self, task: Task, token: CancellationToken) -> bool:
+        """Return False if the job was cancelled before task could start."""
+        if token.cancelled and not self._committed:
+            log.info(f"{self} cancelled: {token.reason}")
+            return False
+        if not task.preemptible:
+            self._committed = True
+        return True
+
+    @contextmanager
+    def _timed(self, task: Task) -> Generator[None]:
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.task_durations.append(
+                (type(task).__name__, time.monotonic() - started)
+            )
+
+    def _end(self) -> None:
+        self.finished_at = time.monotonic()
+        self._working = False
+        self._token = None
@@ -1,3 +1,5 @@
+import heapq
+import time
 from queue import Empty, PriorityQueue
 
 from server_runner.config.logging import get_logger
@@ -7,7 +9,13 @@ log = get_logger()
 
 
 class WorkflowQueue(PriorityQueue[WorkflowJob]):
-    """A priority-based workflow queue for WorkflowItems."""
+    """
+    A priority-based workflow queue for WorkflowItems.
+
+    Jobs are coalesced by name: at most one instance of a job is pending,
+    and a job listed in a pending job's supersedes set is not queued at
+    all. Depth is therefore bounded by the number of distinct jobs.
+    """
 
     def __str__(self) -> str:
         items = list(self.queue)
@@ -37,16 +45,42 @@ class WorkflowQueue(PriorityQueue[WorkflowJob]):
     # Public API
     # ------------------------
 
-    def enqueue(self, item: WorkflowJob) -> None:
-        """Add a WorkflowItem. If sentinel, clear the queue first."""
+    def enqueue(self, item: WorkflowJob) -> bool:
+        """
+        Add a WorkflowItem. If sentinel, clear the queue first.
+        Returns False when the item was coalesced into a pending job.
+        """
         if item.is_sentinel:
             log.info("Enqueue sentinel -> clearing queue")
             self._clear()
             self.put(item)
-            return
+            return True
+
+        with self.mutex:
+            pending = self.queue
+            if any(p.name == item.name for p in pending):
+                log.info(f"coalesce: {item} already pending")
+                return False
+            superseding = next((p for p in pending if item.name in p.supersedes), None)
+            if superseding is not None:
+                log.info(f"coalesce: {item} superseded by pending {superseding}")
+                return False
+
+            survivors = [p for p in pending if p.name not in item.supersedes]
+            for dropped in pending:
+                if dropped.name in item.supersedes:
+                    log.info(f"dequeue: {dropped} superseded by {item}")
+            if len(survivors) != len(pending):
+                self.unfinished_tasks -= len(pending) - len(survivors)
+                heapq.heapify(survivors)
+                self.queue = survivors
 
-        log.info(f"enqueue: {item}")
-        self.put(item)
+            log.info(f"enqueue: {item}")
+            item.enqueued_at = time.monotonic()
+            self._put(item)
+            self.unfinished_tasks += 1
+            self.not_empty.notify()
+            return True
 
     def prune_lower_priority(self, base: WorkflowJob) -> None:
         """
@@ -1,7 +1,8 @@
 import os
 import sys
 import time
-from collections.abc import Sequence
+from collections.abc import Callable, Sequence
+from pathlib import Path
 from textwrap import dedent
 
 import psutil
@@ -106,3 +107,44 @@ def process_exists(pid: int) -> bool:
     except PermissionError:
         return True
     return True
+
+
+def chatty_python_process(lines: int = 20_000) -> Sequence[str]:
+    """
+    Writes far more than a pipe buffer to stdout before announcing
+    completion, then blocks. Without draining, the writes would stall.
+    """
+    code = dedent(
+        f"""
+        import sys
+        import time
+
+        for i in range({lines}):
+            print(f"line {{i}} " + "x" * 64)
+        print("done", flush=True)
+
+        while True:
+            time.sleep(0.1)
+        """
+    )
+    return (PYTHON, "-c", code)
+
+
+def wait_for(condition: Callable[[], bool], timeout: float = 5.0) -> bool:
+    end_time = time.time() + timeout
+    while time.time() < end_time:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def fake_steamcmd(directory: Path, body: str) -> str:
+    """
+    Write an executable stand-in for steamcmd that runs the given
+    Python body, and return its path.
+    """
+    script = directory / "steamcmd"
+    script.write_text(f"#!{PYTHON}\nimport sys, time\n{dedent(body)}")
+    script.chmod(0o755)
+    return str(script)
@@ -0,0 +1,84 @@
+import asyncio
+
+from server_runner.utils.async_process import AsyncManagedProcess
+from server_runner.utils.managed_process import ProcessExit
+from server_runner.utils.process_output import ProcessOutput
+from tests.integration.helpers import (
+    PYTHON,
+    crashing_python_process,
+    long_running_python_process,
+    process_exists,
+)
+
+EMIT_AND_EXIT = (
+    "import sys; print('hello stdout'); print('hello stderr', file=sys.stderr)"
+)
+
+
+def test_exit_is_reported_after_output() -> None:
+    """
+    Verifies that an asyncio-driven process:
+    - drains stdout and stderr into its output buffer
+    - reports an unrequested exit on the loop with its return code
+    """
+    output = ProcessOutput()
+    exits: list[ProcessExit] = []
+
+    async def scenario() -> None:
+        proc = AsyncManagedProcess(
+            (PYTHON, "-c", EMIT_AND_EXIT),
+            loop=asyncio.get_running_loop(),
+            output=output,
+        )
+        proc.on_exit(exits.append)
+        await proc.start_async()
+        assert await proc.wait_for_exit_async(timeout=5)
+
+    asyncio.run(scenario())
+
+    assert {line.stream for line in output.tail()} == {"stdout", "stderr"}
+    assert len(exits) == 1
+    assert not exits[0].expected
+
+
+def test_crash_return_code() -> None:
+    exits: list[ProcessExit] = []
+
+    async def scenario() -> int | None:
+        proc = AsyncManagedProcess(
+            crashing_python_process(7), loop=asyncio.get_running_loop()
+        )
+        proc.on_exit(exits.append)
+        await proc.start_async()
+        await proc.wait_for_exit_async(timeout=5)
+        return proc.exit_code()
+
+    assert asyncio.run(scenario()) == 7
+    assert exits[0].returncode == 7
+
+
+def test_blocking_facade_from_worker_thread() -> None:
+    """
+    Verifies that start() and terminate() called from a worker thread run
+    on the owning loop and mark the exit as expected.
+    """
+    exits: list[ProcessExit] = []
+
+    async def scenario() -> int | None:
+        proc = AsyncManagedProcess(
+            long_running_python_process(), loop=asyncio.get_running_loop()
+        )
+        proc.on_exit(exits.append)
+        await asyncio.to_thread(proc.start)
+        pid = proc.pid()
+        assert pid is not None and process_exists(pid)
+
+        await asyncio.to_thread(proc.terminate)
+        assert not proc.is_running()
+        await asyncio.sleep(0.1)
+        return pid
+
+    asyncio.run(scenario())
+
+    assert len(exits) == 1
+    assert exits[0].expected
@@ -1,16 +1,24 @@
+import os
+import signal
 import time
 from collections.abc import Generator
+from pathlib import Path
 from typing import IO
 
+import psutil
 import pytest
 
-from server_runner.utils.managed_process import ManagedProcess
+from server_runner.utils.managed_process import ManagedProcess, ProcessExit
+from server_runner.utils.process_output import OutputLine, ProcessOutput
 from tests.integration.helpers import (
+    PYTHON,
+    chatty_python_process,
     crashing_python_process,
     long_running_python_process,
     parent_with_child_process,
     process_exists,
     stdout_stderr_emitter,
+    wait_for,
     wait_for_child_process,
 )
 
@@ -126,6 +134,112 @@ def test_unexpected_exit_is_detected() -> None:
     assert proc.exit_code() == 42
 
 
+def test_exit_callback_reports_crash() -> None:
+    """
+    Verifies that an unexpected exit:
+    - fires registered exit callbacks without polling
+    - reports the exit code and marks the exit as unexpected
+    """
+    events: list[ProcessExit] = []
+    proc = ManagedProcess(crashing_python_process(42))
+    proc.on_exit(events.append)
+    proc.start()
+
+    assert proc.wait_for_exit(timeout=5.0)
+    assert wait_for(lambda: len(events) == 1)
+    assert events[0].returncode == 42
+    assert not events[0].expected
+
+
+def test_exit_callback_marks_terminate_as_expected(proc: ManagedProcess) -> None:
+    """
+    Verifies that exits requested through terminate() are flagged
+    as expected so callers can tell them apart from crashes.
+    """
+    events: list[ProcessExit] = []
+    proc.on_exit(events.append)
+    proc.start()
+
+    proc.terminate()
+
+    assert wait_for(lambda: len(events) == 1)
+    assert events[0].expected
+
+
+def test_cleared_expected_exit_reports_crash(proc: ManagedProcess) -> None:
+    """
+    Verifies that after a shutdown was announced and then abandoned,
+    an exit of the still-running process is reported as unexpected.
+    """
+    events: list[ProcessExit] = []
+    proc.on_exit(events.append)
+    proc.start()
+    pid = proc.pid()
+    assert pid is not None
+
+    proc.expect_exit()
+    proc.clear_expected_exit()
+    os.kill(pid, signal.SIGKILL)
+
+    assert wait_for(lambda: len(events) == 1)
+    assert not events[0].expected
+
+
+def test_late_exit_of_replaced_process_is_ignored(proc: ManagedProcess) -> None:
+    """
+    Verifies that once restart() has started a new process, an exit
+    notification for the old one arriving late:
+    - fires no exit callbacks, so it cannot be reported as a crash
+    - does not mark the new process as exited
+    """
+    events: list[ProcessExit] = []
+    proc.on_exit(events.append)
+    proc.start()
+    old = proc._proc  # type: ignore[reportPrivateUsage]
+    assert old is not None
+    late_exit = proc._make_exit_handler(old)  # type: ignore[reportPrivateUsage]
+
+    proc.restart()
+    assert wait_for(lambda: len(events) == 1)
+    late_exit(old.returncode)
+
+    assert len(events) == 1
+    assert events[0].expected
+    assert proc.is_running()
+    assert not proc.wait_for_exit(timeout=0.2)
+
+
+# ---------------------------------------------------------------------------
+# Resource sampling tests
+# ---------------------------------------------------------------------------
+
+
+def test_resources_cover_process_tree() -> None:
+    """
+    Verifies that resources():
+    - aggregates the parent and its children
+    - reports memory for the whole tree
+    - returns an empty snapshot once the process is gone
+    """
+    proc = ManagedProcess(parent_with_child_process())
+    proc.start()
+
+    try:
+        pid = proc.pid()
+        assert pid is not None
+        assert wait_for_child_process(pid)
+
+        snapshot = proc.resources()
+        assert snapshot.process_count == 2
+        assert snapshot.rss_bytes > 0
+        assert snapshot.memory_percent > 0.0
+        assert snapshot.num_threads >= 2
+    finally:
+        proc.kill()
+
+    assert proc.resources().process_count == 0
+
+
 # ---------------------------------------------------------------------------
 # I/O stream tests
 # ---------------------------------------------------------------------------
@@ -189,3 +303,95 @@ def test_pipes_close_after_kill() -> None:
     # Once killed, the pipes should be closed or EOF
     assert stdout.closed or stdout.read() == ""
     assert stderr.closed or stderr.read() == ""
+
+
+# ---------------------------------------------------------------------------
+# Output draining tests
+# ---------------------------------------------------------------------------
+
+
+def test_drained_output_is_buffered_and_bounded() -> None:
+    """
+    Verifies that with an output buffer:
+    - a process writing more than a pipe buffer never blocks
+    - only the most recent lines are retained
+    - raw pipes are no longer handed out
+    """
+    output = ProcessOutput(max_lines=100)
+    proc = ManagedProcess(chatty_python_process(), output=output)
+    proc.start()
+
+    try:
+        assert wait_for(lambda: any(line.text == "done" for line in proc.tail(1)))
+        lines = proc.tail(1000)
+        assert len(lines) == 100
+        assert lines[-2].text.startswith("line 19999")
+        assert proc.stdout() is None
+        assert proc.stderr() is None
+    finally:
+        proc.kill()
+
+
+def test_subscribers_receive_tagged_lines() -> None:
+    """
+    Verifies that subscribers see lines from both streams
+    and stop receiving after unsubscribing.
+    """
+    received: list[OutputLine] = []
+    proc = ManagedProcess(stdout_stderr_emitter(), output=ProcessOutput())
+    unsubscribe = proc.subscribe(received.append)
+    proc.start()
+
+    try:
+        assert wait_for(lambda: len(received) == 2)
+        assert {(line.stream, line.text) for line in received} == {
+            ("stdout", "hello stdout"),
+            ("stderr", "hello stderr"),
+        }
+        unsubscribe()
+    finally:
+        proc.kill()
+
+
+def test_exit_is_reported_after_output() -> None:
+    """
+    Verifies that exit callbacks fire only once the output written before
+    the exit has been drained, even when subscribers are slow.
+    """
+    seen: list[OutputLine] = []
+    at_exit: list[int] = []
+    proc = ManagedProcess(
+        (PYTHON, "-c", "for i in range(200): print(i)"), output=ProcessOutput()
+    )
+    proc.subscribe(lambda line: (time.sleep(0.001), seen.append(line)))
+    proc.on_exit(lambda _: at_exit.append(len(seen)))
+    proc.start()
+
+    assert wait_for(lambda: len(at_exit) == 1)
+    assert at_exit == [200]
+
+
+def test_log_file_is_closed_when_process_stops(tmp_path: Path) -> None:
+    """
+    Verifies that the output log file:
+    - is closed once the process is terminated
+    - is reopened and appended to when the process is started again
+    """
+
+    def log_is_open() -> bool:
+        return any(f.path == str(log_file) for f in psutil.Process().open_files())
+
+    log_file = tmp_path / "server.log"
+    output = ProcessOutput(log_file=log_file)
+    proc = ManagedProcess(stdout_stderr_emitter(), output=output)
+    try:
+        for run in range(1, 3):
+            proc.start()
+            assert wait_for(lambda: len(output.tail()) == 2 * run)  # noqa: B023
+            assert log_is_open()
+            proc.terminate()
+            assert not log_is_open()
+    finally:
+        proc.kill()
+
+    assert log_file.read_text().count("hello stdout") == 2
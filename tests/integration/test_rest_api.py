@@ -0,0 +1,133 @@
+import asyncio
+import threading
+import time
+from collections.abc import Callable, Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+import pytest
+
+from server_runner.steam.api.auth_info import PasswordAuth
+from server_runner.steam.api.circuit_breaker import BreakerState, CircuitBreaker
+from server_runner.steam.api.games.async_rest_api import AsyncRESTSteamServerAPI
+from server_runner.steam.api.games.base_rest_api import HealthTier
+from server_runner.steam.api.games.palworld_api import PalWorldAPI
+from server_runner.steam.managed_game_server import ManagedGameServer, ServerState
+
+
+class InfoHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    connections = 0
+    requests = 0
+
+    def setup(self) -> None:
+        super().setup()
+        type(self).connections += 1
+
+    def do_GET(self) -> None:  # noqa: N802
+        type(self).requests += 1
+        body = b'{"version": "v0.1", "servername": "test"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def server() -> Iterator[ThreadingHTTPServer]:
+    InfoHandler.connections = 0
+    InfoHandler.requests = 0
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), InfoHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class HungHandler(InfoHandler):
+    def do_GET(self) -> None:  # noqa: N802
+        time.sleep(0.5)
+
+
+def make_api(server: ThreadingHTTPServer, **kwargs: Any) -> PalWorldAPI:
+    host, port = server.server_address[:2]
+    return PalWorldAPI(
+        base_url=f"http://{host!s}:{port}",
+        auth_info=PasswordAuth(username="admin", password="secret"),  # noqa: S106
+        **kwargs,
+    )
+
+
+class RunningProcess:
+    def is_running(self) -> bool:
+        return True
+
+    def on_exit(self, callback: Callable[..., None]) -> None:
+        pass
+
+
+def test_http_probes_reuse_one_pooled_connection(server: ThreadingHTTPServer) -> None:
+    api = make_api(server)
+    for _ in range(3):
+        api.probe(HealthTier.PROBE)
+    api.close()
+
+    assert InfoHandler.connections == 1
+
+
+def test_hung_server_opens_the_breaker() -> None:
+    """
+    Verifies that when TCP connects succeed but HTTP times out:
+    - the successful connects do not reset the failure count
+    - the breaker opens after failure_threshold health checks
+    - the next health check is skipped as circuit open
+    """
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), HungHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    breaker = CircuitBreaker(failure_threshold=2, jitter=0)
+    api = make_api(httpd, probe_timeout=0.1, breaker=breaker)
+    try:
+        for _ in range(2):
+            result = api.health()
+            assert result.failed_tier is HealthTier.PROBE
+        assert breaker.state is BreakerState.OPEN
+
+        result = api.health()
+        assert result.circuit_open
+        assert result.failed_tier is HealthTier.CONNECT
+    finally:
+        api.close()
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def test_async_state_shares_the_state_cache(server: ThreadingHTTPServer) -> None:
+    """
+    Verifies that ManagedGameServer.state_async():
+    - probes through AsyncRESTSteamServerAPI and reports RUNNING
+    - shares one probe between concurrent callers and with state()
+    - probes again when fresh=True
+    """
+    api = make_api(server)
+    process: Any = RunningProcess()
+    managed = ManagedGameServer(
+        process, api, wait=process, async_api=AsyncRESTSteamServerAPI(api)
+    )
+
+    async def probe() -> list[ServerState]:
+        states = await asyncio.gather(*(managed.state_async() for _ in range(3)))
+        assert InfoHandler.requests == 1
+        states.append(await managed.state_async(fresh=True))
+        return states
+
+    try:
+        assert asyncio.run(probe()) == [ServerState.RUNNING] * 4
+        assert managed.state() is ServerState.RUNNING
+        assert InfoHandler.requests == 2
+    finally:
+        api.close()
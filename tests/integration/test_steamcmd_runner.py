@@ -0,0 +1,124 @@
+import asyncio
+import threading
+from pathlib import Path
+
+from server_runner.steam.server.steamcmd import (
+    AsyncSteamCmdRunner,
+    SteamCmdPhase,
+    SteamCmdProgress,
+    SteamCmdRunner,
+)
+from server_runner.utils.cancellation import CancellationToken
+from tests.integration.helpers import fake_steamcmd
+
+UPDATE_SCRIPT = """
+print("Connecting anonymously to Steam Public...OK", flush=True)
+print("Waiting for user info...OK", flush=True)
+for pct, done in ((12.5, 125), (50.0, 500), (100.0, 1000)):
+    print(
+        f" Update state (0x61) downloading, progress: {pct:.2f} ({done} / 1000)",
+        flush=True,
+    )
+print("Success! App '2394010' fully installed.", flush=True)
+"""
+
+HANGING_SCRIPT = """
+print("Connecting anonymously to Steam Public...OK", flush=True)
+time.sleep(60)
+"""
+
+
+def test_progress_lines_are_streamed(tmp_path: Path) -> None:
+    """
+    Verifies that the runner:
+    - parses progress lines into structured events as they arrive
+    - reports success from the exit code and output
+    """
+    events: list[SteamCmdProgress] = []
+    runner = SteamCmdRunner(fake_steamcmd(tmp_path, UPDATE_SCRIPT))
+
+    result = runner.run(["+quit"], on_progress=events.append)
+
+    assert result.ok
+    assert [e.percent for e in events] == [12.5, 50.0, 100.0]
+    assert events[0].state == "downloading"
+    assert events[0].state_code == 0x61
+    assert events[-1].total_bytes == 1000
+
+
+def test_phase_timeout_stops_steamcmd(tmp_path: Path) -> None:
+    runner = SteamCmdRunner(
+        fake_steamcmd(tmp_path, HANGING_SCRIPT),
+        phase_timeouts={SteamCmdPhase.LOGIN: 0.5},
+    )
+
+    result = runner.run(["+quit"])
+
+    assert not result.ok
+    assert result.timed_out is SteamCmdPhase.LOGIN
+
+
+def test_cancellation_stops_steamcmd(tmp_path: Path) -> None:
+    token = CancellationToken()
+    runner = SteamCmdRunner(fake_steamcmd(tmp_path, HANGING_SCRIPT), cancel_token=token)
+
+    threading.Timer(0.5, token.cancel).start()
+    result = runner.run(["+quit"])
+
+    assert result.cancelled
+    assert not result.ok
+
+
+def test_run_token_stops_only_that_run(tmp_path: Path) -> None:
+    """
+    Verifies that a per-run token (e.g. a preempted job's):
+    - stops the steamcmd run it was passed to
+    - leaves the runner usable for later runs
+    """
+    job_token = CancellationToken()
+    runner = SteamCmdRunner(fake_steamcmd(tmp_path, HANGING_SCRIPT))
+
+    threading.Timer(0.5, job_token.cancel, args=("preempted",)).start()
+    result = runner.run(["+quit"], cancel_token=job_token)
+
+    assert result.cancelled
+    assert not runner.cancel_token.cancelled
+
+    runner.steamcmd_path = fake_steamcmd(tmp_path, UPDATE_SCRIPT)
+    assert runner.run(["+quit"]).ok
+
+
+def test_async_runner_streams_progress_on_the_loop(tmp_path: Path) -> None:
+    """
+    Verifies that the asyncio runner:
+    - streams progress like the threaded runner without pump threads
+    - serves blocking run() calls from worker threads via the loop
+    """
+    events: list[SteamCmdProgress] = []
+
+    async def scenario() -> bool:
+        runner = AsyncSteamCmdRunner(
+            fake_steamcmd(tmp_path, UPDATE_SCRIPT), loop=asyncio.get_running_loop()
+        )
+        result = await runner.run_async(["+quit"], on_progress=events.append)
+        blocking = await asyncio.to_thread(runner.run, ["+quit"])
+        return result.ok and blocking.ok
+
+    assert asyncio.run(scenario())
+    assert [e.percent for e in events] == [12.5, 50.0, 100.0]
+
+
+def test_async_runner_cancellation(tmp_path: Path) -> None:
+    token = CancellationToken()
+
+    async def scenario() -> bool:
+        runner = AsyncSteamCmdRunner(
+            fake_steamcmd(tmp_path, HANGING_SCRIPT),
+            loop=asyncio.get_running_loop(),
+            cancel_token=token,
+        )
+        threading.Timer(0.5, token.cancel).start()
+        async with asyncio.timeout(5):
+            return (await runner.run_async(["+quit"])).cancelled
+
+    assert asyncio.run(scenario())
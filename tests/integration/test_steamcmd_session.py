@@ -0,0 +1,110 @@
+import threading
+import time
+from pathlib import Path
+
+from server_runner.steam.server.steamcmd import SteamCmdProgress
+from server_runner.steam.server.steamcmd_session import SteamCmdSession
+from server_runner.utils.cancellation import CancellationToken
+from tests.integration.helpers import fake_steamcmd
+
+# Interactive stand-in: logs in once, then answers commands from stdin.
+# The prompt is written without a newline, like the real console.
+CONSOLE_SCRIPT = """
+import os
+
+def prompt():
+    sys.stdout.write("\\x1b[1m\\nSteam>\\x1b[0m")
+    sys.stdout.flush()
+
+print(f"pid {os.getpid()}", flush=True)
+print("Waiting for user info...OK", flush=True)
+prompt()
+for line in sys.stdin:
+    command, *args = line.split()
+    if command == "quit":
+        break
+    if command == "app_status":
+        print(f"AppID {args[0]}:", flush=True)
+        print(" - install state: Fully Installed,", flush=True)
+        print(" - size on disk: 1000 bytes, BuildID 12345", flush=True)
+    elif command == "app_update":
+        print(
+            " Update state (0x61) downloading, progress: 50.00 (500 / 1000)",
+            flush=True,
+        )
+        print(f"Success! App '{args[0]}' fully installed.", flush=True)
+    elif command == "die":
+        sys.exit(1)
+    elif command == "hang":
+        time.sleep(60)
+    prompt()
+"""
+
+
+def test_commands_share_one_logged_in_process(tmp_path: Path) -> None:
+    """
+    Verifies that the session:
+    - splits responses on the prompt, which has no trailing newline
+    - runs repeated commands in the same steamcmd process
+    - forwards parsed progress lines
+    """
+    session = SteamCmdSession(fake_steamcmd(tmp_path, CONSOLE_SCRIPT))
+    events: list[SteamCmdProgress] = []
+    try:
+        first = session.execute("app_status 2394010", timeout=10)
+        pid = session.pid
+        second = session.execute(
+            "app_update 2394010 validate", timeout=10, on_progress=events.append
+        )
+
+        assert first.ok and second.ok
+        assert any("BuildID 12345" in line for line in first.output)
+        assert not any("Success!" in line for line in first.output)
+        assert any("Success!" in line for line in second.output)
+        assert [e.percent for e in events] == [50.0]
+        assert pid is not None and session.pid == pid
+    finally:
+        session.close()
+
+
+def test_dead_session_is_restarted(tmp_path: Path) -> None:
+    session = SteamCmdSession(fake_steamcmd(tmp_path, CONSOLE_SCRIPT))
+    try:
+        assert not session.execute("die", timeout=10).ok
+        assert not session.is_alive()
+
+        assert session.execute("app_status 2394010", timeout=10).ok
+        assert session.is_alive()
+    finally:
+        session.close()
+
+
+def test_cancel_during_command_stops_the_session(tmp_path: Path) -> None:
+    """
+    Verifies that cancelling the session's token while a command runs:
+    - does not block the canceller on the running command
+    - ends the command as cancelled and stops the process
+    """
+    token = CancellationToken()
+    session = SteamCmdSession(
+        fake_steamcmd(tmp_path, CONSOLE_SCRIPT), cancel_token=token
+    )
+    cancel_took: list[float] = []
+
+    def cancel() -> None:
+        started = time.monotonic()
+        token.cancel()
+        cancel_took.append(time.monotonic() - started)
+
+    try:
+        assert session.execute("app_status 2394010", timeout=10).ok
+        timer = threading.Timer(0.5, cancel)
+        timer.start()
+        result = session.execute("hang", timeout=30)
+        timer.join()
+
+        assert result.cancelled
+        assert cancel_took[0] < 0.5
+        assert not session.is_alive()
+    finally:
+        session.close()
@@ -0,0 +1,39 @@
+import shutil
+from pathlib import Path
+
+from server_runner.steam.server.app_manifest import AppManifestReader, StateFlags
+
+DATA_DIR = Path(__file__).parents[2] / "data"
+MANIFEST = DATA_DIR / "appmanifest_2394010.acf"
+
+
+def test_app_state_is_typed() -> None:
+    state = AppManifestReader(MANIFEST).read()
+
+    assert state.app_id == 2394010
+    assert state.installdir == "PalServer"
+    assert state.buildid == 17082920
+    assert state.state_flags is StateFlags.FULLY_INSTALLED
+    assert state.fully_installed
+    assert state.installed_depots["2394012"].manifest == "2423583208459052375"
+    assert state.installed_depots["1006"].size == 78382436
+
+
+def test_manifest_is_parsed_once_until_it_changes(tmp_path: Path) -> None:
+    """
+    Verifies that the reader:
+    - returns the cached record while the file is unchanged
+    - re-parses after the file is rewritten
+    """
+    manifest = tmp_path / MANIFEST.name
+    shutil.copy(MANIFEST, manifest)
+    reader = AppManifestReader(manifest)
+
+    first = reader.read()
+    assert reader.read() is first
+
+    manifest.write_text(
+        manifest.read_text().replace('"17082920"', '"17082921"'), encoding="utf-8"
+    )
+
+    assert reader.build_id() == 17082921
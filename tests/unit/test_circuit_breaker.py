@@ -0,0 +1,67 @@
+from server_runner.steam.api.circuit_breaker import BreakerState, CircuitBreaker
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_opens_after_threshold_and_rejects_calls() -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker(
+        failure_threshold=2, base_backoff=10, jitter=0, clock=clock
+    )
+
+    breaker.record_failure()
+    assert breaker.state is BreakerState.CLOSED
+    breaker.record_failure()
+
+    assert breaker.state is BreakerState.OPEN
+    assert not breaker.allow()
+    assert breaker.retry_in() == 10
+
+
+def test_half_open_allows_single_trial() -> None:
+    """
+    Verifies that once the backoff expires exactly one trial call
+    is allowed, and its outcome closes or re-opens the breaker.
+    """
+    clock = FakeClock()
+    breaker = CircuitBreaker(
+        failure_threshold=1, base_backoff=10, jitter=0, clock=clock
+    )
+    breaker.record_failure()
+
+    clock.now = 10
+    assert breaker.allow()
+    assert breaker.state is BreakerState.HALF_OPEN
+    assert not breaker.allow()
+
+    # Failed trial doubles the backoff
+    breaker.record_failure()
+    assert breaker.state is BreakerState.OPEN
+    assert breaker.retry_in() == 20
+
+    clock.now = 30
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state is BreakerState.CLOSED
+    assert breaker.allow()
+
+
+def test_passes_does_not_claim_the_trial() -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker(
+        failure_threshold=1, base_backoff=10, jitter=0, clock=clock
+    )
+    breaker.record_failure()
+    assert not breaker.passes()
+
+    clock.now = 10
+    assert breaker.passes()
+    assert breaker.state is BreakerState.OPEN
+    assert breaker.allow()
+    assert not breaker.passes()
@@ -0,0 +1,77 @@
+import asyncio
+import threading
+import time
+
+from server_runner.utils.coalescing_cache import CoalescingCache
+
+
+def test_concurrent_callers_share_one_load() -> None:
+    """
+    Verifies that callers arriving while a load is in flight
+    wait for it instead of invoking the loader themselves.
+    """
+    calls = 0
+
+    def loader() -> int:
+        nonlocal calls
+        calls += 1
+        time.sleep(0.2)
+        return calls
+
+    cache = CoalescingCache(loader, ttl=60.0)
+    results: list[int] = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get())) for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert calls == 1
+    assert results == [1] * 8
+
+
+def test_ttl_fresh_and_invalidate() -> None:
+    """
+    Verifies that values are reused within the TTL and reloaded
+    when fresh=True is requested or the cache is invalidated.
+    """
+    counter = iter(range(100))
+    cache = CoalescingCache(lambda: next(counter), ttl=60.0)
+
+    assert cache.get() == 0
+    assert cache.get() == 0
+    assert cache.get(fresh=True) == 1
+
+    cache.invalidate()
+    assert cache.get() == 2
+
+
+def test_async_callers_share_the_cache() -> None:
+    """
+    Verifies that get_async():
+    - shares one in-flight load between concurrent coroutines
+    - stores the value for get() and honours invalidate()
+    """
+    calls = 0
+
+    async def load() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return calls
+
+    def sync_loader() -> int:
+        raise AssertionError("get() should be served from the cache")
+
+    cache = CoalescingCache(sync_loader, ttl=60.0)
+
+    async def main() -> list[int]:
+        return list(await asyncio.gather(*(cache.get_async(load) for _ in range(5))))
+
+    assert asyncio.run(main()) == [1] * 5
+    assert cache.get() == 1
+
+    cache.invalidate()
+    assert asyncio.run(cache.get_async(load)) == 2
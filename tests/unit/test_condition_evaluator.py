@@ -0,0 +1,66 @@
+import threading
+from collections.abc import Iterator
+
+import pytest
+
+from server_runner.utils.condition_evaluator import ConditionEvaluator
+from server_runner.utils.timer_scheduler import TimerScheduler
+
+
+@pytest.fixture
+def scheduler() -> Iterator[TimerScheduler]:
+    scheduler = TimerScheduler(max_sleep=0.05)
+    scheduler.start()
+    yield scheduler
+    scheduler.stop(timeout=1)
+
+
+def test_true_result_runs_on_scheduler_thread(scheduler: TimerScheduler) -> None:
+    evaluator = ConditionEvaluator(scheduler)
+    ran_on: list[str] = []
+    done = threading.Event()
+
+    def on_true() -> None:
+        ran_on.append(threading.current_thread().name)
+        done.set()
+
+    assert evaluator.submit("check", lambda: True, on_true)
+    assert done.wait(2)
+    assert ran_on == ["SchedulerThread"]
+    evaluator.shutdown()
+
+
+def test_condition_is_single_flight(scheduler: TimerScheduler) -> None:
+    """
+    Verifies that a second evaluation of the same condition is skipped
+    while the first is running, and allowed again once it finished.
+    """
+    evaluator = ConditionEvaluator(scheduler)
+    release = threading.Event()
+    done = threading.Event()
+
+    assert evaluator.submit("update", lambda: release.wait(2), done.set)
+    assert not evaluator.submit("update", lambda: True, done.set)
+    assert evaluator.submit("start", lambda: False, done.set)
+
+    release.set()
+    assert done.wait(2)
+    assert evaluator.submit("update", lambda: False, done.set)
+    evaluator.shutdown()
+
+
+def test_late_result_is_discarded(scheduler: TimerScheduler) -> None:
+    evaluator = ConditionEvaluator(scheduler)
+    finished = threading.Event()
+    triggered = threading.Event()
+
+    def slow() -> bool:
+        threading.Event().wait(0.3)
+        finished.set()
+        return True
+
+    evaluator.submit("slow", slow, triggered.set, deadline=0.1)
+
+    assert finished.wait(2)
+    assert not triggered.wait(0.3)
+    evaluator.shutdown()
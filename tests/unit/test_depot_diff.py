@@ -0,0 +1,73 @@
+import copy
+import json
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from server_runner.steam.server.app_manifest import AppManifestReader, InstalledDepot
+from server_runner.steam.server.depot_diff import (
+    MIN_COUNTDOWN_MINUTES,
+    UpdatePlan,
+    diff_depots,
+    estimate_downtime,
+)
+
+DATA_DIR = Path(__file__).parents[2] / "data"
+APP_ID = "2394010"
+
+
+@pytest.fixture
+def appinfo() -> dict[str, Any]:
+    with open(DATA_DIR / "appinfo" / APP_ID, encoding="utf-8") as f:
+        return json.load(f)["data"][APP_ID]
+
+
+@pytest.fixture
+def installed_depots() -> Mapping[str, InstalledDepot]:
+    reader = AppManifestReader(DATA_DIR / f"appmanifest_{APP_ID}.acf")
+    return reader.read().installed_depots
+
+
+def test_matching_install_has_no_changes(
+    appinfo: dict[str, Any], installed_depots: Mapping[str, InstalledDepot]
+) -> None:
+    diff = diff_depots(appinfo, installed_depots, os_name="linux")
+
+    assert not diff.has_changes
+    assert estimate_downtime(diff) == 0.0
+
+
+def test_changed_linux_depot_is_reported(
+    appinfo: dict[str, Any], installed_depots: Mapping[str, InstalledDepot]
+) -> None:
+    """
+    Verifies that only depots for the requested OS are compared and
+    that the changed depot carries its manifest GIDs and sizes.
+    """
+    latest = copy.deepcopy(appinfo)
+    latest["depots"]["2394012"]["manifests"]["public"]["gid"] = "1"
+    latest["depots"]["2394011"]["manifests"]["public"]["gid"] = "2"  # windows
+
+    diff = diff_depots(latest, installed_depots, os_name="linux")
+
+    assert [c.depot_id for c in diff.changes] == ["2394012"]
+    change = diff.changes[0]
+    assert change.installed_manifest == "2423583208459052375"
+    assert change.latest_manifest == "1"
+    assert diff.download_bytes == 3043707696
+
+
+def test_fresh_install_downloads_every_os_depot(appinfo: dict[str, Any]) -> None:
+    diff = diff_depots(appinfo, {}, os_name="linux")
+
+    assert {c.depot_id for c in diff.changes} == {"1006", "2394012"}
+
+
+def test_countdown_scales_with_downtime(appinfo: dict[str, Any]) -> None:
+    small = UpdatePlan(1, 2, diff_depots(appinfo, {}, os_name="macos"), 30.0)
+    large = UpdatePlan(1, 2, diff_depots(appinfo, {}, os_name="linux"), 1800.0)
+
+    assert small.countdown_minutes == MIN_COUNTDOWN_MINUTES
+    assert large.countdown_minutes > small.countdown_minutes
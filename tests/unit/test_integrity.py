@@ -0,0 +1,77 @@
+import os
+from pathlib import Path
+
+from server_runner.utils.integrity import IntegrityChecker, hash_file
+
+
+def make_install(root: Path) -> None:
+    (root / "Pal" / "Binaries").mkdir(parents=True)
+    (root / "Pal" / "Saved").mkdir()
+    (root / "Pal" / "Binaries" / "server").write_bytes(b"\x7fELF" + b"x" * 4096)
+    (root / "Pal" / "Saved" / "world.sav").write_bytes(b"save")
+    (root / "empty.txt").write_bytes(b"")
+
+
+def checker(root: Path, tmp_path: Path) -> IntegrityChecker:
+    return IntegrityChecker(
+        root, tmp_path / "index.json", exclude=["*/Saved/*"], workers=2
+    )
+
+
+def test_unchanged_tree_is_checked_by_stat_only(tmp_path: Path) -> None:
+    """
+    Verifies that the checker:
+    - hashes every file once when building the index
+    - trusts files whose size and mtime are unchanged, after a reload
+    - skips excluded runtime files
+    """
+    root = tmp_path / "game"
+    make_install(root)
+    assert checker(root, tmp_path).refresh() == 2
+
+    report = checker(root, tmp_path).verify()
+
+    assert report.intact
+    assert report.checked == 2
+    assert report.rehashed == 0
+
+
+def test_modified_and_missing_files_are_reported(tmp_path: Path) -> None:
+    root = tmp_path / "game"
+    make_install(root)
+    index = checker(root, tmp_path)
+    index.refresh()
+
+    (root / "Pal" / "Binaries" / "server").write_bytes(b"corrupt")
+    (root / "empty.txt").unlink()
+    (root / "Pal" / "Saved" / "world.sav").write_bytes(b"new save")
+
+    report = index.verify()
+
+    assert not report.intact
+    assert report.modified == ["Pal/Binaries/server"]
+    assert report.missing == ["empty.txt"]
+
+
+def test_touched_but_identical_file_is_intact(tmp_path: Path) -> None:
+    root = tmp_path / "game"
+    make_install(root)
+    index = checker(root, tmp_path)
+    index.refresh()
+
+    server = root / "Pal" / "Binaries" / "server"
+    st = server.stat()
+    os.utime(server, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    first = index.verify()
+    second = index.verify()
+
+    assert first.intact and first.rehashed == 1
+    assert second.rehashed == 0
+
+
+def test_hash_file_matches_for_equal_content(tmp_path: Path) -> None:
+    a, b = tmp_path / "a", tmp_path / "b"
+    a.write_bytes(b"same" * 1000)
+    b.write_bytes(b"same" * 1000)
+    assert hash_file(a) == hash_file(b)
@@ -0,0 +1,99 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from server_runner.steam.server import library_folders
+from server_runner.steam.server.library_folders import LibraryIndex, SteamLibrary
+
+LIBRARY_FOLDERS = """
+"libraryfolders"
+{{
+    "0"
+    {{
+        "path"      "{root}"
+        "label"     ""
+        "apps"
+        {{
+            "228980"    "123"
+        }}
+    }}
+    "1"
+    {{
+        "path"      "{nvme}"
+        "label"     "nvme"
+        "apps"
+        {{
+            "2394010"   "3606060979"
+        }}
+    }}
+}}
+"""
+
+
+@pytest.fixture
+def steam_root(tmp_path: Path) -> Path:
+    root, nvme = tmp_path / "steam", tmp_path / "nvme"
+    for library in (root, nvme):
+        (library / "steamapps").mkdir(parents=True)
+    (root / "steamapps" / "libraryfolders.vdf").write_text(
+        LIBRARY_FOLDERS.format(root=root, nvme=nvme), encoding="utf-8"
+    )
+    return root
+
+
+def test_app_is_found_in_its_library(steam_root: Path, tmp_path: Path) -> None:
+    index = LibraryIndex(steam_root)
+
+    library = index.library_for(2394010)
+
+    assert library is not None
+    assert library.path == tmp_path / "nvme"
+    assert library.label == "nvme"
+    assert index.library_for(228980) == index.libraries()[0]
+
+
+def test_unlisted_app_is_found_by_manifest(steam_root: Path, tmp_path: Path) -> None:
+    (tmp_path / "nvme" / "steamapps" / "appmanifest_896660.acf").touch()
+
+    library = LibraryIndex(steam_root).library_for(896660)
+
+    assert library is not None and library.path == tmp_path / "nvme"
+
+
+def test_index_is_rebuilt_when_file_changes(steam_root: Path) -> None:
+    """
+    Verifies that the index:
+    - is reused while libraryfolders.vdf is unchanged
+    - is rebuilt once the file changes
+    """
+    index = LibraryIndex(steam_root)
+    first = index.libraries()
+    assert index.libraries() is first
+
+    vdf_path = steam_root / "steamapps" / "libraryfolders.vdf"
+    vdf_path.write_text(vdf_path.read_text().replace("2394010", "2394011"))
+    st = vdf_path.stat()
+    os.utime(vdf_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    assert index.library_for(2394010) is None
+    assert index.library_for(2394011) is not None
+
+
+def test_missing_file_falls_back_to_steam_root(tmp_path: Path) -> None:
+    assert LibraryIndex(tmp_path).libraries() == (SteamLibrary(tmp_path, "", {}),)
+
+
+def test_install_prefers_fast_library_with_space(
+    steam_root: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    nvme = tmp_path / "nvme"
+    free = {steam_root: 500, nvme: 200}
+    monkeypatch.setattr(library_folders, "free_bytes", free.__getitem__)
+    monkeypatch.setattr(
+        library_folders, "is_rotational", lambda path: path == steam_root
+    )
+    index = LibraryIndex(steam_root)
+
+    assert index.select_for_install(100).path == nvme
+    assert index.select_for_install(300).path == steam_root
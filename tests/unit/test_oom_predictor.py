@@ -0,0 +1,118 @@
+import dataclasses
+import time
+from collections.abc import Callable
+from typing import Any
+
+from server_runner.steam.managed_game_server import (
+    OOM_COUNTDOWN_MINUTES,
+    PREDICTED_OOM_COUNTDOWN_MINUTES,
+    ManagedGameServer,
+)
+from server_runner.steam.oom_predictor import OOMPredictor, fit_trend
+from server_runner.utils.resource_sampler import ResourceSnapshot
+from server_runner.utils.timeseries import Point, TimeSeriesStore
+
+HOUR = 3600.0
+
+
+def leaking_history(
+    now: float, percent_per_hour: float, players: float, minutes: int = 60
+) -> TimeSeriesStore:
+    """A store with memory rising linearly to 60% at now."""
+    store = TimeSeriesStore(["memory_percent", "players"])
+    for minute in range(minutes, -1, -1):
+        ts = now - minute * 60
+        memory = 60.0 - percent_per_hour * minute / 60
+        store.record({"memory_percent": memory, "players": players}, ts)
+    return store
+
+
+def test_fit_trend_recovers_a_line() -> None:
+    points = [Point(1000.0 + 60 * i, 10.0 + 0.5 * i, 0, 0, 1) for i in range(10)]
+    trend = fit_trend(points)
+
+    assert trend is not None
+    assert abs(trend.slope - 0.5 / 60) < 1e-9
+    assert abs(trend.r_squared - 1.0) < 1e-9
+    assert fit_trend(points[:1]) is None
+
+
+def test_steady_leak_restarts_early_only_when_quiet() -> None:
+    """
+    Verifies that with memory growing 10%/h from 60% towards 80%:
+    - the forecast puts the threshold about two hours out
+    - a restart is due while the server is empty
+    - no restart is due while it is busy and the threshold is not close
+    """
+    now = time.time()
+    quiet = OOMPredictor(leaking_history(now, 10.0, players=0))
+
+    forecast = quiet.restart_due(None, now)
+    assert forecast is not None
+    assert forecast.time_to_threshold is not None
+    assert abs(forecast.time_to_threshold - 2 * HOUR) < 5 * 60
+
+    busy = OOMPredictor(leaking_history(now, 10.0, players=20))
+    assert busy.restart_due(None, now) is None
+
+
+def test_imminent_threshold_restarts_regardless_of_players() -> None:
+    now = time.time()
+    # 60% -> 80% in 20 minutes
+    predictor = OOMPredictor(leaking_history(now, 60.0, players=20))
+
+    forecast = predictor.restart_due(None, now)
+    assert forecast is not None
+    assert forecast.time_to_threshold is not None
+    assert forecast.time_to_threshold < predictor.urgent_lead
+
+
+def test_flat_or_short_history_gives_no_forecast() -> None:
+    """
+    Verifies that no restart is predicted when:
+    - memory is not growing
+    - too little history exists since the server started
+    """
+    now = time.time()
+    flat = OOMPredictor(leaking_history(now, 0.0, players=0))
+    assert flat.restart_due(None, now) is None
+
+    leaking = OOMPredictor(leaking_history(now, 10.0, players=0))
+    assert leaking.forecast(started_at=now - 15 * 60, now=now) is None
+
+
+class FakeProcess:
+    def __init__(self) -> None:
+        self.memory_percent = 60.0
+
+    def on_exit(self, callback: Callable[..., None]) -> None:
+        pass
+
+    def resources(self) -> ResourceSnapshot:
+        return dataclasses.replace(
+            ResourceSnapshot.empty(), memory_percent=self.memory_percent
+        )
+
+
+def test_oom_countdown_is_latched_when_the_job_is_enqueued() -> None:
+    """
+    Verifies that the OOM countdown:
+    - is the longer one when the check that enqueued the job was a forecast
+    - is not changed by later checks until one enqueues the job again
+    - is the short one when the server was already over the threshold
+    """
+    process = FakeProcess()
+    history = leaking_history(time.time(), 10.0, players=0)
+    fake: Any = process
+    server = ManagedGameServer(fake, api=fake, wait=fake, history=history)
+    assert server.oom_countdown_minutes() == OOM_COUNTDOWN_MINUTES
+
+    assert server.oom_restart_due()
+    server.latch_oom_countdown()
+    assert server.oom_countdown_minutes() == PREDICTED_OOM_COUNTDOWN_MINUTES
+
+    process.memory_percent = 90.0
+    assert server.oom_restart_due()
+    assert server.oom_countdown_minutes() == PREDICTED_OOM_COUNTDOWN_MINUTES
+    server.latch_oom_countdown()
+    assert server.oom_countdown_minutes() == OOM_COUNTDOWN_MINUTES
@@ -0,0 +1,129 @@
+import asyncio
+import threading
+from typing import Any
+
+from server_runner.utils.cancellation import CancellationToken
+from server_runner.workflow.tasks import (
+    CountdownTracker,
+    Task,
+    TaskCountdown,
+    TaskResult,
+)
+from server_runner.workflow.workflow_job import WorkflowJob
+
+
+class FakeServer:
+    def __init__(self) -> None:
+        self.announcements: list[str] = []
+
+    def announce(self, message: str) -> bool:
+        self.announcements.append(message)
+        return True
+
+    async def announce_async(self, message: str) -> bool:
+        return self.announce(message)
+
+
+class RecordingTask(Task):
+    def __init__(self, server: Any, ran: list[str]) -> None:
+        super().__init__(server)
+        self.ran = ran
+
+    def run(self, token: CancellationToken) -> TaskResult:
+        self.ran.append("stop")
+        return TaskResult(True)
+
+
+def run_in_thread(target: Any, *args: Any) -> threading.Thread:
+    thread = threading.Thread(target=target, args=args, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_countdown_is_interrupted_by_its_token() -> None:
+    server: Any = FakeServer()
+    countdown = TaskCountdown(server, "Restarting", delay_minutes=1)
+    token = CancellationToken()
+    results: list[TaskResult] = []
+
+    thread = run_in_thread(lambda: results.append(countdown.run(token)))
+    token.cancel("preempted by OOM")
+    thread.join(2)
+
+    assert not thread.is_alive()
+    assert not results[0].success
+
+
+def test_preempting_countdown_continues_the_earlier_one() -> None:
+    """
+    Verifies that a countdown started after an interrupted one:
+    - keeps the earlier, sooner deadline instead of its own longer delay
+    - does not repeat checkpoints that were already announced
+    """
+    server: Any = FakeServer()
+    tracker = CountdownTracker()
+    first = TaskCountdown(
+        server, "Restarting", delay_minutes=1, checkpoints=[60, 30], tracker=tracker
+    )
+    second = TaskCountdown(
+        server,
+        "Update incoming",
+        delay_minutes=15,
+        checkpoints=[600, 60, 30],
+        tracker=tracker,
+    )
+
+    token = CancellationToken()
+    thread = run_in_thread(first.run, token)
+    threading.Event().wait(0.1)
+    token.cancel("preempted")
+    thread.join(2)
+
+    token = CancellationToken()
+    thread = run_in_thread(second.run, token)
+    threading.Event().wait(0.1)
+    token.cancel("shutdown")
+    thread.join(2)
+
+    assert server.announcements == ["[Restarting] restarting in 1 minute"]
+
+
+def test_job_is_only_preemptible_before_it_commits() -> None:
+    server: Any = FakeServer()
+    ran: list[str] = []
+    job = WorkflowJob(1, "RESTART")
+    job.add_task(TaskCountdown(server, "Restarting", delay_minutes=1))
+    job.add_task(RecordingTask(server, ran))
+
+    results: list[bool] = []
+    thread = run_in_thread(lambda: results.append(job.run_all()))
+    threading.Event().wait(0.1)
+
+    assert job.preempt("preempted by START")
+    thread.join(2)
+    assert results == [False]
+    assert ran == []
+
+
+def test_async_job_is_preempted_from_another_thread() -> None:
+    """
+    Verifies that a job running on an event loop:
+    - announces from its countdown without leaving the loop
+    - stops at the countdown when preempted from another thread
+    """
+    server: Any = FakeServer()
+    ran: list[str] = []
+    job = WorkflowJob(1, "RESTART")
+    job.add_task(TaskCountdown(server, "Restarting", delay_minutes=1, checkpoints=[60]))
+    job.add_task(RecordingTask(server, ran))
+
+    async def scenario() -> bool:
+        running = asyncio.create_task(job.run_all_async())
+        await asyncio.sleep(0.1)
+        assert await asyncio.to_thread(job.preempt, "preempted by START")
+        async with asyncio.timeout(2):
+            return await running
+
+    assert asyncio.run(scenario()) is False
+    assert server.announcements == ["[Restarting] restarting in 1 minute"]
+    assert ran == []
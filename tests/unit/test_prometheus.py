@@ -0,0 +1,65 @@
+import urllib.error
+import urllib.request
+
+import pytest
+
+from server_runner.metrics.prometheus import MetricsExporter, PrometheusWriter
+from server_runner.utils.histogram import Histogram
+
+
+def test_writer_groups_samples_under_one_header() -> None:
+    """
+    Verifies that the writer:
+    - emits HELP/TYPE once per metric, with its samples grouped beneath
+    - escapes label values
+    - renders histograms as cumulative buckets with sum and count
+    """
+    histogram = Histogram([1, 10])
+    for value in (0.5, 5, 50):
+        histogram.observe(value)
+
+    writer = PrometheusWriter()
+    writer.gauge("server_state", 1, {"state": "RUNNING"}, help="State")
+    writer.counter("jobs", 3, {"job": 'say "hi"'})
+    writer.gauge("server_state", 0, {"state": "STOPPED"})
+    writer.histogram("task_duration_seconds", histogram, {"task": "TaskUpdate"})
+    text = writer.render().decode()
+
+    assert text.count("# TYPE server_runner_server_state gauge") == 1
+    lines = text.splitlines()
+    state = lines.index('server_runner_server_state{state="RUNNING"} 1')
+    assert lines[state + 1] == 'server_runner_server_state{state="STOPPED"} 0'
+    assert 'server_runner_jobs_total{job="say \\"hi\\""} 3' in lines
+    assert (
+        'server_runner_task_duration_seconds_bucket{task="TaskUpdate",le="10"} 2'
+        in lines
+    )
+    assert (
+        'server_runner_task_duration_seconds_bucket{task="TaskUpdate",le="+Inf"} 3'
+        in lines
+    )
+    assert 'server_runner_task_duration_seconds_count{task="TaskUpdate"} 3' in lines
+
+
+def test_exporter_serves_the_cached_payload() -> None:
+    calls: list[int] = []
+
+    def payload() -> bytes:
+        calls.append(1)
+        return b"server_runner_up 1\n"
+
+    exporter = MetricsExporter(payload, port=0)
+    exporter.start()
+    try:
+        url = f"http://127.0.0.1:{exporter.port}"
+        scrape = urllib.request.urlopen(f"{url}/metrics", timeout=2)  # noqa: S310
+        with scrape as response:
+            assert response.read() == b"server_runner_up 1\n"
+            assert response.headers["Content-Type"].startswith("text/plain")
+
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(f"{url}/other", timeout=2)  # noqa: S310
+    finally:
+        exporter.stop()
+
+    assert calls == [1]
@@ -0,0 +1,149 @@
+import os
+import shutil
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from server_runner.steam.server.staged_update import StagedUpdate
+
+DATA_DIR = Path(__file__).parents[2] / "data"
+MANIFEST = DATA_DIR / "appmanifest_2394010.acf"
+BUILD_ID = 17082920
+
+
+class FakeResolver:
+    STEAM_APPS_DIR = "steamapps"
+
+    def __init__(self, library: Path):
+        self.library = library
+
+    def get_game_dir(self) -> tuple[Path, str]:
+        return self.library / "steamapps" / "common" / "PalServer", "PalServer"
+
+    def get_manifest_path(self) -> Path:
+        return self.library / "steamapps" / "appmanifest_2394010.acf"
+
+
+class FakeLatest:
+    def __init__(self, build: int):
+        self.build = build
+
+    def latest_version(self) -> int:
+        return self.build
+
+
+class FakeVersionManager:
+    def __init__(self, latest: int):
+        self.latest = FakeLatest(latest)
+        self.updates = 0
+
+    def update(self, **_: Any) -> bool:
+        self.updates += 1
+        return True
+
+
+def make_install(tmp_path: Path, latest: int = BUILD_ID) -> StagedUpdate:
+    resolver: Any = FakeResolver(tmp_path)
+    manager: Any = FakeVersionManager(latest)
+    game_dir = resolver.get_game_dir()[0]
+    game_dir.mkdir(parents=True)
+    (game_dir / "server.bin").write_text("old")
+    shutil.copy2(MANIFEST, resolver.get_manifest_path())
+    return StagedUpdate(resolver, manager)
+
+
+def test_finished_staging_is_reused_for_the_same_build(tmp_path: Path) -> None:
+    """
+    Verifies that stage():
+    - keeps a completely staged tree whose build is the latest one
+    - downloads again once a newer build is published
+    """
+    staged = make_install(tmp_path)
+    manager: Any = staged.version_manager
+
+    assert staged.stage()
+    assert staged.staged_build() == BUILD_ID
+    assert staged.stage()
+    assert manager.updates == 1
+
+    manager.latest.build = BUILD_ID + 1
+    assert staged.stage()
+    assert manager.updates == 2
+
+
+def test_failed_swap_leaves_old_build_and_manifest(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """
+    Verifies that when moving the staged manifest into place fails:
+    - the OSError propagates
+    - the old build is live again and the staged build is kept
+    - the external manifest is unchanged
+    """
+    staged = make_install(tmp_path)
+    assert staged.stage()
+    (staged.staging_dir / "server.bin").unlink()
+    (staged.staging_dir / "server.bin").write_text("new")
+    manifest = staged.resolver.get_manifest_path()
+    before = manifest.read_bytes()
+
+    def failing_move(*_: Any) -> None:
+        raise OSError("disk full")
+
+    monkeypatch.setattr(shutil, "move", failing_move)
+    with pytest.raises(OSError, match="disk full"):
+        staged.swap()
+
+    assert (staged.game_dir / "server.bin").read_text() == "old"
+    assert staged.is_staged()
+    assert (staged.staging_dir / "server.bin").read_text() == "new"
+    assert manifest.read_bytes() == before
+    assert not staged.backup_dir.exists()
+
+
+def test_swap_then_rollback_restores_old_build(tmp_path: Path) -> None:
+    staged = make_install(tmp_path)
+    assert staged.stage()
+    (staged.staging_dir / "server.bin").unlink()
+    (staged.staging_dir / "server.bin").write_text("new")
+
+    staged.swap()
+    assert (staged.game_dir / "server.bin").read_text() == "new"
+    assert not (staged.game_dir / StagedUpdate.STAGED_MARKER).exists()
+
+    staged.rollback()
+    assert (staged.game_dir / "server.bin").read_text() == "old"
+    assert os.path.exists(staged.resolver.get_manifest_path())
+
+
+def test_saves_written_after_staging_survive_swap_and_rollback(tmp_path: Path) -> None:
+    """
+    Verifies that runtime files:
+    - are not linked into the staging tree
+    - written by the live server after stage() are live after swap()
+    - written by the new build are kept by rollback()
+    """
+    staged = make_install(tmp_path)
+    saved = staged.game_dir / "Pal" / "Saved"
+    saved.mkdir(parents=True)
+    (saved / "world.sav").write_text("before staging")
+    assert staged.stage()
+    assert not (staged.staging_dir / "Pal" / "Saved").exists()
+
+    # Saved by rename, as the game and the final api.save() do
+    (saved / "world.sav.tmp").write_text("after staging")
+    os.replace(saved / "world.sav.tmp", saved / "world.sav")
+    (saved / "backup.sav").write_text("new file")
+    (staged.game_dir / "server.log").write_text("log")
+
+    staged.swap()
+    live = staged.game_dir / "Pal" / "Saved"
+    assert (live / "world.sav").read_text() == "after staging"
+    assert (live / "backup.sav").read_text() == "new file"
+    assert (staged.game_dir / "server.log").exists()
+
+    (live / "world.sav").write_text("saved by new build")
+    staged.rollback()
+    assert (staged.game_dir / "server.bin").read_text() == "old"
+    assert (live / "world.sav").read_text() == "saved by new build"
@@ -0,0 +1,74 @@
+import json
+from typing import Any
+
+from server_runner.steam.managed_game_server import ServerState
+from server_runner.utils.cancellation import CancellationToken
+from server_runner.utils.histogram import Histogram
+from server_runner.workflow.tasks import Task, TaskResult
+from server_runner.workflow.telemetry import WorkflowTelemetry
+from server_runner.workflow.workflow_job import WorkflowJob
+from server_runner.workflow.workflow_queue import WorkflowQueue
+
+
+class NoopTask(Task):
+    def run(self, token: CancellationToken) -> TaskResult:
+        return TaskResult(True)
+
+
+def test_histogram_buckets_and_quantiles() -> None:
+    histogram = Histogram([1, 10, 100])
+    for value in (0.5, 2, 3, 50, 500):
+        histogram.observe(value)
+
+    assert histogram.counts() == [1, 2, 1, 1]
+    assert histogram.count == 5
+    assert histogram.min == 0.5
+    assert histogram.max == 500
+    assert 1 <= histogram.quantile(0.5) <= 10
+
+
+def test_job_runs_record_queue_wait_and_task_durations() -> None:
+    """
+    Verifies that a job run through the queue records:
+    - the time it waited between enqueue and start
+    - a duration for each task, keyed by task type
+    """
+    server: Any = object()
+    job = WorkflowJob(1, "START")
+    job.add_task(NoopTask(server))
+    job.add_task(NoopTask(server))
+    queue = WorkflowQueue()
+    telemetry = WorkflowTelemetry()
+
+    queue.enqueue(job)
+    queued = queue.get_nowait()
+    telemetry.job_started(queued)
+    telemetry.job_finished(queued, queued.run_all())
+
+    snapshot = json.loads(telemetry.to_json())
+    assert snapshot["tasks"]["NoopTask"]["count"] == 2
+    assert snapshot["jobs"]["START"]["queue_wait"]["count"] == 1
+    assert snapshot["runs"][0]["outcome"] == "completed"
+
+
+def test_downtime_spans_healthy_to_healthy() -> None:
+    """
+    Verifies that downtime:
+    - runs from the last healthy observation to the next one
+    - is attributed to the job running when the server went down
+    - is not recorded for a server that was never seen healthy
+    """
+    telemetry = WorkflowTelemetry()
+    telemetry.observe_state(ServerState.STOPPED)
+    telemetry.observe_state(ServerState.RUNNING)
+    assert telemetry.downtime.count == 0
+
+    telemetry.job_started(WorkflowJob(3, "RESTART"))
+    telemetry.observe_state(ServerState.UNRESPONSIVE)
+    assert telemetry.current_downtime() > 0
+    telemetry.observe_state(ServerState.STOPPED)
+    telemetry.observe_state(ServerState.RUNNING)
+
+    assert telemetry.downtime.count == 1
+    assert telemetry.outages[0].job == "RESTART"
+    assert telemetry.current_downtime() == 0
@@ -0,0 +1,136 @@
+import asyncio
+import threading
+import time
+from collections.abc import Iterator
+from datetime import datetime
+
+import pytest
+
+from server_runner.utils.timer_scheduler import (
+    AsyncTimerScheduler,
+    RecurringTime,
+    TimerScheduler,
+)
+
+
+@pytest.fixture
+def scheduler() -> Iterator[TimerScheduler]:
+    scheduler = TimerScheduler(max_sleep=0.05)
+    scheduler.start()
+    yield scheduler
+    scheduler.stop(timeout=1)
+
+
+@pytest.mark.parametrize(
+    ("interval", "at", "now", "expected"),
+    [
+        ("minute", ":00", "12:00:30", "12:01:00"),
+        ("minute", ":45", "12:00:30", "12:00:45"),
+        ("hour", ":15", "12:20:00", "13:15:00"),
+        ("hour", "15:30", "12:10:00", "12:15:30"),
+        ("day", "05:45", "06:00:00", "05:45:00+1"),
+        ("day", "05:45:10", "05:00:00", "05:45:10"),
+    ],
+)
+def test_recurring_time_next_occurrence(
+    interval: str, at: str, now: str, expected: str
+) -> None:
+    recurring = RecurringTime.parse(interval, at)  # type: ignore[arg-type]
+    base = datetime(2025, 3, 1)
+    current = datetime.combine(base, datetime.strptime(now, "%H:%M:%S").time())
+    time_part, _, days = expected.partition("+")
+    target = datetime.combine(base, datetime.strptime(time_part, "%H:%M:%S").time())
+    target = target.replace(day=base.day + int(days or 0))
+
+    assert recurring.next_after(current) == target
+
+
+@pytest.mark.parametrize(("interval", "at"), [("minute", "00"), ("day", "25:00")])
+def test_invalid_times_are_rejected(interval: str, at: str) -> None:
+    with pytest.raises(ValueError):
+        RecurringTime.parse(interval, at)  # type: ignore[arg-type]
+
+
+def test_timers_fire_in_deadline_order(scheduler: TimerScheduler) -> None:
+    """
+    Verifies that the scheduler:
+    - wakes early for a timer added while it sleeps
+    - fires timers in deadline order, not insertion order
+    - records how late each timer fired
+    """
+    fired: list[str] = []
+    done = threading.Event()
+
+    scheduler.call_later(0.3, lambda: (fired.append("late"), done.set()))
+    handle = scheduler.call_later(0.1, lambda: fired.append("early"), name="early")
+
+    assert done.wait(2)
+    assert fired == ["early", "late"]
+    assert handle.fired == 1
+    assert handle.last_lag < 0.5
+
+
+def test_cancelled_timer_does_not_fire(scheduler: TimerScheduler) -> None:
+    fired = threading.Event()
+    handle = scheduler.call_later(0.1, fired.set)
+    handle.cancel()
+
+    assert not fired.wait(0.3)
+
+
+def test_wall_clock_jump_realigns_deadlines() -> None:
+    """
+    Verifies that a wall-clock step forward pulls a wall-clock timer's
+    deadline in, instead of waiting out the stale monotonic deadline.
+    """
+    shift = 0.0
+    scheduler = TimerScheduler(wall_clock=lambda: time.time() + shift, max_sleep=0.05)
+    fired = threading.Event()
+    scheduler.every(RecurringTime.parse("day", "00:00"), fired.set)
+    scheduler.start()
+    try:
+        assert not fired.wait(0.1)
+        now = datetime.now()
+        midnight = RecurringTime.parse("day", "00:00").next_after(now)
+        shift = (midnight - now).total_seconds()
+
+        assert fired.wait(2)
+    finally:
+        scheduler.stop(timeout=1)
+
+
+def test_async_scheduler_fires_on_the_loop() -> None:
+    """
+    Verifies that the asyncio scheduler:
+    - fires timers in deadline order on the event loop thread
+    - wakes early for a timer added from another thread
+    - exits once stopped
+    """
+
+    async def scenario() -> list[str]:
+        scheduler = AsyncTimerScheduler()
+        loop = asyncio.get_running_loop()
+        fired: list[str] = []
+        done = asyncio.Event()
+        on_loop: list[bool] = []
+
+        def late() -> None:
+            on_loop.append(asyncio.get_running_loop() is loop)
+            fired.append("late")
+            done.set()
+
+        scheduler.start()
+        scheduler.call_later(0.3, late)
+        await asyncio.to_thread(
+            scheduler.call_later, 0.1, lambda: fired.append("early")
+        )
+        async with asyncio.timeout(2):
+            await done.wait()
+
+        scheduler.stop()
+        async with asyncio.timeout(1):
+            await scheduler.wait_closed()
+        assert on_loop == [True]
+        return fired
+
+    assert asyncio.run(scenario()) == ["early", "late"]
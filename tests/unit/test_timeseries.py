@@ -0,0 +1,88 @@
+import math
+import time
+from pathlib import Path
+
+from server_runner.utils.timeseries import Tier, TimeSeriesStore
+
+TIERS = (Tier(1.0, 60), Tier(60.0, 60))
+
+
+def test_samples_roll_up_into_coarser_tiers() -> None:
+    """
+    Verifies that a sample lands in every tier:
+    - one point per second in the finest tier
+    - minute buckets carrying count, mean, min and max
+    - NaN values are skipped rather than counted
+    """
+    store = TimeSeriesStore(["rss", "fps"], TIERS)
+    base = math.floor(time.time() / 60) * 60 - 60
+    for i in range(30):
+        store.record({"rss": float(i), "fps": math.nan}, base + i)
+
+    seconds = store.range("rss", base, base + 29, resolution=1.0)
+    assert [p.mean for p in seconds] == [float(i) for i in range(30)]
+
+    (minute,) = store.range("rss", base, base + 59, resolution=60.0)
+    assert (minute.count, minute.min, minute.max) == (30, 0.0, 29.0)
+    assert minute.mean == 14.5
+    assert store.range("fps", base, base + 59, resolution=60.0) == []
+
+
+def test_ring_overwrites_buckets_older_than_its_capacity() -> None:
+    """
+    Verifies that once a tier wraps:
+    - buckets older than its capacity are no longer returned
+    - aggregates only cover what is still held
+    """
+    store = TimeSeriesStore(["rss"], TIERS)
+    base = time.time() - 200
+    for i in range(120):
+        store.record({"rss": float(i)}, base + i)
+
+    points = store.range("rss", base, base + 119, resolution=1.0)
+    assert len(points) == 60
+    assert points[0].mean == 60.0
+
+    aggregate = store.aggregate("rss", base, base + 119, resolution=1.0)
+    assert aggregate is not None
+    assert (aggregate.count, aggregate.min, aggregate.max) == (60, 60.0, 119.0)
+    assert store.latest("rss") == (base + 119, 119.0)
+
+
+def test_history_file_survives_reopening(tmp_path: Path) -> None:
+    """
+    Verifies that a file-backed store:
+    - returns the same points after being closed and reopened
+    - resets a file written with a different layout
+    """
+    path = tmp_path / "history.ring"
+    now = time.time()
+    store = TimeSeriesStore(["rss", "players"], TIERS, path=path)
+    store.record({"rss": 100.0, "players": 3.0}, now - 5)
+    store.record({"rss": 200.0, "players": 4.0}, now - 4)
+    store.close()
+
+    reopened = TimeSeriesStore(["rss", "players"], TIERS, path=path)
+    assert [p.mean for p in reopened.range("rss", now - 10, now)] == [100.0, 200.0]
+    assert reopened.latest("players") == (math.floor(now - 4), 4.0)
+    reopened.close()
+
+    other = TimeSeriesStore(["rss"], TIERS, path=path)
+    assert other.range("rss", now - 10, now) == []
+    other.close()
+
+
+def test_closed_store_ignores_late_records(tmp_path: Path) -> None:
+    """
+    Verifies that after close() a file-backed store:
+    - drops records from a sampler that is still finishing
+    - reads as empty instead of touching the released mapping
+    """
+    now = time.time()
+    store = TimeSeriesStore(["rss"], TIERS, path=tmp_path / "history.ring")
+    store.record({"rss": 100.0}, now)
+    store.close()
+
+    store.record({"rss": 200.0}, now)
+    assert store.range("rss", now - 10, now) == []
+    store.close()
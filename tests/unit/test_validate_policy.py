@@ -0,0 +1,32 @@
+from pathlib import Path
+
+from server_runner.steam.server.validate_policy import ValidateMode, ValidatePolicy
+
+
+def test_periodic_policy_validates_every_nth_update(tmp_path: Path) -> None:
+    """
+    Verifies that the validate policy:
+    - validates on every Nth update
+    - keeps its counter across instances via the state file
+    """
+    state = tmp_path / "validate.json"
+    decisions: list[bool] = []
+    for _ in range(6):
+        policy = ValidatePolicy(1, ValidateMode.PERIODIC, every=3, state_file=state)
+        validate = policy.should_validate()
+        decisions.append(validate)
+        policy.record_update(validate)
+
+    assert decisions == [False, False, True, False, False, True]
+
+
+def test_fixed_policies(tmp_path: Path) -> None:
+    state = tmp_path / "validate.json"
+    assert ValidatePolicy(1, ValidateMode.ALWAYS, state_file=state).should_validate()
+    assert not ValidatePolicy(1, ValidateMode.NEVER, state_file=state).should_validate()
+
+
+def test_default_policy_matches_the_command_line(tmp_path: Path) -> None:
+    policy = ValidatePolicy(1, state_file=tmp_path / "validate.json")
+    assert policy.mode is ValidateMode.PERIODIC
+    assert policy.every == 10
@@ -0,0 +1,176 @@
+import asyncio
+import threading
+from collections.abc import Callable
+from typing import Any
+
+from server_runner.utils.cancellation import CancellationToken
+from server_runner.workflow.async_workflow_engine import AsyncWorkflowEngine
+from server_runner.workflow.tasks import Task, TaskResult
+from server_runner.workflow.workflow_engine import WorkflowEngine
+from server_runner.workflow.workflow_job import WorkflowJob
+
+
+class FakeServer:
+    def on_unexpected_exit(self, callback: Callable[..., None]) -> None:
+        pass
+
+    def on_state(self, callback: Callable[..., None]) -> None:
+        pass
+
+    def cancel_operations(self) -> None:
+        pass
+
+
+class SleepTask(Task):
+    """Not preemptible; holds the consumer for a fixed time."""
+
+    def __init__(self, server: Any, seconds: float) -> None:
+        super().__init__(server)
+        self.seconds = seconds
+
+    def run(self, token: CancellationToken) -> TaskResult:
+        threading.Event().wait(self.seconds)
+        return TaskResult(True)
+
+
+class FailTask(Task):
+    def run(self, token: CancellationToken) -> TaskResult:
+        raise RuntimeError("announce failed")
+
+
+class WaitTask(Task):
+    """Preemptible; waits for its token on the first run only."""
+
+    preemptible = True
+
+    def __init__(self, server: Any, started: threading.Event) -> None:
+        super().__init__(server)
+        self.started = started
+        self.runs = 0
+
+    def run(self, token: CancellationToken) -> TaskResult:
+        self.runs += 1
+        if self.runs == 1:
+            self.started.set()
+            token.wait(5)
+        return TaskResult(not token.cancelled)
+
+
+class AsyncWaitTask(Task):
+    """Preemptible; waits on the event loop for its token on every run."""
+
+    preemptible = True
+
+    def __init__(self, server: Any, started: asyncio.Queue[int]) -> None:
+        super().__init__(server)
+        self.started = started
+        self.runs = 0
+
+    def run(self, token: CancellationToken) -> TaskResult:
+        raise NotImplementedError
+
+    async def run_async(self, token: CancellationToken) -> TaskResult:
+        self.runs += 1
+        self.started.put_nowait(self.runs)
+        await token.wait_async(5)
+        return TaskResult(not token.cancelled)
+
+
+def make_job(priority: int, name: str, *tasks: Task) -> WorkflowJob:
+    job = WorkflowJob(priority, name)
+    for task in tasks:
+        job.add_task(task)
+    return job
+
+
+def test_preempted_job_keeps_its_queue_wait() -> None:
+    """
+    Verifies that a job preempted and re-queued while running:
+    - is recorded with the time it waited before that run started
+    - runs again afterwards and completes
+    """
+    server: Any = FakeServer()
+    started = threading.Event()
+    stop = make_job(1, "STOP", SleepTask(server, 0.3))
+    restart = make_job(3, "RESTART", WaitTask(server, started), SleepTask(server, 0))
+    start = make_job(1, "START", SleepTask(server, 0))
+    engine = WorkflowEngine(server, {}, {})
+    engine.start()
+    try:
+        engine._submit(stop)  # type: ignore[reportPrivateUsage]
+        engine._submit(restart)  # type: ignore[reportPrivateUsage]
+        assert started.wait(2)
+        engine._submit(start)  # type: ignore[reportPrivateUsage]
+        engine.queue.join()
+    finally:
+        engine.stop()
+
+    runs = [(run.job, run.outcome, run.queue_wait) for run in engine.telemetry.runs]
+    assert [(job, outcome) for job, outcome, _ in runs] == [
+        ("STOP", "completed"),
+        ("RESTART", "preempted"),
+        ("START", "completed"),
+        ("RESTART", "completed"),
+    ]
+    assert runs[1][2] >= 0.25
+
+
+def test_consumer_survives_a_failing_job() -> None:
+    """
+    Verifies that a job whose task raises:
+    - is recorded as failed
+    - does not stop the consumer from running the next job
+    """
+    server: Any = FakeServer()
+    announce = make_job(1, "ANNOUNCE", FailTask(server))
+    start = make_job(1, "START", SleepTask(server, 0))
+    engine = WorkflowEngine(server, {}, {})
+    engine.start()
+    try:
+        engine._submit(announce)  # type: ignore[reportPrivateUsage]
+        engine._submit(start)  # type: ignore[reportPrivateUsage]
+        engine.queue.join()
+    finally:
+        engine.stop()
+
+    assert [(run.job, run.outcome) for run in engine.telemetry.runs] == [
+        ("ANNOUNCE", "failed"),
+        ("START", "completed"),
+    ]
+
+
+def test_async_engine_preempts_then_stops() -> None:
+    """
+    Verifies that the AsyncWorkflowEngine on one event loop:
+    - preempts a running job for a higher priority one and re-runs it after
+    - cancels the running job on stop() without re-queueing it
+    - finishes its tasks for wait_closed()
+    """
+
+    async def scenario() -> AsyncWorkflowEngine:
+        server: Any = FakeServer()
+        started: asyncio.Queue[int] = asyncio.Queue()
+        restart = make_job(
+            3, "RESTART", AsyncWaitTask(server, started), SleepTask(server, 0)
+        )
+        start = make_job(1, "START", SleepTask(server, 0))
+        engine = AsyncWorkflowEngine(server, {}, {})
+        engine.start()
+        async with asyncio.timeout(5):
+            engine._submit(restart)  # type: ignore[reportPrivateUsage]
+            assert await started.get() == 1
+            engine._submit(start)  # type: ignore[reportPrivateUsage]
+            assert await started.get() == 2
+            engine.stop()
+            await engine.wait_closed()
+        return engine
+
+    engine = asyncio.run(scenario())
+
+    outcomes = [(run.job, run.outcome) for run in engine.telemetry.runs]
+    assert outcomes == [
+        ("RESTART", "preempted"),
+        ("START", "completed"),
+        ("RESTART", "preempted"),
+    ]
+    assert engine.queue.empty()
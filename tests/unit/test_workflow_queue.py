@@ -0,0 +1,51 @@
+from server_runner.workflow.workflow_job import WorkflowJob
+from server_runner.workflow.workflow_queue import WorkflowQueue
+
+
+def job(name: str, priority: int, *supersedes: str) -> WorkflowJob:
+    return WorkflowJob(priority, name, supersedes=frozenset(supersedes))
+
+
+def drain(queue: WorkflowQueue) -> list[str]:
+    names: list[str] = []
+    while not queue.empty():
+        names.append(queue.get_nowait().name)
+        queue.task_done()
+    return names
+
+
+def test_duplicate_jobs_are_coalesced() -> None:
+    queue = WorkflowQueue()
+    start = job("START", 1)
+
+    assert queue.enqueue(start)
+    for _ in range(100):
+        assert not queue.enqueue(start)
+
+    assert drain(queue) == ["START"]
+
+
+def test_superseding_job_replaces_pending_ones() -> None:
+    """
+    Verifies that:
+    - a superseding job removes pending jobs it covers
+    - a covered job is not queued while its superseder is pending
+    - unrelated jobs keep their priority order
+    """
+    queue = WorkflowQueue()
+    queue.enqueue(job("RESTART", 3))
+    queue.enqueue(job("START", 1))
+
+    assert queue.enqueue(job("UPDATE", 5, "RESTART"))
+    assert not queue.enqueue(job("RESTART", 3))
+
+    assert drain(queue) == ["START", "UPDATE"]
+    queue.join()  # unfinished task count stays consistent
+
+
+def test_sentinel_clears_pending_jobs() -> None:
+    queue = WorkflowQueue()
+    queue.enqueue(job("START", 1))
+    queue.enqueue(WorkflowJob.sentinel())
+
+    assert drain(queue) == ["SENTINEL"]